@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import queue
+import threading
+import time
+from typing import Iterator, List, Tuple
+
 import streamlit as st
 
-from src.extractive.textrank import textrank_summarize
+from src.abstractive.cache import SummaryCache, default_cache
 from src.abstractive.llm_summarizer import MetisLLMSummarizer
+from src.extractive.textrank import select_top_k, textrank_scores
 from src.merge.merge_engine import merge_summaries
 from src.utils.text_splitter import split_sentences
 
@@ -14,6 +20,52 @@ st.title("Hybrid Text Summarization System")
 st.markdown("TextRank + LLM + Merge Engine")
 
 
+# Streamlit re-runs this script on every interaction. The client and the
+# per-text work are cached, so moving a slider only re-cuts and re-merges.
+@st.cache_resource
+def get_summarizer() -> MetisLLMSummarizer:
+    # LLM output per (text, target) lives in the summarizer's cache
+    return MetisLLMSummarizer(cache=default_cache() or SummaryCache(max_memory_entries=256))
+
+
+@st.cache_data(max_entries=64)
+def rank_text(text: str) -> Tuple[List[str], List[float]]:
+    sentences = split_sentences(text)
+    return sentences, textrank_scores(sentences)
+
+
+_END = object()
+
+
+def start_stream(text: str, target_sentences: int) -> Iterator[str]:
+    # The request goes out now and a background thread buffers its deltas,
+    # so TextRank runs while the LLM is in flight; st.write_stream drains it.
+    deltas: "queue.Queue[object]" = queue.Queue()
+    summarizer = get_summarizer()  # st.cache_resource needs the script thread
+
+    def pump() -> None:
+        try:
+            for delta in summarizer.stream(text, target_sentences=target_sentences):
+                deltas.put(delta)
+        except Exception as exc:
+            deltas.put(exc)
+        finally:
+            deltas.put(_END)
+
+    threading.Thread(target=pump, daemon=True).start()
+
+    def drain() -> Iterator[str]:
+        while True:
+            item = deltas.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    return drain()
+
+
 # Sidebar controls
 st.sidebar.header("Settings")
 
@@ -41,38 +93,41 @@ if st.button("Generate Summary"):
         st.warning("Please enter some text.")
         st.stop()
 
-    with st.spinner("Processing..."):
+    # keep showing this text's summaries when a slider triggers a rerun
+    st.session_state["submitted_text"] = text
 
-        sentences = split_sentences(text)
 
-        # TextRank
-        extractive_summary, _ = textrank_summarize(sentences, k=k_extractive)
-        extractive_text = " ".join(extractive_summary)
+submitted = st.session_state.get("submitted_text")
+if submitted:
 
-        # LLM
-        summarizer = MetisLLMSummarizer()
-        abstractive_text = summarizer.summarize(text, target_sentences=llm_target)
+    timings = {}
 
-        # Hybrid
-        final_summary = merge_summaries(
-            extractive_summary=extractive_summary,
-            abstractive_text=abstractive_text,
-            k=k_final,
-        )
-        hybrid_text = " ".join(final_summary)
+    t_llm = time.perf_counter()
+    llm_stream = start_stream(submitted, llm_target)
 
-    st.success("Summary generated!")
+    t0 = time.perf_counter()
+    sentences, scores = rank_text(submitted)
+    extractive_summary = select_top_k(sentences, scores, k_extractive)
+    timings["textrank"] = time.perf_counter() - t0
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.subheader("TextRank")
-        st.write(extractive_text)
+        st.write(" ".join(extractive_summary).strip())
 
     with col2:
         st.subheader("LLM")
-        st.write(abstractive_text)
+        abstractive_text = st.write_stream(llm_stream)
+        timings["llm"] = time.perf_counter() - t_llm
 
     with col3:
         st.subheader("Hybrid")
-        st.write(hybrid_text)
+        t0 = time.perf_counter()
+        final_summary = merge_summaries(extractive_summary, abstractive_text, k=k_final)
+        timings["merge"] = time.perf_counter() - t0
+        st.write(" ".join(final_summary).strip())
+
+    st.caption(
+        " | ".join(f"{stage}: {seconds * 1000:.1f} ms" for stage, seconds in timings.items())
+    )
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from typing import List
+
+from src.extractive.batch import BATCH_CONFIG, summarize_batch
+from src.extractive.textrank import textrank_summarize
+from src.utils.text_splitter import split_sentences
+
+
+def make_news_corpus(n_docs: int, sentences_per_doc: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(5000)]
+    boilerplate = "All rights reserved by the news agency."
+    texts: List[str] = []
+    for _ in range(n_docs):
+        sents = [" ".join(rng.choices(vocab, k=rng.randint(8, 20))) + "." for _ in range(sentences_per_doc)]
+        sents.append(boilerplate)
+        texts.append(" ".join(sents))
+    return texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch summarization vs. looping over textrank_summarize")
+    parser.add_argument("--docs", type=int, default=300)
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = make_news_corpus(args.docs, args.sentences)
+
+    def loop():
+        return [textrank_summarize(split_sentences(t), k=args.k, config=BATCH_CONFIG) for t in texts]
+
+    # same TextRankConfig on both sides, so only the batching itself is measured
+    t_loop = min(timeit.repeat(loop, number=1, repeat=args.repeat))
+    t_batch = min(timeit.repeat(lambda: summarize_batch(texts, k=args.k), number=1, repeat=args.repeat))
+    t_corpus = min(
+        timeit.repeat(lambda: summarize_batch(texts, k=args.k, use_corpus_idf=True), number=1, repeat=args.repeat)
+    )
+    loop_out = loop()
+    batch_out = summarize_batch(texts, k=args.k)
+
+    same = [s for s, _ in loop_out] == [s for s, _ in batch_out]
+    print(f"docs={args.docs} sentences/doc={args.sentences + 1} k={args.k} config={BATCH_CONFIG}")
+    print(f"loop textrank_summarize : {t_loop:8.3f}s  ({args.docs / t_loop:8.1f} docs/s)")
+    print(f"summarize_batch         : {t_batch:8.3f}s  ({args.docs / t_batch:8.1f} docs/s)  x{t_loop / t_batch:.1f}")
+    print(f"summarize_batch + corpus IDF: {t_corpus:8.3f}s  ({args.docs / t_corpus:8.1f} docs/s)")
+    print(f"same summaries as loop: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.suite import synthetic_document
+from src.eval.runner import compare_hierarchical
+from src.extractive.hierarchical import HierarchicalConfig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Flat vs hierarchical (sectioned) TextRank: runtime and quality")
+    parser.add_argument("--sentences", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--section-size", type=int, default=100)
+    parser.add_argument("--section-k", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--language", choices=("en", "fa"), default="en")
+    args = parser.parse_args()
+
+    config = HierarchicalConfig(section_size=args.section_size, section_k=args.section_k, workers=args.workers)
+    print(f"k={args.k} section_size={args.section_size} section_k={args.section_k} workers={args.workers}")
+    for n in args.sentences:
+        results = compare_hierarchical(synthetic_document(n, args.language), k=args.k, config=config)
+        flat, hier = results["flat"], results["hierarchical"]
+        print(
+            f"n={n:<6d} flat {flat.runtime_sec:8.3f}s cov {flat.coverage:.3f} red {flat.redundancy:.4f} | "
+            f"hier {hier.runtime_sec:8.3f}s cov {hier.coverage:.3f} red {hier.redundancy:.4f} "
+            f"x{flat.runtime_sec / hier.runtime_sec:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.llm_stub import StubLLMServer
+from benchmarks.suite import percentile, synthetic_document
+from src.abstractive.llm_summarizer import LLMConfig, MetisLLMSummarizer
+from src.merge.hybrid_pipeline import HybridPipeline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hybrid latency: blocking vs streamed LLM under a latency budget")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=200, help="document size")
+    parser.add_argument("--summary-sentences", type=int, default=5, help="sentences the stub LLM returns")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="stub delay per streamed word (seconds)")
+    parser.add_argument("--first-token", type=float, default=0.05, help="stub delay before the first token")
+    parser.add_argument("--budgets", type=float, nargs="+", default=[0.25, 0.5])
+    args = parser.parse_args()
+
+    texts = [synthetic_document(args.sentences, seed=i) for i in range(args.runs)]
+    with StubLLMServer(
+        latency=args.first_token,
+        summary_sentences=args.summary_sentences,
+        token_delay=args.token_delay,
+    ) as stub:
+        summarizer = MetisLLMSummarizer(LLMConfig(base_url=stub.base_url), api_key="stub", cache=None)
+        setups = [("blocking", {}), ("streamed", {"stream_llm": True})]
+        setups += [(f"budget {b:.2f}s", {"stream_llm": True, "latency_budget": b}) for b in args.budgets]
+        for name, options in setups:
+            samples = []
+            complete = 0
+            with HybridPipeline(summarizer=summarizer, k_extractive=3, k_final=5, **options) as pipeline:
+                for text in texts:
+                    t0 = time.perf_counter()
+                    result = pipeline.run(text)
+                    samples.append(time.perf_counter() - t0)
+                    complete += result.abstractive_complete
+            print(
+                f"{name:14s} p50 {percentile(samples, 50) * 1000:8.1f} ms  p99 {percentile(samples, 99) * 1000:8.1f} ms  "
+                f"max {max(samples) * 1000:8.1f} ms  complete {complete}/{len(texts)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from openai import AsyncOpenAI, OpenAI
+
+from benchmarks.llm_stub import StubLLMServer
+from benchmarks.suite import percentile, synthetic_document
+from src.abstractive.llm_summarizer import LLMConfig, close_shared_clients, shared_summarizer
+
+
+def _per_request_client(config: LLMConfig) -> Callable[[str], str]:
+    # what every call site used to do: new sync + async clients, then one request
+    def _call(text: str) -> str:
+        client = OpenAI(api_key="stub", base_url=config.base_url)
+        AsyncOpenAI(api_key="stub", base_url=config.base_url)
+        resp = client.chat.completions.create(
+            model=config.model, messages=[{"role": "user", "content": f"TEXT:\n{text}"}]
+        )
+        return resp.choices[0].message.content
+
+    return _call
+
+
+def _shared_client(config: LLMConfig) -> Callable[[str], str]:
+    def _call(text: str) -> str:
+        return shared_summarizer(config, api_key="stub").summarize(text, target_sentences=3)
+
+    return _call
+
+
+def _run(call: Callable[[str], str], texts: List[str], threads: int) -> List[float]:
+    def _timed(text: str) -> float:
+        t0 = time.perf_counter()
+        call(text)
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(_timed, texts))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-request vs process-wide pooled LLM client against a local stub")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server delay in seconds")
+    args = parser.parse_args()
+
+    texts = [synthetic_document(20, seed=i) for i in range(args.requests)]
+    for threads in args.threads:
+        for name, factory in (("per-request", _per_request_client), ("shared", _shared_client)):
+            close_shared_clients()
+            with StubLLMServer(latency=args.latency) as stub:
+                samples = _run(factory(LLMConfig(base_url=stub.base_url)), texts, threads)
+                connections = stub.connections
+            print(
+                f"threads={threads:<3d} {name:12s} p50 {percentile(samples, 50) * 1000:8.2f} ms  "
+                f"p95 {percentile(samples, 95) * 1000:8.2f} ms  mean {sum(samples) / len(samples) * 1000:8.2f} ms  "
+                f"connections {connections}"
+            )
+    close_shared_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.bench_batch import make_news_corpus
+from src.extractive.parallel import summarize_parallel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process-pool scaling for batch TextRank")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    texts = make_news_corpus(args.docs, args.sentences)
+
+    baseline = None
+    print(f"docs={args.docs} sentences/doc={args.sentences + 1} chunk_size={args.chunk_size}")
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        summarize_parallel(texts, k=args.k, workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        print(
+            f"workers={workers:<3d} {elapsed:8.3f}s  {args.docs / elapsed:9.1f} docs/s  "
+            f"speedup x{baseline / elapsed:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.bench_batch import make_news_corpus
+from src.extractive.sentence_table import SentenceTable
+from src.extractive.similarity import tfidf_vectors_from_tokens, tokenize_sentences
+from src.utils.preprocessing import stopwords_for
+from src.utils.text_splitter import split_sentences
+
+
+def _list_representation(text: str):
+    sentences = split_sentences(text)
+    tokens = tokenize_sentences(sentences, stopwords_for(None))
+    vectors = tfidf_vectors_from_tokens(tokens)
+    return sentences, tokens, vectors
+
+
+def _measure(build, text: str):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = build(text)
+    elapsed = time.perf_counter() - t0
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sentence/vector memory: lists of str/dict vs SentenceTable")
+    parser.add_argument("--sentences", type=int, default=50_000)
+    args = parser.parse_args()
+
+    text = " ".join(make_news_corpus(args.sentences // 20, 20))
+    n = len(split_sentences(text))
+    print(f"sentences={n} text={len(text) / 1e6:.1f} MB (source text excluded from the figures below)")
+    for name, build in (("lists + dicts", _list_representation), ("SentenceTable", SentenceTable.from_text)):
+        elapsed, retained, peak = _measure(build, text)
+        print(f"{name:14s}: {elapsed:6.2f} s  retained {retained / 1e6:8.1f} MB  peak {peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks.bench_batch import make_news_corpus
+from src.extractive.similarity import build_tfidf_vectors
+from src.extractive.similarity_kernel import condensed_cosine
+from src.utils.text_splitter import split_sentences
+
+
+def _full_matrix(vectors):
+    # previous implementation: both triangles, norms recomputed for every pair
+    def cosine(v1, v2):
+        if not v1 or not v2:
+            return 0.0
+        if len(v1) > len(v2):
+            v1, v2 = v2, v1
+        dot = sum(a * v2[k] for k, a in v1.items() if k in v2)
+        norm1 = math.sqrt(sum(a * a for a in v1.values()))
+        norm2 = math.sqrt(sum(b * b for b in v2.values()))
+        return dot / (norm1 * norm2) if norm1 and norm2 else 0.0
+
+    n = len(vectors)
+    return [[0.0 if i == j else cosine(vectors[i], vectors[j]) for j in range(n)] for i in range(n)]
+
+
+def _peak_bytes(fn) -> int:
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def _retained_bytes(matrix) -> int:
+    return sys.getsizeof(matrix) + sum(sys.getsizeof(row) + 24 * len(row) for row in matrix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full vs condensed (upper-triangle) cosine similarity")
+    parser.add_argument("--sentences", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sentences = [s for text in make_news_corpus(args.sentences // 10 + 1, 10) for s in split_sentences(text)]
+    vectors, _ = build_tfidf_vectors(sentences[: args.sentences])
+
+    full = min(timeit.repeat(lambda: _full_matrix(vectors), number=1, repeat=args.repeat))
+    tri = min(timeit.repeat(lambda: condensed_cosine(vectors), number=1, repeat=args.repeat))
+    condensed = condensed_cosine(vectors)
+
+    print(f"n={len(vectors)} pairs={len(condensed.data)}")
+    print(f"full matrix : {full * 1000:9.1f} ms  {_retained_bytes(_full_matrix(vectors)) / 1e6:8.2f} MB")
+    print(
+        f"condensed   : {tri * 1000:9.1f} ms  {condensed.data.itemsize * len(condensed.data) / 1e6:8.2f} MB"
+        f"  x{full / tri:.1f} faster"
+    )
+    print(f"peak alloc  : full {_peak_bytes(lambda: _full_matrix(vectors)) / 1e6:.2f} MB, "
+          f"condensed {_peak_bytes(lambda: condensed_cosine(vectors)) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
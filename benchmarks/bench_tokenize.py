@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import timeit
+from typing import List
+
+from src.utils.preprocessing import build_stopwords, tokenize_filtered
+
+
+_PUNCT_RE = re.compile(r"[^\w\u0600-\u06FF]+", flags=re.UNICODE)
+
+
+def _legacy_tokenize_and_filter(text: str) -> List[str]:
+    # tokenize() + filter_tokens(stopwords=None) as they were before the fused path
+    text = text.strip().lower()
+    text = _PUNCT_RE.sub(" ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    tokens = text.split() if text else []
+    stopwords = build_stopwords()
+    return [t for t in tokens if t not in stopwords and len(t) > 1]
+
+
+def make_sentences(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    en = "the model of data is used for learning and ranking in a graph".split()
+    fa = "هوش مصنوعی در پزشکی برای تشخیص بیماری استفاده می‌شود".split()
+    return [
+        " ".join(rng.choices(en if i % 2 else fa, k=rng.randint(6, 20))) + rng.choice([".", "!", "؟", ","])
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fused tokenizer vs. tokenize + filter_tokens")
+    parser.add_argument("--sentences", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sentences = make_sentences(args.sentences)
+    assert [_legacy_tokenize_and_filter(s) for s in sentences] == [tokenize_filtered(s) for s in sentences]
+
+    legacy = min(timeit.repeat(lambda: [_legacy_tokenize_and_filter(s) for s in sentences], number=1, repeat=args.repeat))
+    fused = min(timeit.repeat(lambda: [tokenize_filtered(s) for s in sentences], number=1, repeat=args.repeat))
+
+    per = 1e6 / args.sentences
+    print(f"sentences={args.sentences}")
+    print(f"legacy tokenize+filter : {legacy * per:7.2f} us/sentence")
+    print(f"fused tokenize_filtered: {fused * per:7.2f} us/sentence  x{legacy / fused:.1f}")
+
+
+if __name__ == "__main__":
+    main()
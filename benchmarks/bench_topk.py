@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from src.extractive.textrank import _select_top_k
+
+
+def _full_sort_top_k(sentences, scores, k):
+    ranked = sorted(range(len(sentences)), key=lambda idx: (-scores[idx], idx, len(sentences[idx])))
+    selected_set = set(ranked[:k])
+    return [i for i in range(len(sentences)) if i in selected_set]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Top-k sentence selection: full sort vs heap")
+    parser.add_argument("--n", type=int, default=10_000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    scores = [round(rng.random(), 3) for _ in range(args.n)]  # rounded to create ties
+    sentences = ["s" * rng.randint(5, 120) for _ in range(args.n)]
+    assert _select_top_k(sentences, scores, args.k) == _full_sort_top_k(sentences, scores, args.k)
+
+    full = min(timeit.repeat(lambda: _full_sort_top_k(sentences, scores, args.k), number=1, repeat=args.repeat))
+    heap = min(timeit.repeat(lambda: _select_top_k(sentences, scores, args.k), number=1, repeat=args.repeat))
+    print(f"n={args.n} k={args.k}")
+    print(f"full sort : {full * 1000:8.3f} ms")
+    print(f"heap      : {heap * 1000:8.3f} ms  x{full / heap:.1f}")
+
+
+if __name__ == "__main__":
+    main()
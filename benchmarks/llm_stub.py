@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from src.utils.text_splitter import split_sentences
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        # echo the first sentences of the submitted text as the "summary"
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        text = prompt.split("TEXT:\n", 1)[-1]
+        summary = ". ".join(split_sentences(text)[: self.server.summary_sentences]) + "."
+        # whitespace words stand in for tokens
+        usage = {"prompt_tokens": len(prompt.split()), "completion_tokens": len(summary.split())}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        if body.get("stream"):
+            try:
+                self._stream(body, summary, usage)
+            except (BrokenPipeError, ConnectionResetError):
+                # the client gave up on the stream (e.g. a latency budget ran out)
+                self.close_connection = True
+            return
+        if self.server.token_delay:
+            # a blocking completion arrives once every token has been generated
+            time.sleep(self.server.token_delay * len(summary.split()))
+        payload = json.dumps(
+            {
+                "id": "stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": summary}}
+                ],
+                "usage": usage,
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _stream(self, body: dict, summary: str, usage: dict) -> None:
+        # server-sent events over chunked encoding, one word per delta
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        deltas = [{"role": "assistant", "content": ""}]
+        deltas += [{"content": word} for word in re.findall(r"\S+\s*", summary)]
+        for i, delta in enumerate(deltas + [{}]):
+            if i and self.server.token_delay:
+                time.sleep(self.server.token_delay)
+            event = {
+                "id": "stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None if delta else "stop"}],
+            }
+            self._chunk(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n")
+        if (body.get("stream_options") or {}).get("include_usage"):
+            # like the real API: a final chunk with no choices and the usage
+            event = {
+                "id": "stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [],
+                "usage": usage,
+            }
+            self._chunk(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n")
+        self._chunk(b"data: [DONE]\n\n")
+        self._chunk(b"")
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address) -> None:
+        # a client that timed out and hung up mid-response is expected here
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class StubLLMServer:
+    # OpenAI-compatible /chat/completions on 127.0.0.1 with a fixed latency,
+    # so the real client stack can be benchmarked without the network.
+
+    def __init__(self, latency: float = 0.0, summary_sentences: int = 3, token_delay: float = 0.0) -> None:
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.summary_sentences = summary_sentences
+        self._server.token_delay = token_delay
+        self._server.lock = threading.Lock()
+        self._server.requests = 0
+        self._server.connections = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    @property
+    def connections(self) -> int:
+        return self._server.connections
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="llm-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
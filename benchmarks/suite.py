@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmarks.llm_stub import StubLLMServer
+from src.abstractive.llm_summarizer import LLMConfig, MetisLLMSummarizer
+from src.eval.metrics import coverage_score, redundancy_score
+from src.extractive.similarity import build_tfidf_vectors, cosine_similarity_matrix
+from src.extractive.similarity_kernel import CondensedSimilarity, condensed_cosine
+from src.extractive.textrank import TextRankConfig, _power_iteration_condensed, textrank_summarize
+from src.merge.merge_engine import merge_summaries
+from src.utils.preprocessing import tokenize
+from src.utils.text_splitter import split_sentences
+
+
+DEFAULT_SIZES = (10, 100, 1000, 5000, 20000)
+LANGUAGES = ("en", "fa")
+
+_ALPHABETS = {
+    "en": "abcdefghijklmnopqrstuvwxyz",
+    "fa": "ابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی",
+}
+_TERMINATORS = {"en": (". ", "! ", "? "), "fa": (". ", "؟ ", "! ")}
+
+
+def _vocabulary(language: str, size: int, rng: random.Random) -> List[str]:
+    letters = _ALPHABETS[language]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(2, 9))))
+    return sorted(words)
+
+
+def synthetic_document(n_sentences: int, language: str = "en", seed: int = 0, vocab_size: int = 5000) -> str:
+
+    # Zipf-like word frequencies so sentences share terms the way real text does
+    rng = random.Random(f"{language}:{seed}")
+    vocab = _vocabulary(language, vocab_size, rng)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    parts = []
+    for _ in range(n_sentences):
+        words = rng.choices(vocab, weights=weights, k=rng.randint(8, 20))
+        parts.append(" ".join(words) + rng.choice(_TERMINATORS[language]))
+    return "".join(parts).strip()
+
+
+class Fixture:
+    # Inputs for one (language, size) cell, each built once and shared by cases.
+
+    def __init__(self, language: str, n_sentences: int, llm: Optional[MetisLLMSummarizer] = None) -> None:
+        self.language = language
+        self.n_sentences = n_sentences
+        self.text = synthetic_document(n_sentences, language)
+        self.llm = llm
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return split_sentences(self.text)
+
+    @cached_property
+    def vectors(self) -> List[Dict[str, float]]:
+        return build_tfidf_vectors(self.sentences)[0]
+
+    @cached_property
+    def similarity(self) -> CondensedSimilarity:
+        return condensed_cosine(self.vectors)
+
+    @cached_property
+    def summary(self) -> List[str]:
+        return self.sentences[:5]
+
+    @cached_property
+    def abstractive(self) -> str:
+        return " ".join(s + "." for s in self.sentences[-8:])
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    run: Callable[[Fixture], object]
+    # O(n^2) stages are not run past this many sentences
+    max_sentences: Optional[int] = None
+
+
+def _llm(fx: Fixture) -> str:
+    return fx.llm.summarize(fx.text, target_sentences=3)
+
+
+CASES = (
+    BenchCase("split_sentences", lambda fx: split_sentences(fx.text)),
+    BenchCase("tokenize", lambda fx: [tokenize(s) for s in fx.sentences]),
+    BenchCase("build_tfidf_vectors", lambda fx: build_tfidf_vectors(fx.sentences)),
+    BenchCase("cosine_similarity_matrix", lambda fx: cosine_similarity_matrix(fx.vectors), max_sentences=2000),
+    BenchCase("textrank_iteration", lambda fx: _power_iteration_condensed(fx.similarity, TextRankConfig()), max_sentences=2000),
+    BenchCase("textrank_summarize", lambda fx: textrank_summarize(fx.sentences, k=5), max_sentences=2000),
+    BenchCase(
+        "textrank_sparse_graph",
+        lambda fx: textrank_summarize(fx.sentences, k=5, config=TextRankConfig(graph="sparse", solver="matrix")),
+        max_sentences=5000,
+    ),
+    BenchCase("merge_summaries", lambda fx: merge_summaries(fx.summary, fx.abstractive, k=4)),
+    BenchCase("redundancy_score", lambda fx: redundancy_score(fx.sentences), max_sentences=2000),
+    BenchCase("coverage_score", lambda fx: coverage_score(fx.text, " ".join(fx.summary))),
+    BenchCase("llm_stub", _llm, max_sentences=1000),
+)
+
+
+@dataclass
+class BenchResult:
+    case: str
+    language: str
+    sentences: int
+    samples: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    sentences_per_sec: float
+    peak_kb: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}/{self.language}/{self.sentences}"
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+
+    # nearest-rank percentile, q in [0, 100]
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def measure(fn: Callable[[], object], min_repeat: int = 5, max_repeat: int = 50, budget: float = 1.0) -> List[float]:
+    fn()  # warm-up
+    samples: List[float] = []
+    start = time.perf_counter()
+    while len(samples) < max_repeat:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= min_repeat and time.perf_counter() - start > budget:
+            break
+    return samples
+
+
+def peak_memory(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(case: BenchCase, fx: Fixture, min_repeat: int = 5, max_repeat: int = 50, budget: float = 1.0) -> BenchResult:
+    samples = measure(lambda: case.run(fx), min_repeat=min_repeat, max_repeat=max_repeat, budget=budget)
+    p50 = percentile(samples, 50)
+    return BenchResult(
+        case=case.name,
+        language=fx.language,
+        sentences=fx.n_sentences,
+        samples=len(samples),
+        p50_ms=p50 * 1000,
+        p95_ms=percentile(samples, 95) * 1000,
+        mean_ms=sum(samples) / len(samples) * 1000,
+        sentences_per_sec=fx.n_sentences / p50 if p50 > 0 else float("inf"),
+        peak_kb=peak_memory(lambda: case.run(fx)) / 1024,
+    )
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    languages: Sequence[str] = LANGUAGES,
+    cases: Sequence[str] | None = None,
+    min_repeat: int = 5,
+    max_repeat: int = 50,
+    budget: float = 1.0,
+    llm_latency: float = 0.0,
+    log=None,
+) -> List[BenchResult]:
+
+    selected = [c for c in CASES if cases is None or c.name in cases]
+    unknown = set(cases or ()) - {c.name for c in CASES}
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+
+    results: List[BenchResult] = []
+    with StubLLMServer(latency=llm_latency) as stub:
+        llm = MetisLLMSummarizer(LLMConfig(base_url=stub.base_url), api_key="stub", cache=None)
+        for language in languages:
+            for size in sizes:
+                fx = Fixture(language, size, llm=llm)
+                for case in selected:
+                    if case.max_sentences is not None and size > case.max_sentences:
+                        continue
+                    result = run_case(case, fx, min_repeat=min_repeat, max_repeat=max_repeat, budget=budget)
+                    results.append(result)
+                    if log is not None:
+                        print(
+                            f"{result.key:42s} p50 {result.p50_ms:10.3f} ms  p95 {result.p95_ms:10.3f} ms  "
+                            f"{result.sentences_per_sec:12.0f} sent/s  peak {result.peak_kb:10.1f} KB",
+                            file=log,
+                        )
+    return results
+
+
+def to_json(results: Sequence[BenchResult]) -> dict:
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": [asdict(r) for r in results],
+    }
+
+
+def find_regressions(
+    results: Sequence[BenchResult],
+    baseline: dict,
+    max_regression_pct: float = 20.0,
+    metric: str = "p50_ms",
+) -> List[str]:
+
+    # only cells present in both runs are compared
+    previous = {f"{r['case']}/{r['language']}/{r['sentences']}": r for r in baseline.get("results", [])}
+    regressions: List[str] = []
+    for r in results:
+        old = previous.get(r.key)
+        if old is None or old[metric] <= 0:
+            continue
+        new = getattr(r, metric)
+        change = (new - old[metric]) / old[metric] * 100.0
+        if change > max_regression_pct:
+            regressions.append(f"{r.key}: {metric} {old[metric]:.3f} -> {new:.3f} (+{change:.1f}%)")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarization benchmark suite with baseline regression checks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="sentences per document")
+    parser.add_argument("--languages", nargs="+", choices=LANGUAGES, default=list(LANGUAGES))
+    parser.add_argument("--cases", nargs="+", default=None, help=f"subset of: {', '.join(c.name for c in CASES)}")
+    parser.add_argument("--min-repeat", type=int, default=5)
+    parser.add_argument("--max-repeat", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per case once --min-repeat is met")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="stub LLM server delay in seconds")
+    parser.add_argument("-o", "--output", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=None, help="results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed p50 slowdown in percent")
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        sizes=args.sizes,
+        languages=args.languages,
+        cases=args.cases,
+        min_repeat=args.min_repeat,
+        max_repeat=args.max_repeat,
+        budget=args.budget,
+        llm_latency=args.llm_latency,
+        log=sys.stdout,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(to_json(results), f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f), max_regression_pct=args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
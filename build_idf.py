@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from src.cli import discover_files, iter_documents
+from src.extractive.idf_model import IdfModel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fit a corpus IDF model for TextRank (python -m src --idf ...)")
+    parser.add_argument("inputs", nargs="+", help="files or directories (.txt, .md, .jsonl)")
+    parser.add_argument("-o", "--output", default="corpus.idf", help="model path")
+    parser.add_argument("--min-df", type=int, default=2, help="drop terms seen in fewer sentences")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the document text")
+    args = parser.parse_args()
+
+    def texts():
+        for path in discover_files(args.inputs):
+            for doc in iter_documents(path, text_field=args.text_field):
+                yield doc.read_text()
+
+    t0 = time.perf_counter()
+    model = IdfModel.fit_texts(texts(), min_df=args.min_df)
+    model.save(args.output)
+    print(f"{len(model)} terms over {model.n_docs} sentences -> {args.output} ({time.perf_counter() - t0:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,26 @@
 from __future__ import annotations
 
+import argparse
 import csv
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 import matplotlib.pyplot as plt
 
+from src.eval.runner import iter_eval_records
 
-def read_results(csv_path: Path) -> List[dict]:
-    rows: List[dict] = []
-    with csv_path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            rows.append(r)
-    return rows
 
+def read_results(path: Path) -> Iterator[dict]:
+    # rows are yielded one at a time; JSONL is the streamed evaluator's output
+    if path.suffix == ".jsonl":
+        yield from iter_eval_records(path)
+        return
+    with path.open("r", encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
 
-def pivot(rows: List[dict], metric: str) -> Tuple[List[str], List[str], Dict[str, Dict[str, float]]]:
+
+def pivot(rows: Iterable[dict], metric: str) -> Tuple[List[str], List[str], Dict[str, Dict[str, float]]]:
     """
     Returns:
       text_ids: sorted list of text ids
@@ -26,22 +29,25 @@ def pivot(rows: List[dict], metric: str) -> Tuple[List[str], List[str], Dict[str
     """
     preferred = ["textrank", "llm", "hybrid"]
 
-    text_ids = sorted({r["text_id"] for r in rows})
-    methods_found = sorted({r["method"] for r in rows})
-    methods = [m for m in preferred if m in methods_found] + [m for m in methods_found if m not in preferred]
-
+    # single pass, so rows can be a stream
     data: Dict[str, Dict[str, float]] = defaultdict(dict)
+    methods_found = set()
     for r in rows:
         t = r["text_id"]
         m = r["method"]
         val = float(r[metric])
         data[t][m] = val
+        methods_found.add(m)
+
+    text_ids = sorted(data)
+    methods_found = sorted(methods_found)
+    methods = [m for m in preferred if m in methods_found] + [m for m in methods_found if m not in preferred]
 
     return text_ids, methods, data
 
 
 def plot_grouped_bars(
-    rows: List[dict],
+    rows: Iterable[dict],
     metric: str,
     title: str,
     ylabel: str,
@@ -74,19 +80,28 @@ def plot_grouped_bars(
     plt.close()
 
 
+def _default_results() -> Path:
+    for name in ("evaluation_results.jsonl", "evaluation_results.csv"):
+        if Path(name).exists():
+            return Path(name)
+    raise FileNotFoundError("evaluation_results.jsonl/.csv not found. Run run_evaluation.py first.")
+
+
 def main() -> None:
-    csv_path = Path("evaluation_results.csv")
-    if not csv_path.exists():
-        raise FileNotFoundError("evaluation_results.csv not found. Run run_evaluation.py first.")
+    parser = argparse.ArgumentParser(description="Plot evaluation results")
+    parser.add_argument("results", nargs="?", default=None, help="results .jsonl or .csv")
+    args = parser.parse_args()
 
-    rows = read_results(csv_path)
+    results_path = Path(args.results) if args.results else _default_results()
+    if not results_path.exists():
+        raise FileNotFoundError(f"{results_path} not found. Run run_evaluation.py first.")
 
     out_dir = Path("plots")
     out_dir.mkdir(exist_ok=True)
 
     # Runtime chart
     plot_grouped_bars(
-        rows=rows,
+        rows=read_results(results_path),
         metric="runtime_sec",
         title="Runtime Comparison (seconds)",
         ylabel="Seconds",
@@ -95,7 +110,7 @@ def main() -> None:
 
     # Coverage chart
     plot_grouped_bars(
-        rows=rows,
+        rows=read_results(results_path),
         metric="coverage",
         title="Token Coverage Comparison",
         ylabel="Coverage (0-1)",
@@ -104,7 +119,7 @@ def main() -> None:
 
     # Words chart
     plot_grouped_bars(
-        rows=rows,
+        rows=read_results(results_path),
         metric="words",
         title="Summary Length Comparison (words)",
         ylabel="Words",
@@ -113,7 +128,7 @@ def main() -> None:
 
     # Redundancy chart
     plot_grouped_bars(
-        rows=rows,
+        rows=read_results(results_path),
         metric="redundancy",
         title="Redundancy Comparison (avg cosine similarity)",
         ylabel="Redundancy",
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+import argparse
 import csv
 from pathlib import Path
 
-from src.eval.runner import evaluate_texts
+from src.eval.runner import EVAL_METHODS, evaluate_stream, evaluate_texts, iter_eval_texts
 
 
 def main() -> None:
-    texts = [
+    parser = argparse.ArgumentParser(description="Evaluate TextRank, LLM and hybrid summaries")
+    parser.add_argument("inputs", nargs="*", help="files or directories (.txt, .md, .jsonl); default: built-in samples")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="evaluation_results.jsonl",
+        help="resumable JSONL results (a .csv path uses the in-memory runner)",
+    )
+    parser.add_argument("--fresh", action="store_true", help="discard earlier JSONL results instead of resuming")
+    parser.add_argument("--methods", nargs="+", choices=EVAL_METHODS, default=list(EVAL_METHODS))
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the document text")
+    parser.add_argument("--id-field", default="id", help="JSONL field holding the document id")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for .csv output (1 = sequential)")
+    parser.add_argument("--chunk-size", type=int, default=1, help="texts sent to a worker per task")
+    args = parser.parse_args()
+
+    samples = [
         (
             "Artificial intelligence is transforming medicine. "
             "Machine learning models help doctors detect diseases early. "
@@ -22,11 +39,35 @@ def main() -> None:
         ),
     ]
 
+    output_path = Path(args.output)
+    if output_path.suffix != ".csv":
+        if args.inputs:
+            texts = iter_eval_texts(args.inputs, text_field=args.text_field, id_field=args.id_field)
+        else:
+            texts = ((f"text_{idx}", t) for idx, t in enumerate(samples, 1))
+        stats = evaluate_stream(
+            texts,
+            output_path,
+            k_extractive=2,
+            k_final=4,
+            llm_target_sentences=3,
+            methods=args.methods,
+            fresh=args.fresh,
+        )
+        print(
+            f"{stats['evaluated']} results written, {stats['skipped']} already done, {stats['failed']} failed "
+            f"-> {output_path.resolve()}"
+        )
+        return
+
+    texts = [t for _, t in iter_eval_texts(args.inputs, args.text_field, args.id_field)] if args.inputs else samples
     results = evaluate_texts(
         texts,
         k_extractive=2,
         k_final=4,
         llm_target_sentences=3,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
     )
 
 
@@ -43,8 +84,6 @@ def main() -> None:
             print("summary:", r.summary)
 
     #  SAVE CSV 
-    output_path = Path("evaluation_results.csv")
-
     with output_path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(
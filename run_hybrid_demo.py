@@ -1,9 +1,6 @@
 from __future__ import annotations
 
-from src.abstractive.llm_summarizer import MetisLLMSummarizer
-from src.extractive.textrank import textrank_summarize
-from src.merge.merge_engine import merge_summaries
-from src.utils.text_splitter import split_sentences
+from src.merge.hybrid_pipeline import HybridPipeline
 
 print("STARTING DEMO...")
 import sys; sys.stdout.flush()
@@ -21,18 +18,12 @@ def main() -> None:
     k_extractive = 2
     k_final = 3
 
-    sentences = split_sentences(text)
+    with HybridPipeline(k_extractive=k_extractive, k_final=k_final, llm_target_sentences=3) as pipeline:
+        result = pipeline.run(text)
 
-    extractive_summary, scores = textrank_summarize(sentences, k=k_extractive)
-
-    summarizer = MetisLLMSummarizer()
-    abstractive_text = summarizer.summarize(text, target_sentences=3)
-
-    final_summary = merge_summaries(
-        extractive_summary=extractive_summary,
-        abstractive_text=abstractive_text,
-        k=k_final,
-    )
+    extractive_summary = result.extractive_summary
+    abstractive_text = result.abstractive_text
+    final_summary = result.final_summary
 
     print("\n================ INPUT TEXT ================\n")
     print(text)
@@ -48,6 +39,10 @@ def main() -> None:
     for i, s in enumerate(final_summary, 1):
         print(f"{i}. {s}")
 
+    print("\n================ TIMINGS ================\n")
+    for stage, seconds in result.timings.items():
+        print(f"{stage:>10}: {seconds * 1000:.1f} ms")
+
 
 if __name__ == "__main__":
     main()
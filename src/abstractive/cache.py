@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+def normalize_for_cache(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def cache_key(*parts: object) -> str:
+    payload = json.dumps([str(p) for p in parts], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+
+
+class SummaryCache:
+
+    def __init__(
+        self,
+        max_memory_entries: int = 1024,
+        path: Optional[str | Path] = None,
+        max_disk_entries: int = 100_000,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed)")
+            self._db.commit()
+            # running row count, so put() does not scan the table per insert
+            (self._disk_rows,) = self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.stats.hits += 1
+                    self.stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created FROM summaries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created = row
+                    if not self._expired(created, now):
+                        self._db.execute("UPDATE summaries SET accessed = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, value, created)
+                        self.stats.hits += 1
+                        self.stats.disk_hits += 1
+                        return value
+                    self._disk_rows -= self._db.execute("DELETE FROM summaries WHERE key = ?", (key,)).rowcount
+                    self._db.commit()
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is None:
+                return
+            updated = self._db.execute(
+                "UPDATE summaries SET value = ?, created = ?, accessed = ? WHERE key = ?",
+                (value, now, now, key),
+            ).rowcount
+            if not updated:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO summaries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._disk_rows += 1
+            if self._disk_rows > self.max_disk_entries:
+                # other processes may share the file, so recount before evicting
+                (self._disk_rows,) = self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()
+                overflow = self._disk_rows - self.max_disk_entries
+                if overflow > 0:
+                    self._db.execute(
+                        "DELETE FROM summaries WHERE key IN "
+                        "(SELECT key FROM summaries ORDER BY accessed ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self._disk_rows -= overflow
+                    self.stats.evictions += overflow
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM summaries")
+                self._db.commit()
+                self._disk_rows = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_DEFAULT_CACHE: Optional[SummaryCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_cache() -> Optional[SummaryCache]:
+
+    # Opt-in process-wide cache: METISAI_SUMMARY_CACHE=<sqlite path>
+    global _DEFAULT_CACHE
+    path = os.getenv("METISAI_SUMMARY_CACHE")
+    if not path:
+        return None
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None:
+            ttl = os.getenv("METISAI_SUMMARY_CACHE_TTL")
+            _DEFAULT_CACHE = SummaryCache(path=path, ttl_seconds=float(ttl) if ttl else None)
+        return _DEFAULT_CACHE
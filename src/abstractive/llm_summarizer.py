@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import os
+import threading
+import weakref
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
-from openai import OpenAI
+from openai import (
+    DEFAULT_CONNECTION_LIMITS,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+)
+
+from src.abstractive.cache import SummaryCache, cache_key, default_cache, normalize_for_cache
+from src.utils.instrumentation import count, stage
+from src.utils.text_splitter import iter_sentences
 
 @dataclass(frozen=True)
 class LLMConfig:
@@ -12,25 +26,163 @@ class LLMConfig:
     base_url: str = "https://api.metisai.ir/openai/v1"
     temperature: float = 0.2
     max_tokens: int = 250
+    max_concurrency: int = 8
+    request_timeout: Optional[float] = 60.0
+    # keep-alive pool of the process-wide client for this endpoint
+    pool_size: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _http_options(config: LLMConfig) -> dict:
+    # the SDK's httpx.Limits type, so httpx itself never has to be imported here
+    limits = type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=DEFAULT_CONNECTION_LIMITS.max_connections,
+        max_keepalive_connections=config.pool_size,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    return {"limits": limits, "http2": config.http2 and http2_available()}
+
+
+_CLIENTS: Dict[Tuple, OpenAI] = {}
+_SUMMARIZERS: Dict[Tuple, "MetisLLMSummarizer"] = {}
+_REGISTRY_LOCK = threading.Lock()
+_SUMMARIZERS_LOCK = threading.Lock()
+
+
+def shared_client(config: LLMConfig, api_key: str) -> OpenAI:
+
+    # One OpenAI client, and so one connection pool, per endpoint and key for
+    # the whole process; the sync httpx client is safe to share across threads.
+    key = (api_key, config.base_url, config.pool_size, config.keepalive_expiry, config.http2)
+    with _REGISTRY_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _CLIENTS[key] = OpenAI(
+                api_key=api_key,
+                base_url=config.base_url,
+                http_client=DefaultHttpxClient(**_http_options(config)),
+            )
+        return client
+
+
+def shared_summarizer(config: LLMConfig = LLMConfig(), api_key: Optional[str] = None) -> "MetisLLMSummarizer":
+    key = (config, api_key or os.getenv("METISAI_API_KEY"))
+    # separate lock: the constructor takes the client lock itself
+    with _SUMMARIZERS_LOCK:
+        summarizer = _SUMMARIZERS.get(key)
+        if summarizer is None:
+            summarizer = _SUMMARIZERS[key] = MetisLLMSummarizer(config, api_key=api_key)
+        return summarizer
+
+
+def close_shared_clients() -> None:
+    with _SUMMARIZERS_LOCK, _REGISTRY_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+        _SUMMARIZERS.clear()
+    for client in clients:
+        client.close()
+
+
+def _reset_after_fork() -> None:
+    # a forked worker must not write to the parent's pooled sockets
+    global _REGISTRY_LOCK, _SUMMARIZERS_LOCK
+    _REGISTRY_LOCK = threading.Lock()
+    _SUMMARIZERS_LOCK = threading.Lock()
+    _CLIENTS.clear()
+    _SUMMARIZERS.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _record_usage(resp) -> None:
+    count("llm.requests")
+    usage = getattr(resp, "usage", None)
+    if usage is not None:
+        count("llm.prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0)
+        count("llm.completion_tokens", getattr(usage, "completion_tokens", 0) or 0)
+
+
+class BatchSummaryError(RuntimeError):
+    # Raised by summarize_many when some texts failed. results keeps every
+    # finished summary in input order (None where it failed); errors maps
+    # those indices to their exceptions.
+
+    def __init__(self, results: List[Optional[str]], errors: Dict[int, BaseException]) -> None:
+        first = errors[min(errors)]
+        super().__init__(f"{len(errors)} of {len(results)} summaries failed; first: {first!r}")
+        self.results = results
+        self.errors = errors
+
 
 class MetisLLMSummarizer:
 
-    def __init__(self, config: LLMConfig = LLMConfig(), api_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        config: LLMConfig = LLMConfig(),
+        api_key: Optional[str] = None,
+        cache: Optional[SummaryCache] = None,
+    ) -> None:
         self.config = config
+        self.cache = cache if cache is not None else default_cache()
         key = api_key or os.getenv("METISAI_API_KEY")
         if not key:
             raise RuntimeError(
                 "Missing METISAI_API_KEY. Set it as an environment variable before running."
             )
 
-        self.client = OpenAI(api_key=key, base_url=config.base_url)
+        self._api_key = key
+        self.client = shared_client(config, key)
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._unbound_async_client: Optional[AsyncOpenAI] = None
+        self._async_lock = threading.Lock()
 
-    def summarize(self, text: str, target_sentences: int = 5) -> str:
- 
-        text = (text or "").strip()
-        if not text:
-            return ""
+    def _new_async_client(self) -> AsyncOpenAI:
+        return AsyncOpenAI(
+            api_key=self._api_key,
+            base_url=self.config.base_url,
+            http_client=DefaultAsyncHttpxClient(**_http_options(self.config)),
+        )
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        # Async connections belong to the event loop that opened them, so each
+        # loop gets its own client; threads sharing this instance (it is the
+        # process-wide default) never touch each other's. A client built
+        # outside any loop is adopted by the first loop that asks.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._async_lock:
+            if loop is None:
+                if self._unbound_async_client is None:
+                    self._unbound_async_client = self._new_async_client()
+                return self._unbound_async_client
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._unbound_async_client or self._new_async_client()
+                self._unbound_async_client = None
+                self._async_clients[loop] = client
+            return client
 
+    async def aclose(self) -> None:
+        # close the running loop's client while that loop can still await it
+        with self._async_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def _build_messages(self, text: str, target_sentences: int) -> List[Dict[str, str]]:
         system_msg = (
             "You are a helpful assistant that writes concise, faithful summaries. "
             "Do not invent facts. Keep the summary readable."
@@ -43,15 +195,175 @@ class MetisLLMSummarizer:
             f"TEXT:\n{text}"
         )
 
-        resp = self.client.chat.completions.create(
+        return [
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": user_msg},
+        ]
+
+    def _cache_key(self, text: str, target_sentences: int) -> str:
+        c = self.config
+        return cache_key(
+            c.model, c.base_url, c.temperature, c.max_tokens, target_sentences, normalize_for_cache(text)
+        )
+
+    def summarize(self, text: str, target_sentences: int = 5, timeout: Optional[float] = None) -> str:
+ 
+        text = (text or "").strip()
+        if not text:
+            return ""
+
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(text, target_sentences)
+            hit = self.cache.get(key)
+            if hit is not None:
+                count("llm.cache_hits")
+                return hit
+
+        client = self.client
+        if timeout is not None:
+            # a bound on the whole call, as in asummarize: a retry would restart the clock
+            client = client.with_options(timeout=timeout, max_retries=0)
+        with stage("llm"):
+            resp = client.chat.completions.create(
+                model=self.config.model,
+                messages=self._build_messages(text, target_sentences),
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+            )
+        _record_usage(resp)
+
+        out = (resp.choices[0].message.content or "").strip()
+        if key is not None:
+            self.cache.put(key, out)
+        return out
+
+    def stream(self, text: str, target_sentences: int = 5, timeout: Optional[float] = None) -> Iterator[str]:
+
+        # Yields content deltas as they arrive. A cache hit comes back as one
+        # piece, and only a fully consumed stream is written to the cache.
+        # timeout bounds each wait for the next bytes, the first token included.
+        text = (text or "").strip()
+        if not text:
+            return
+
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(text, target_sentences)
+            hit = self.cache.get(key)
+            if hit is not None:
+                count("llm.cache_hits")
+                yield hit
+                return
+
+        client = self.client
+        if timeout is not None:
+            client = client.with_options(timeout=timeout, max_retries=0)
+        parts: List[str] = []
+        last = None
+        with stage("llm"), client.chat.completions.create(
             model=self.config.model,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_msg},
-            ],
+            messages=self._build_messages(text, target_sentences),
             temperature=self.config.temperature,
             max_tokens=self.config.max_tokens,
-        )
+            stream=True,
+            # usage only comes, in a final chunk, when asked for
+            stream_options={"include_usage": True},
+        ) as chunks:
+            for last in chunks:
+                for choice in last.choices:
+                    delta = choice.delta.content if choice.delta is not None else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+        if last is not None:
+            _record_usage(last)
+
+        if key is not None:
+            self.cache.put(key, "".join(parts).strip())
+
+    def stream_sentences(self, text: str, target_sentences: int = 5) -> Iterator[str]:
+        # each sentence as soon as its terminator arrives
+        return iter_sentences(self.stream(text, target_sentences=target_sentences))
+
+    async def asummarize(
+        self,
+        text: str,
+        target_sentences: int = 5,
+        timeout: Optional[float] = None,
+    ) -> str:
+
+        text = (text or "").strip()
+        if not text:
+            return ""
+
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(text, target_sentences)
+            hit = self.cache.get(key)
+            if hit is not None:
+                count("llm.cache_hits")
+                return hit
+
+        timeout = self.config.request_timeout if timeout is None else timeout
+        with stage("llm"):
+            resp = await asyncio.wait_for(
+                self.async_client.chat.completions.create(
+                    model=self.config.model,
+                    messages=self._build_messages(text, target_sentences),
+                    temperature=self.config.temperature,
+                    max_tokens=self.config.max_tokens,
+                ),
+                timeout=timeout,
+            )
+        _record_usage(resp)
+
+        out = (resp.choices[0].message.content or "").strip()
+        if key is not None:
+            self.cache.put(key, out)
+        return out
+
+    async def asummarize_many(
+        self,
+        texts: Sequence[str],
+        target_sentences: int = 5,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[str]:
+
+        limit = max_concurrency or self.config.max_concurrency
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _one(text: str) -> str:
+            async with semaphore:
+                return await self.asummarize(text, target_sentences=target_sentences, timeout=timeout)
+
+        # gather() keeps input order regardless of completion order; one failed
+        # request must not discard the summaries that did finish
+        outcomes = await asyncio.gather(*(_one(t) for t in texts), return_exceptions=True)
+        errors = {i: o for i, o in enumerate(outcomes) if isinstance(o, BaseException)}
+        if errors:
+            results = [None if i in errors else o for i, o in enumerate(outcomes)]
+            raise BatchSummaryError(results, errors)
+        return list(outcomes)
+
+    def summarize_many(
+        self,
+        texts: Sequence[str],
+        target_sentences: int = 5,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[str]:
+
+        async def _run() -> List[str]:
+            try:
+                return await self.asummarize_many(
+                    texts,
+                    target_sentences=target_sentences,
+                    max_concurrency=max_concurrency,
+                    timeout=timeout,
+                )
+            finally:
+                await self.aclose()
 
-        out = resp.choices[0].message.content or ""
-        return out.strip()
+        return asyncio.run(_run())
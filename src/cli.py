@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import codecs
+import json
+import mmap
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Sequence
+
+from src.abstractive.llm_summarizer import MetisLLMSummarizer, shared_summarizer
+from src.extractive.hierarchical import (
+    SECTIONING_MODES,
+    HierarchicalConfig,
+    hierarchical_summarize,
+    hierarchical_textrank,
+    window_sections,
+)
+from src.extractive.idf_model import IdfModel
+from src.extractive.textrank import textrank_summarize_stream
+from src.merge.hybrid_pipeline import HybridPipeline
+from src.utils.instrumentation import collecting
+from src.utils.text_splitter import DEFAULT_CHUNK_SIZE, iter_sentences
+
+
+MODES = ("textrank", "llm", "hybrid")
+TEXT_SUFFIXES = (".txt", ".md")
+JSONL_SUFFIXES = (".jsonl",)
+
+
+@dataclass
+class Document:
+    doc_id: str
+    source: str
+    nbytes: int
+    # Either a lazily-paged byte buffer (plain text files) or decoded text (JSONL rows).
+    buffer: Optional[mmap.mmap] = None
+    text: Optional[str] = None
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        if self.buffer is None:
+            yield (self.text or "").encode("utf-8")
+            return
+        for start in range(0, len(self.buffer), chunk_size):
+            yield self.buffer[start : start + chunk_size]
+
+    def read_text(self) -> str:
+        if self.text is not None:
+            return self.text
+        return "".join(iter_decoded(self.chunks()))
+
+
+def iter_decoded(chunks: Iterator[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[Optional[mmap.mmap]]:
+    with path.open("rb") as f:
+        if path.stat().st_size == 0:
+            yield None
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+def discover_files(paths: Sequence[str]) -> List[Path]:
+    files: List[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(
+                sorted(f for f in p.rglob("*") if f.is_file() and f.suffix in TEXT_SUFFIXES + JSONL_SUFFIXES)
+            )
+        elif p.is_file():
+            files.append(p)
+        else:
+            raise FileNotFoundError(f"Input not found: {p}")
+    return files
+
+
+def iter_documents(path: Path, text_field: str = "text", id_field: str = "id") -> Iterator[Document]:
+    with _mapped(path) as mm:
+        if path.suffix in JSONL_SUFFIXES:
+            if mm is None:
+                return
+            line_no = 0
+            for raw in iter(mm.readline, b""):
+                line_no += 1
+                if not raw.strip():
+                    continue
+                row = json.loads(raw)
+                yield Document(
+                    doc_id=str(row.get(id_field, f"{path.name}:{line_no}")),
+                    source=str(path),
+                    nbytes=len(raw),
+                    text=row.get(text_field) or "",
+                )
+        else:
+            yield Document(doc_id=path.stem, source=str(path), nbytes=path.stat().st_size, buffer=mm)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src", description="Summarize text/JSONL files to JSONL")
+    parser.add_argument("inputs", nargs="+", help="files or directories (.txt, .md, .jsonl)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output path ('-' for stdout)")
+    parser.add_argument("--mode", choices=MODES, default="textrank")
+    parser.add_argument("--k", type=int, default=3, help="extractive sentences")
+    parser.add_argument("--k-final", type=int, default=4, help="hybrid summary sentences")
+    parser.add_argument("--llm-target", type=int, default=3, help="LLM target sentences")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the document text")
+    parser.add_argument("--id-field", default="id", help="JSONL field holding the document id")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="bytes decoded per step")
+    parser.add_argument("--idf", default=None, help="corpus IDF model from build_idf.py (textrank mode)")
+    parser.add_argument(
+        "--section-size", type=int, default=None, help="textrank mode: rank sections of this many sentences first"
+    )
+    parser.add_argument("--section-k", type=int, default=3, help="sentences kept per section")
+    parser.add_argument("--sectioning", choices=SECTIONING_MODES, default="window")
+    parser.add_argument(
+        "--metrics", default=None, help="write per-stage metrics here (.prom = Prometheus text format, else JSON)"
+    )
+    return parser
+
+
+def _summarize(
+    doc: Document,
+    args: argparse.Namespace,
+    pipeline: Optional[HybridPipeline],
+    summarizer: Optional[MetisLLMSummarizer],
+    idf: Optional[IdfModel] = None,
+) -> str:
+    if args.mode == "textrank" and args.section_size:
+        config = HierarchicalConfig(
+            section_size=args.section_size, section_k=args.section_k, sectioning=args.sectioning
+        )
+        if args.sectioning == "paragraph":
+            result = hierarchical_textrank(doc.read_text(), k=args.k, config=config, idf=idf)
+        else:
+            sections = window_sections(iter_sentences(doc.chunks(args.chunk_size)), args.section_size)
+            result = hierarchical_summarize(sections, k=args.k, config=config, idf=idf)
+        return " ".join(result.summary).strip()
+    if args.mode == "textrank":
+        sentences = iter_sentences(doc.chunks(args.chunk_size))
+        summary, _ = textrank_summarize_stream(sentences, k=args.k, idf=idf)
+        return " ".join(summary).strip()
+    if args.mode == "llm":
+        return summarizer.summarize(doc.read_text(), target_sentences=args.llm_target)
+    return pipeline.run(doc.read_text()).hybrid_text
+
+
+def run(args: argparse.Namespace, out: IO[str], log: Optional[IO[str]] = None) -> dict:
+    pipeline = None
+    summarizer = None
+    if args.mode == "hybrid":
+        pipeline = HybridPipeline(k_extractive=args.k, k_final=args.k_final, llm_target_sentences=args.llm_target)
+    elif args.mode == "llm":
+        summarizer = shared_summarizer()
+    idf = IdfModel.load(args.idf) if args.idf else None
+
+    docs = 0
+    nbytes = 0
+    start = time.perf_counter()
+    try:
+        for path in discover_files(args.inputs):
+            for doc in iter_documents(path, text_field=args.text_field, id_field=args.id_field):
+                t0 = time.perf_counter()
+                summary = _summarize(doc, args, pipeline, summarizer, idf)
+                record = {
+                    "id": doc.doc_id,
+                    "source": doc.source,
+                    "mode": args.mode,
+                    "summary": summary,
+                    "runtime_sec": round(time.perf_counter() - t0, 6),
+                }
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                docs += 1
+                nbytes += doc.nbytes
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+        if idf is not None:
+            idf.close()
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    stats = {
+        "docs": docs,
+        "bytes": nbytes,
+        "seconds": elapsed,
+        "docs_per_sec": docs / elapsed,
+        "mb_per_sec": nbytes / (1024 * 1024) / elapsed,
+    }
+    print(
+        f"{docs} docs, {nbytes / (1024 * 1024):.2f} MB in {elapsed:.2f}s "
+        f"({stats['docs_per_sec']:.1f} docs/sec, {stats['mb_per_sec']:.2f} MB/sec)",
+        file=log or sys.stderr,
+    )
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    with collecting() if args.metrics else nullcontext() as collector:
+        if args.output == "-":
+            run(args, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8") as out:
+                run(args, out)
+    if collector is not None:
+        if args.metrics.endswith(".prom"):
+            collector.write_prometheus(args.metrics)
+        else:
+            Path(args.metrics).write_text(collector.to_json(indent=2), encoding="utf-8")
@@ -3,7 +3,10 @@ from __future__ import annotations
 import re
 from typing import List, Set
 
-from src.extractive.similarity import build_tfidf_vectors
+from src.extractive.sentence_table import SentenceTable
+from src.extractive.similarity import build_tfidf_vectors, similarity_array
+from src.extractive.similarity_kernel import CondensedSimilarity, condensed_cosine
+from src.utils.instrumentation import stage
 
 
 _WORD_RE = re.compile(r"\w+", flags=re.UNICODE)
@@ -25,46 +28,30 @@ def sentence_count(sentences: List[str]) -> int:
     return len([s for s in sentences if (s or "").strip()])
 
 
-def redundancy_score(sentences: List[str]) -> float:
+def redundancy_score(sentences: List[str], backend: str = "dict") -> float:
     
-    sentences = [s.strip() for s in sentences if s and s.strip()]
-    n = len(sentences)
-    if n <= 1:
-        return 0.0
-
-    vectors, _ = build_tfidf_vectors(sentences)
-
-    def cosine_sparse(v1: dict[str, float], v2: dict[str, float]) -> float:
-        if not v1 or not v2:
+    with stage("metrics.redundancy"):
+        sentences = [s.strip() for s in sentences if s and s.strip()]
+        n = len(sentences)
+        if n <= 1:
             return 0.0
-        dot = 0.0
-        if len(v1) > len(v2):
-            v1, v2 = v2, v1
-        for k, a in v1.items():
-            b = v2.get(k)
-            if b is not None:
-                dot += a * b
-        norm1 = sum(a * a for a in v1.values()) ** 0.5
-        norm2 = sum(b * b for b in v2.values()) ** 0.5
-        if norm1 == 0.0 or norm2 == 0.0:
-            return 0.0
-        return dot / (norm1 * norm2)
 
-    total = 0.0
-    pairs = 0
-    for i in range(n):
-        for j in range(i + 1, n):
-            total += cosine_sparse(vectors[i], vectors[j])
-            pairs += 1
+        if backend == "table":
+            return SentenceTable.from_sentences(sentences).condensed_similarity().mean()
+        if backend != "dict":
+            sim = similarity_array(sentences, backend=backend)
+            return CondensedSimilarity.from_array(sim).mean()
 
-    return total / pairs if pairs else 0.0
+        vectors, _ = build_tfidf_vectors(sentences)
+        return condensed_cosine(vectors).mean()
 
 
 def coverage_score(source_text: str, summary_text: str) -> float:
     
-    src = _unique_tokens(source_text)
-    summ = _unique_tokens(summary_text)
-    if not summ:
-        return 0.0
-    overlap = len(summ.intersection(src))
-    return overlap / len(summ)
+    with stage("metrics.coverage"):
+        src = _unique_tokens(source_text)
+        summ = _unique_tokens(summary_text)
+        if not summ:
+            return 0.0
+        overlap = len(summ.intersection(src))
+        return overlap / len(summ)
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import contextvars
+import hashlib
+import json
+import os
+import sys
 import time
-from dataclasses import dataclass
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
-from src.abstractive.llm_summarizer import MetisLLMSummarizer
+from src.abstractive.llm_summarizer import MetisLLMSummarizer, shared_summarizer
+from src.cli import discover_files, iter_documents
 from src.eval.metrics import coverage_score, redundancy_score, word_count
+from src.extractive.hierarchical import HierarchicalConfig, hierarchical_textrank
 from src.extractive.textrank import textrank_summarize
-from src.merge.merge_engine import merge_summaries
+from src.merge.hybrid_pipeline import HybridPipeline
 from src.utils.text_splitter import split_sentences
 
 
@@ -28,16 +38,95 @@ def _run_textrank(text: str, k: int) -> str:
 
 
 def _run_llm(text: str, target_sentences: int) -> str:
-    summarizer = MetisLLMSummarizer()
-    return summarizer.summarize(text, target_sentences=target_sentences).strip()
+    return shared_summarizer().summarize(text, target_sentences=target_sentences).strip()
 
 
 def _run_hybrid(text: str, k_extractive: int, k_final: int, llm_target_sentences: int) -> str:
+    with HybridPipeline(
+        k_extractive=k_extractive,
+        k_final=k_final,
+        llm_target_sentences=llm_target_sentences,
+    ) as pipeline:
+        return pipeline.run(text).hybrid_text
+
+
+def _result(
+    name: str,
+    text: str,
+    summary_sents: List[str],
+    runtime_sec: float,
+    summary: Optional[str] = None,
+) -> EvalResult:
+    # summary is the text as produced, when there is one; else the sentences joined
+    if summary is None:
+        summary = " ".join(summary_sents).strip()
+    return EvalResult(
+        name=name,
+        runtime_sec=runtime_sec,
+        words=word_count(summary),
+        redundancy=redundancy_score(summary_sents),
+        coverage=coverage_score(text, summary),
+        summary=summary,
+    )
+
+
+def compare_hierarchical(
+    text: str,
+    k: int,
+    config: HierarchicalConfig = HierarchicalConfig(),
+) -> Dict[str, EvalResult]:
+
+    # flat TextRank over the whole document vs the two-level section pass
     sentences = split_sentences(text)
-    extractive_sents, _ = textrank_summarize(sentences, k=k_extractive)
-    llm_text = _run_llm(text, target_sentences=llm_target_sentences)
-    final_sents = merge_summaries(extractive_summary=extractive_sents, abstractive_text=llm_text, k=k_final)
-    return " ".join(final_sents).strip()
+    t0 = time.perf_counter()
+    flat, _ = textrank_summarize(sentences, k=k, config=config.textrank)
+    t1 = time.perf_counter()
+    hier = hierarchical_textrank(text, k=k, config=config).summary
+    t2 = time.perf_counter()
+    return {
+        "flat": _result("flat", text, flat, t1 - t0),
+        "hierarchical": _result("hierarchical", text, hier, t2 - t1),
+    }
+
+
+def _timed(name: str, text: str, fn: Callable[[], str]) -> EvalResult:
+    t0 = time.perf_counter()
+    summary = fn()
+    runtime_sec = time.perf_counter() - t0
+    return _result(name, text, split_sentences(summary), runtime_sec, summary=summary)
+
+
+def _evaluate_one(
+    text: str,
+    k_extractive: int,
+    k_final: int,
+    llm_target_sentences: int,
+) -> List[EvalResult]:
+    return [
+        _timed("textrank", text, lambda: _run_textrank(text, k=k_extractive)),
+        _timed("llm", text, lambda: _run_llm(text, target_sentences=llm_target_sentences)),
+        _timed(
+            "hybrid",
+            text,
+            lambda: _run_hybrid(
+                text,
+                k_extractive=k_extractive,
+                k_final=k_final,
+                llm_target_sentences=llm_target_sentences,
+            ),
+        ),
+    ]
+
+
+_WORKER: Dict[str, int] = {}
+
+
+def _init_worker(k_extractive: int, k_final: int, llm_target_sentences: int) -> None:
+    _WORKER.update(k_extractive=k_extractive, k_final=k_final, llm_target_sentences=llm_target_sentences)
+
+
+def _evaluate_in_worker(text: str) -> List[EvalResult]:
+    return _evaluate_one(text, **_WORKER)
 
 
 def evaluate_texts(
@@ -45,61 +134,178 @@ def evaluate_texts(
     k_extractive: int = 3,
     k_final: int = 4,
     llm_target_sentences: int = 3,
+    workers: int = 1,
+    chunk_size: int = 1,
 ) -> Dict[str, List[EvalResult]]:
-    
-    out: Dict[str, List[EvalResult]] = {}
 
-    for idx, text in enumerate(texts, 1):
-        key = f"text_{idx}"
-        out[key] = []
-
-        t0 = time.perf_counter()
-        tr_sum = _run_textrank(text, k=k_extractive)
-        t1 = time.perf_counter()
-        out[key].append(
-            EvalResult(
-                name="textrank",
-                runtime_sec=t1 - t0,
-                words=word_count(tr_sum),
-                redundancy=redundancy_score(split_sentences(tr_sum)),
-                coverage=coverage_score(text, tr_sum),
-                summary=tr_sum,
-            )
-        )
-
-        # LLM
-        t0 = time.perf_counter()
-        llm_sum = _run_llm(text, target_sentences=llm_target_sentences)
-        t1 = time.perf_counter()
-        out[key].append(
-            EvalResult(
-                name="llm",
-                runtime_sec=t1 - t0,
-                words=word_count(llm_sum),
-                redundancy=redundancy_score(split_sentences(llm_sum)),
-                coverage=coverage_score(text, llm_sum),
-                summary=llm_sum,
-            )
-        )
-
-        # Hybrid
-        t0 = time.perf_counter()
-        hyb_sum = _run_hybrid(
-            text,
-            k_extractive=k_extractive,
-            k_final=k_final,
-            llm_target_sentences=llm_target_sentences,
-        )
-        t1 = time.perf_counter()
-        out[key].append(
-            EvalResult(
-                name="hybrid",
-                runtime_sec=t1 - t0,
-                words=word_count(hyb_sum),
-                redundancy=redundancy_score(split_sentences(hyb_sum)),
-                coverage=coverage_score(text, hyb_sum),
-                summary=hyb_sum,
-            )
-        )
+    if workers <= 1:
+        per_text = (_evaluate_one(t, k_extractive, k_final, llm_target_sentences) for t in texts)
+        return {f"text_{idx}": results for idx, results in enumerate(per_text, 1)}
 
+    out: Dict[str, List[EvalResult]] = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(k_extractive, k_final, llm_target_sentences),
+    ) as pool:
+        for idx, results in enumerate(pool.map(_evaluate_in_worker, texts, chunksize=chunk_size), 1):
+            out[f"text_{idx}"] = results
     return out
+
+
+EVAL_METHODS = ("textrank", "llm", "hybrid")
+
+
+def iter_eval_texts(
+    paths: Sequence[str],
+    text_field: str = "text",
+    id_field: str = "id",
+) -> Iterator[Tuple[str, str]]:
+
+    # (text_id, text) pairs read one document at a time, same inputs as the CLI.
+    # Text files are identified by their path, since stems repeat across
+    # directories and suffixes; JSONL rows keep their own id field.
+    for path in discover_files(paths):
+        for doc in iter_documents(path, text_field=text_field, id_field=id_field):
+            text_id = doc.doc_id if doc.text is not None else path.as_posix()
+            yield text_id, doc.read_text()
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def iter_eval_records(path: Union[str, Path]) -> Iterator[dict]:
+
+    # a crash mid-write can leave a torn last line; it is skipped, not fatal
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _drop_torn_tail(path: Path) -> None:
+    with path.open("rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            step = min(pos, 1 << 16)
+            f.seek(pos - step)
+            nl = f.read(step).rfind(b"\n")
+            if nl != -1:
+                pos = pos - step + nl + 1
+                break
+            pos -= step
+        if pos != end:
+            f.truncate(pos)
+
+
+class ResultLog:
+    # Append-only JSONL of EvalResults. Each record is flushed and fsync'd as
+    # soon as it exists, so a crash loses at most the record being written.
+    # done maps (text_id, method) to the digest of the text it was scored on;
+    # a restart only skips pairs whose text is unchanged. fresh=True starts
+    # the log over, e.g. after a code change. concurrent_with names the
+    # methods that ran alongside this one, whose runtime_sec then includes
+    # GIL contention and shared LLM client/cache effects.
+
+    def __init__(self, path: Union[str, Path], fresh: bool = False) -> None:
+        self.path = Path(path)
+        self.done: Dict[Tuple[str, str], Optional[str]] = {}
+        if self.path.exists() and not fresh:
+            _drop_torn_tail(self.path)
+            self.done = {(r["text_id"], r["method"]): r.get("text_hash") for r in iter_eval_records(self.path)}
+        self._f = self.path.open("w" if fresh else "a", encoding="utf-8")
+
+    def is_done(self, text_id: str, method: str, text_hash: str) -> bool:
+        return self.done.get((text_id, method), None) == text_hash
+
+    def append(
+        self,
+        text_id: str,
+        result: EvalResult,
+        text_hash: Optional[str] = None,
+        concurrent_with: Sequence[str] = (),
+    ) -> None:
+        record = {"text_id": text_id, "method": result.name}
+        record.update((k, v) for k, v in asdict(result).items() if k != "name")
+        record["text_hash"] = text_hash
+        record["concurrent_with"] = list(concurrent_with)
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self.done[(text_id, result.name)] = text_hash
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "ResultLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def evaluate_stream(
+    texts: Iterable[Tuple[str, str]],
+    output: Union[str, Path],
+    k_extractive: int = 3,
+    k_final: int = 4,
+    llm_target_sentences: int = 3,
+    methods: Sequence[str] = EVAL_METHODS,
+    summarizer: Optional[MetisLLMSummarizer] = None,
+    log: Optional[IO[str]] = None,
+    fresh: bool = False,
+) -> Dict[str, int]:
+
+    # Texts are pulled one at a time and the methods for a text run
+    # concurrently, so their runtimes are not isolated timings; each record
+    # says what it overlapped with. Finished results go straight to the log.
+    # A failed method is reported and left undone, so the next run retries
+    # just that pair.
+    # Text ids must be unique within a run, or resume could not tell them apart.
+    unknown = set(methods) - set(EVAL_METHODS)
+    if unknown:
+        raise ValueError(f"Unknown evaluation methods: {sorted(unknown)} (expected some of {EVAL_METHODS})")
+    if summarizer is None and ("llm" in methods or "hybrid" in methods):
+        summarizer = shared_summarizer()
+
+    stats = {"evaluated": 0, "skipped": 0, "failed": 0}
+    with ResultLog(output, fresh=fresh) as results, HybridPipeline(
+        summarizer=summarizer,
+        k_extractive=k_extractive,
+        k_final=k_final,
+        llm_target_sentences=llm_target_sentences,
+    ) as pipeline, ThreadPoolExecutor(max_workers=len(methods) or 1, thread_name_prefix="eval") as pool:
+        runners: Dict[str, Callable[[str], str]] = {
+            "textrank": lambda text: _run_textrank(text, k=k_extractive),
+            "llm": lambda text: summarizer.summarize(text, target_sentences=llm_target_sentences).strip(),
+            "hybrid": lambda text: pipeline.run(text).hybrid_text,
+        }
+        seen: Set[str] = set()
+        for text_id, text in texts:
+            if text_id in seen:
+                raise ValueError(f"Duplicate text id {text_id!r}: ids must be unique for resume to work")
+            seen.add(text_id)
+            digest = text_digest(text)
+            todo = [m for m in methods if not results.is_done(text_id, m, digest)]
+            stats["skipped"] += len(methods) - len(todo)
+            futures = {
+                pool.submit(contextvars.copy_context().run, _timed, m, text, partial(runners[m], text)): m
+                for m in todo
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    stats["failed"] += 1
+                    print(f"{text_id}/{futures[future]} failed: {exc!r}", file=log or sys.stderr)
+                    continue
+                overlapped = [m for m in todo if m != result.name]
+                results.append(text_id, result, text_hash=digest, concurrent_with=overlapped)
+                stats["evaluated"] += 1
+    return stats
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.extractive.similarity import _idf
+from src.extractive.similarity_kernel import idf_weight
+from src.extractive.sparse_similarity import _BLOCK_CELLS, TfidfMatrix, cosine_similarity_sparse
+from src.extractive.textrank import TextRankConfig, _select_top_k, summarize_tokens
+from src.utils.instrumentation import count, stage
+from src.utils.preprocessing import stopwords_for, tokenize, tokenize_filtered
+from src.utils.text_splitter import split_sentences
+
+
+# Vectorized similarity + matrix power iteration; same ranking as the defaults.
+# This is also the configuration summarize_batch stacks across documents.
+BATCH_CONFIG = TextRankConfig(similarity_backend="sparse", solver="matrix")
+
+
+class _TokenCache:
+    # News feeds repeat boilerplate sentences (bylines, disclaimers) across
+    # items, so each distinct sentence is tokenized once per batch.
+
+    def __init__(self, stopwords: AbstractSet[str]) -> None:
+        self.stopwords = stopwords
+        self._cache: Dict[str, List[str]] = {}
+
+    def __call__(self, sentence: str) -> List[str]:
+        tokens = self._cache.get(sentence)
+        if tokens is None:
+            tokens = tokenize_filtered(sentence, self.stopwords)
+            self._cache[sentence] = tokens
+        return tokens
+
+
+def tokenize_corpus(
+    texts: Iterable[str],
+    extra_stopwords: List[str] | None = None,
+    stopwords: AbstractSet[str] | None = None,
+) -> Tuple[List[List[str]], List[List[List[str]]]]:
+
+    if stopwords is None:
+        stopwords = stopwords_for(extra_stopwords)
+    token_of = _TokenCache(stopwords)
+    corpus_sentences: List[List[str]] = []
+    corpus_tokens: List[List[List[str]]] = []
+    for text in texts:
+        sentences = split_sentences(text)
+        corpus_sentences.append(sentences)
+        corpus_tokens.append([token_of(s) for s in sentences])
+    return corpus_sentences, corpus_tokens
+
+
+def corpus_idf(corpus_tokens: List[List[List[str]]]) -> Dict[str, float]:
+
+    # every sentence of every document counts as one IDF document
+    return _idf([toks for doc in corpus_tokens for toks in doc])
+
+
+@dataclass(frozen=True)
+class _StackedCorpus:
+    # Every sentence of every document as one row-normalized CSR matrix,
+    # entries sorted by (row, term). cols are positions among the terms of
+    # the row's own document, so a document's rows form a dense n_d x w_d block.
+    rows: np.ndarray
+    cols: np.ndarray
+    data: np.ndarray
+    row_ptr: np.ndarray
+    entry_ptr: np.ndarray
+    widths: np.ndarray
+
+    def doc_rows(self, d: int) -> int:
+        return int(self.row_ptr[d + 1] - self.row_ptr[d])
+
+
+def _stack_corpus(
+    corpus_sentences: List[List[str]],
+    stopwords: AbstractSet[str],
+    idf: Mapping[str, float] | None,
+    use_corpus_idf: bool,
+) -> _StackedCorpus:
+
+    # One dict lookup per token; the stopword / length / idf filter runs once
+    # per distinct term instead of once per token.
+    flat: List[str] = []
+    row_lengths: List[int] = []
+    for sentences in corpus_sentences:
+        for s in sentences:
+            raw = tokenize(s)
+            flat.extend(raw)
+            row_lengths.append(len(raw))
+    vocab: Dict[str, int] = {}
+    flat_ids = [vocab[t] if t in vocab else vocab.setdefault(t, len(vocab)) for t in flat]
+    keep = np.fromiter(
+        (len(t) > 1 and t not in stopwords and (idf is None or idf_weight(idf, t) is not None) for t in vocab),
+        dtype=bool,
+        count=len(vocab),
+    )
+
+    n_docs = len(corpus_sentences)
+    row_ptr = np.zeros(n_docs + 1, dtype=np.int64)
+    np.cumsum([len(sentences) for sentences in corpus_sentences], out=row_ptr[1:])
+    n_rows = int(row_ptr[-1])
+    doc_of_row = np.repeat(np.arange(n_docs), np.diff(row_ptr))
+
+    ids = np.asarray(flat_ids, dtype=np.int64)
+    token_rows = np.repeat(np.arange(n_rows), row_lengths)
+    kept = keep[ids] if ids.size else np.zeros(0, dtype=bool)
+    ids, token_rows = ids[kept], token_rows[kept]
+
+    # term frequencies: one entry per distinct (row, term)
+    width = max(len(vocab), 1)
+    keys, tf = np.unique(token_rows * width + ids, return_counts=True)
+    rows, terms = keys // width, keys % width
+
+    # document-local columns: distinct (document, term) pairs, in order
+    entry_docs = doc_of_row[rows]
+    doc_terms, local, doc_df = np.unique(entry_docs * width + terms, return_inverse=True, return_counts=True)
+    doc_term_ptr = np.searchsorted(doc_terms // width, np.arange(n_docs + 1))
+    cols = local - doc_term_ptr[entry_docs]
+
+    if idf is not None:
+        weights = np.fromiter(
+            (idf_weight(idf, t) if k else 0.0 for t, k in zip(vocab, keep)), dtype=np.float64, count=len(vocab)
+        )
+        weight = weights[terms]
+    elif use_corpus_idf:
+        df = np.bincount(terms, minlength=width).astype(np.float64)
+        weight = np.log((1.0 + n_rows) / (1.0 + df[terms])) + 1.0
+    else:
+        n_sentences = np.diff(row_ptr)[entry_docs].astype(np.float64)
+        weight = np.log((1.0 + n_sentences) / (1.0 + doc_df[local])) + 1.0
+
+    data = tf * weight
+    norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n_rows))
+    data = data / np.where(norms > 0.0, norms, 1.0)[rows]
+
+    entry_ptr = np.searchsorted(rows, row_ptr)
+    return _StackedCorpus(rows, cols, data, row_ptr, entry_ptr, np.diff(doc_term_ptr))
+
+
+def _block_similarity(corpus: _StackedCorpus, docs: List[int], n_max: int, w_max: int) -> np.ndarray:
+
+    # Gram products of all the documents' dense blocks in one batched matmul
+    starts = corpus.entry_ptr[docs]
+    lengths = corpus.entry_ptr[np.asarray(docs) + 1] - starts
+    offsets = np.cumsum(lengths) - lengths
+    entries = np.repeat(starts - offsets, lengths) + np.arange(int(lengths.sum()))
+    block = np.repeat(np.arange(len(docs)), lengths)
+    rows = corpus.rows[entries] - corpus.row_ptr[docs][block]
+
+    dense = np.zeros((len(docs), n_max, w_max), dtype=np.float64)
+    dense[block, rows, corpus.cols[entries]] = corpus.data[entries]
+    sim = dense @ dense.transpose(0, 2, 1)
+    diagonal = np.arange(n_max)
+    sim[:, diagonal, diagonal] = 0.0
+    return sim
+
+
+def _doc_similarity(corpus: _StackedCorpus, d: int) -> np.ndarray:
+    # a document too large for a dense block goes through the blocked sparse Gram
+    lo, hi = int(corpus.entry_ptr[d]), int(corpus.entry_ptr[d + 1])
+    rows = corpus.rows[lo:hi] - corpus.row_ptr[d]
+    indptr = np.searchsorted(rows, np.arange(corpus.doc_rows(d) + 1))
+    matrix = TfidfMatrix(indptr=indptr, indices=corpus.cols[lo:hi], data=corpus.data[lo:hi], vocab={})
+    return cosine_similarity_sparse(matrix)[None]
+
+
+def _iterate_blocks(sim: np.ndarray, sizes: np.ndarray, config: TextRankConfig) -> Tuple[np.ndarray, int]:
+
+    # _power_iteration_matrix for a stack of padded graphs: padding nodes have
+    # no edges and no teleport mass, and each graph stops updating at the
+    # iteration where it alone would have converged.
+    if config.edge_threshold is not None:
+        sim = np.where(sim > config.edge_threshold, sim, 0.0)
+    outgoing_sums = sim.sum(axis=2)
+    safe = np.where(outgoing_sums > 0.0, outgoing_sums, 1.0)
+    m = (np.where(sim > 0.0, sim, 0.0) / safe[:, :, None]).transpose(0, 2, 1)
+
+    valid = np.arange(sim.shape[1])[None, :] < sizes[:, None]
+    base = np.where(valid, (1.0 - config.damping) / sizes[:, None], 0.0)
+    scores = np.where(valid, 1.0 / sizes[:, None], 0.0)
+    active = np.ones(len(sizes), dtype=bool)
+    iterations = 0
+    for _ in range(config.max_iter):
+        new_scores = base + config.damping * (m @ scores[:, :, None])[:, :, 0]
+        iterations += int(active.sum())
+        max_change = np.max(np.abs(new_scores - scores), axis=1)
+        scores[active] = new_scores[active]
+        active &= max_change >= config.eps
+        if not active.any():
+            break
+    return scores, iterations
+
+
+def _summarize_stacked(
+    corpus_sentences: List[List[str]],
+    k: int,
+    config: TextRankConfig,
+    stopwords: AbstractSet[str],
+    idf: Mapping[str, float] | None,
+    use_corpus_idf: bool,
+) -> List[Tuple[List[str], List[float]]]:
+
+    out: List[Optional[Tuple[List[str], List[float]]]] = [None] * len(corpus_sentences)
+    for d, sentences in enumerate(corpus_sentences):
+        n = len(sentences)
+        if k <= 0 or n == 0:
+            out[d] = ([], [])
+        elif k >= n:
+            out[d] = (sentences[:], [1.0 / n for _ in range(n)])
+    ranked = [d for d, result in enumerate(out) if result is None]
+    if not ranked:
+        return out
+
+    with stage("tfidf"):
+        corpus = _stack_corpus(corpus_sentences, stopwords, idf, use_corpus_idf)
+    count("textrank.sentences", sum(corpus.doc_rows(d) for d in ranked))
+
+    # similar sizes share a chunk, so little of each dense block is padding
+    ranked.sort(key=lambda d: (corpus.doc_rows(d), int(corpus.widths[d])))
+    lo = 0
+    while lo < len(ranked):
+        n_max = w_max = 0
+        hi = lo
+        while hi < len(ranked):
+            d = ranked[hi]
+            n_next = max(n_max, corpus.doc_rows(d))
+            w_next = max(w_max, int(corpus.widths[d]))
+            if hi > lo and (hi - lo + 1) * n_next * max(n_next, w_next) > _BLOCK_CELLS:
+                break
+            n_max, w_max = n_next, w_next
+            hi += 1
+        docs = ranked[lo:hi]
+        with stage("similarity"):
+            if len(docs) == 1 and n_max * max(n_max, w_max) > _BLOCK_CELLS:
+                sim = _doc_similarity(corpus, docs[0])
+            else:
+                sim = _block_similarity(corpus, docs, n_max, w_max)
+        sizes = np.asarray([corpus.doc_rows(d) for d in docs], dtype=np.float64)
+        with stage("iteration"):
+            scores, iterations = _iterate_blocks(sim, sizes, config)
+        count("textrank.iterations", iterations)
+        for g, d in enumerate(docs):
+            sentences = corpus_sentences[d]
+            doc_scores = scores[g, : len(sentences)].tolist()
+            selected = _select_top_k(sentences, doc_scores, k)
+            out[d] = ([sentences[i] for i in selected], doc_scores)
+        lo = hi
+    return out
+
+
+def summarize_batch(
+    texts: Iterable[str],
+    k: int,
+    config: TextRankConfig = BATCH_CONFIG,
+    extra_stopwords: List[str] | None = None,
+    use_corpus_idf: bool = False,
+    idf: Mapping[str, float] | None = None,
+    stopwords: AbstractSet[str] | None = None,
+) -> List[Tuple[List[str], List[float]]]:
+
+    # With BATCH_CONFIG the whole corpus is ranked as one stacked problem:
+    # a single CSR matrix over every sentence, per-document Gram blocks
+    # computed in batched products and one power iteration over the stack.
+    # Other configurations rank each document on its own.
+    if stopwords is None:
+        stopwords = stopwords_for(extra_stopwords)
+    if config.graph == "dense" and config.similarity_backend == "sparse" and config.solver == "matrix":
+        corpus_sentences = [split_sentences(text) for text in texts]
+        return _summarize_stacked(corpus_sentences, k, config, stopwords, idf, use_corpus_idf)
+
+    corpus_sentences, corpus_tokens = tokenize_corpus(texts, stopwords=stopwords)
+    if idf is None and use_corpus_idf:
+        idf = corpus_idf(corpus_tokens)
+
+    return [
+        summarize_tokens(sentences, docs_tokens, k, config=config, idf=idf)
+        for sentences, docs_tokens in zip(corpus_sentences, corpus_tokens)
+    ]
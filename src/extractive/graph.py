@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.instrumentation import count, stage
+
+
+# adjacency[j] maps neighbour i -> edge weight w_ji
+Adjacency = List[Dict[int, float]]
+
+
+def _inverted_index(vectors: List[Dict[str, float]]) -> Dict[str, List[Tuple[int, float]]]:
+    postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+    for i, vec in enumerate(vectors):
+        for term, w in vec.items():
+            postings[term].append((i, w))
+    return postings
+
+
+def build_sparse_graph(
+    vectors: List[Dict[str, float]],
+    threshold: Optional[float] = None,
+    top_k: Optional[int] = None,
+) -> Adjacency:
+
+    with stage("similarity"):
+        n = len(vectors)
+        norms = [math.sqrt(sum(w * w for w in vec.values())) for vec in vectors]
+        postings = _inverted_index(vectors)
+
+        adjacency: Adjacency = []
+        for i in range(n):
+            if norms[i] == 0.0:
+                adjacency.append({})
+                continue
+
+            # only sentences sharing at least one term with i are ever touched
+            dots: Dict[int, float] = defaultdict(float)
+            for term, w in vectors[i].items():
+                for j, wj in postings[term]:
+                    if j != i:
+                        dots[j] += w * wj
+
+            row: Dict[int, float] = {}
+            for j, dot in dots.items():
+                if norms[j] == 0.0:
+                    continue
+                sim = dot / (norms[i] * norms[j])
+                if sim <= 0.0:
+                    continue
+                if threshold is not None and sim <= threshold:
+                    continue
+                row[j] = sim
+
+            if top_k is not None and len(row) > top_k:
+                best = heapq.nsmallest(top_k, row.items(), key=lambda item: (-item[1], item[0]))
+                row = dict(sorted(best))
+            adjacency.append(row)
+        return adjacency
+
+
+def edge_count(adjacency: Adjacency) -> int:
+    return sum(len(row) for row in adjacency)
+
+
+def iterate_graph(
+    adjacency: Adjacency,
+    damping: float,
+    max_iter: int,
+    eps: float,
+    initial: Optional[List[float]] = None,
+) -> Tuple[List[float], int]:
+
+    with stage("iteration"):
+        scores, iterations = _iterate_graph(adjacency, damping, max_iter, eps, initial)
+    count("textrank.iterations", iterations)
+    return scores, iterations
+
+
+def _iterate_graph(
+    adjacency: Adjacency,
+    damping: float,
+    max_iter: int,
+    eps: float,
+    initial: Optional[List[float]],
+) -> Tuple[List[float], int]:
+
+    n = len(adjacency)
+    scores = list(initial) if initial is not None else [1.0 / n for _ in range(n)]
+    outgoing_sums = [sum(row.values()) for row in adjacency]
+
+    iterations = 0
+    for _ in range(max_iter):
+        iterations += 1
+        acc = [0.0] * n
+        for j, row in enumerate(adjacency):
+            denom = outgoing_sums[j]
+            if denom <= 0.0:
+                continue
+            s_j = scores[j]
+            for i, w_ji in row.items():
+                acc[i] += (w_ji / denom) * s_j
+
+        new_scores = [(1.0 - damping) / n + damping * a for a in acc]
+        max_change = max(abs(a - b) for a, b in zip(new_scores, scores))
+        scores = new_scores
+        if max_change < eps:
+            break
+    return scores, iterations
+
+
+def iterate_graph_matrix(
+    adjacency: Adjacency,
+    damping: float,
+    max_iter: int,
+    eps: float,
+    initial: Optional[List[float]] = None,
+) -> Tuple[List[float], int]:
+
+    with stage("iteration"):
+        scores, iterations = _iterate_graph_matrix(adjacency, damping, max_iter, eps, initial)
+    count("textrank.iterations", iterations)
+    return scores, iterations
+
+
+def _iterate_graph_matrix(
+    adjacency: Adjacency,
+    damping: float,
+    max_iter: int,
+    eps: float,
+    initial: Optional[List[float]],
+) -> Tuple[List[float], int]:
+
+    n = len(adjacency)
+    src = np.fromiter((j for j, row in enumerate(adjacency) for _ in row), dtype=np.int64)
+    dst = np.fromiter((i for row in adjacency for i in row), dtype=np.int64)
+    w = np.fromiter((x for row in adjacency for x in row.values()), dtype=np.float64)
+
+    outgoing_sums = np.bincount(src, weights=w, minlength=n)
+    w_norm = w / outgoing_sums[src] if w.size else w
+    base = (1.0 - damping) / n
+
+    scores = np.asarray(initial, dtype=np.float64) if initial is not None else np.full(n, 1.0 / n)
+    iterations = 0
+    for _ in range(max_iter):
+        iterations += 1
+        acc = np.bincount(dst, weights=w_norm * scores[src], minlength=n)
+        new_scores = base + damping * acc
+        max_change = float(np.max(np.abs(new_scores - scores)))
+        scores = new_scores
+        if max_change < eps:
+            break
+    return scores.tolist(), iterations
+
+
+def power_iteration_graph(
+    adjacency: Adjacency,
+    damping: float,
+    max_iter: int,
+    eps: float,
+) -> List[float]:
+    return iterate_graph(adjacency, damping=damping, max_iter=max_iter, eps=eps)[0]
+
+
+def power_iteration_graph_matrix(
+    adjacency: Adjacency,
+    damping: float,
+    max_iter: int,
+    eps: float,
+) -> List[float]:
+    return iterate_graph_matrix(adjacency, damping=damping, max_iter=max_iter, eps=eps)[0]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+
+from src.extractive.textrank import TextRankConfig, textrank_summarize_stream
+from src.utils.text_splitter import split_sentences
+
+
+SECTIONING_MODES = ("window", "paragraph")
+
+_PARAGRAPH_RE = re.compile(r"\n[ \t\r\f\v]*\n")
+
+
+@dataclass(frozen=True)
+class HierarchicalConfig:
+
+    section_size: int = 200
+    section_k: int = 3
+    sectioning: str = "window"
+    workers: int = 1
+    textrank: TextRankConfig = TextRankConfig()
+
+
+@dataclass
+class HierarchicalSummary:
+    summary: List[str]
+    winners: List[str]
+    sections: int
+
+
+def _validate(config: HierarchicalConfig) -> None:
+    if config.section_size <= 0:
+        raise ValueError("section_size must be positive")
+    if config.section_k <= 0:
+        raise ValueError("section_k must be positive")
+    if config.sectioning not in SECTIONING_MODES:
+        raise ValueError(f"Unknown sectioning mode: {config.sectioning!r} (expected one of {SECTIONING_MODES})")
+
+
+def window_sections(sentences: Iterable[str], section_size: int) -> Iterator[List[str]]:
+
+    section: List[str] = []
+    for s in sentences:
+        section.append(s)
+        if len(section) == section_size:
+            yield section
+            section = []
+    if section:
+        yield section
+
+
+def paragraph_sections(text: str, section_size: int) -> Iterator[List[str]]:
+
+    # whole paragraphs are packed into sections of at most section_size
+    # sentences; a single longer paragraph is cut into windows
+    section: List[str] = []
+    for paragraph in _PARAGRAPH_RE.split(text or ""):
+        sentences = split_sentences(paragraph)
+        if not sentences:
+            continue
+        if len(section) + len(sentences) > section_size and section:
+            yield section
+            section = []
+        if len(sentences) > section_size:
+            yield from window_sections(sentences, section_size)
+            continue
+        section.extend(sentences)
+    if section:
+        yield section
+
+
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(
+    section_k: int,
+    config: TextRankConfig,
+    extra_stopwords: Optional[List[str]],
+    idf: Optional[Mapping[str, float]],
+) -> None:
+    _WORKER.update(section_k=section_k, config=config, extra_stopwords=extra_stopwords, idf=idf)
+
+
+def _rank_section_in_worker(section: List[str]) -> List[str]:
+    return _rank_section(section, **_WORKER)
+
+
+def _rank_section(
+    section: List[str],
+    section_k: int,
+    config: TextRankConfig,
+    extra_stopwords: Optional[List[str]],
+    idf: Optional[Mapping[str, float]],
+) -> List[str]:
+    return textrank_summarize_stream(section, k=section_k, config=config, extra_stopwords=extra_stopwords, idf=idf)[0]
+
+
+def hierarchical_summarize(
+    sections: Iterable[List[str]],
+    k: int,
+    config: HierarchicalConfig = HierarchicalConfig(),
+    extra_stopwords: Optional[List[str]] = None,
+    idf: Optional[Mapping[str, float]] = None,
+) -> HierarchicalSummary:
+
+    # Each section costs O(section_size^2), so the whole pass is linear in the
+    # number of sections; the final pass only sees the section winners.
+    _validate(config)
+    args = (config.section_k, config.textrank, extra_stopwords, idf)
+
+    winners: List[str] = []
+    n_sections = 0
+    if config.workers > 1:
+        with ProcessPoolExecutor(max_workers=config.workers, initializer=_init_worker, initargs=args) as pool:
+            for section_winners in pool.map(_rank_section_in_worker, sections):
+                winners.extend(section_winners)
+                n_sections += 1
+    else:
+        for section in sections:
+            winners.extend(_rank_section(section, *args))
+            n_sections += 1
+
+    summary, _ = textrank_summarize_stream(
+        winners, k=k, config=config.textrank, extra_stopwords=extra_stopwords, idf=idf
+    )
+    return HierarchicalSummary(summary=summary, winners=winners, sections=n_sections)
+
+
+def hierarchical_textrank(
+    text: str,
+    k: int,
+    config: HierarchicalConfig = HierarchicalConfig(),
+    extra_stopwords: Optional[List[str]] = None,
+    idf: Optional[Mapping[str, float]] = None,
+) -> HierarchicalSummary:
+
+    _validate(config)
+    if config.sectioning == "paragraph":
+        sections = paragraph_sections(text, config.section_size)
+    else:
+        sections = window_sections(split_sentences(text), config.section_size)
+    return hierarchical_summarize(sections, k, config=config, extra_stopwords=extra_stopwords, idf=idf)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, List, Mapping, Optional, Union
+
+import numpy as np
+
+from src.extractive.similarity_kernel import smoothed_idf
+from src.utils.preprocessing import stopwords_for, tokenize_filtered
+from src.utils.text_splitter import split_sentences
+
+
+# Layout (little endian):
+#   header   magic "IDFM", version u32, n_docs u64, n_terms u64, blob_len u64
+#   offsets  u64[n_terms + 1] into the term blob
+#   weights  f32[n_terms]
+#   blob     UTF-8 terms, sorted by their encoded bytes
+_MAGIC = b"IDFM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQQQ")
+
+
+class _TermTable:
+    # Sequence view over the sorted term blob, so bisect can search it in place.
+
+    def __init__(self, buffer, offsets: np.ndarray, blob_start: int) -> None:
+        self._buffer = buffer
+        self._offsets = offsets
+        self._blob_start = blob_start
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        start = self._blob_start + int(self._offsets[i])
+        end = self._blob_start + int(self._offsets[i + 1])
+        return bytes(self._buffer[start:end])
+
+
+def _encode(df: Mapping[str, int], n_docs: int) -> bytes:
+    terms = sorted(t.encode("utf-8") for t in df)
+    offsets = np.zeros(len(terms) + 1, dtype="<u8")
+    offsets[1:] = np.cumsum([len(t) for t in terms], dtype=np.uint64) if terms else []
+    weights = np.fromiter(
+        (smoothed_idf(n_docs, df[t.decode("utf-8")]) for t in terms), dtype="<f4", count=len(terms)
+    )
+    blob = b"".join(terms)
+    header = _HEADER.pack(_MAGIC, _VERSION, n_docs, len(terms), len(blob))
+    return header + offsets.tobytes() + weights.tobytes() + blob
+
+
+class IdfModel(Mapping[str, float]):
+    # Corpus IDF table that TF-IDF code can use wherever it takes an idf dict.
+    # It behaves as a read-only Mapping of the fitted terms; the TF-IDF builders
+    # give terms outside it unseen_weight (the df=0 smoothed IDF) instead of
+    # dropping them, see idf_weight.
+
+    def __init__(self, buffer, path: Optional[Path] = None, cache_size: int = 1 << 16) -> None:
+        magic, version, n_docs, n_terms, blob_len = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not an IDF model file")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported IDF model version: {version}")
+
+        self.n_docs = n_docs
+        self.path = path
+        self._buffer = buffer
+        offsets_at = _HEADER.size
+        weights_at = offsets_at + 8 * (n_terms + 1)
+        blob_at = weights_at + 4 * n_terms
+        self._offsets = np.frombuffer(buffer, dtype="<u8", count=n_terms + 1, offset=offsets_at)
+        self._weights = np.frombuffer(buffer, dtype="<f4", count=n_terms, offset=weights_at)
+        self._terms = _TermTable(buffer, self._offsets, blob_at)
+        self.unseen_weight = smoothed_idf(n_docs, 0)
+        self._lookup = lru_cache(maxsize=cache_size)(self._search)
+
+    @classmethod
+    def fit(cls, docs_tokens: Iterable[Iterable[str]], min_df: int = 1) -> "IdfModel":
+
+        # one pass, only document frequencies are kept in memory
+        df: Counter = Counter()
+        n_docs = 0
+        for tokens in docs_tokens:
+            df.update(set(tokens))
+            n_docs += 1
+        if min_df > 1:
+            df = Counter({t: c for t, c in df.items() if c >= min_df})
+        return cls(_encode(df, n_docs))
+
+    @classmethod
+    def fit_texts(
+        cls,
+        texts: Iterable[str],
+        extra_stopwords: Optional[List[str]] = None,
+        min_df: int = 1,
+    ) -> "IdfModel":
+
+        # every sentence counts as one IDF document, as in corpus_idf
+        stopwords = stopwords_for(extra_stopwords)
+        docs = (tokenize_filtered(s, stopwords) for text in texts for s in split_sentences(text))
+        return cls.fit(docs, min_df=min_df)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "IdfModel":
+        path = Path(path)
+        with path.open("rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, path=path)
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, "wb") as f:
+            f.write(self._buffer)
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._offsets = self._weights = None
+            self._terms = None
+            self._lookup.cache_clear()
+            self._buffer.close()
+
+    def __reduce__(self):
+        # worker processes re-map the file instead of receiving a copy
+        if self.path is not None:
+            return IdfModel.load, (str(self.path),)
+        return IdfModel, (bytes(self._buffer),)
+
+    def _search(self, term: str) -> Optional[float]:
+        key = term.encode("utf-8")
+        i = bisect_left(self._terms, key)
+        if i < len(self._terms) and self._terms[i] == key:
+            return float(self._weights[i])
+        return None
+
+    def known(self, term: str) -> bool:
+        return term in self
+
+    def __getitem__(self, term: str) -> float:
+        weight = self._lookup(term) if isinstance(term, str) else None
+        if weight is None:
+            raise KeyError(term)
+        return weight
+
+    def get(self, term: str, default: Optional[float] = None) -> Optional[float]:
+        weight = self._lookup(term) if isinstance(term, str) else None
+        return default if weight is None else weight
+
+    def __contains__(self, term: object) -> bool:
+        return isinstance(term, str) and self._lookup(term) is not None
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._terms[i].decode("utf-8") for i in range(len(self._terms)))
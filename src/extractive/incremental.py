@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.extractive.graph import Adjacency, iterate_graph, iterate_graph_matrix
+from src.extractive.similarity import smoothed_idf
+from src.extractive.similarity_kernel import idf_weight, vector_norm
+from src.extractive.textrank import TextRankConfig, _select_top_k
+from src.utils.preprocessing import stopwords_for, tokenize_filtered
+
+
+class IncrementalTextRank:
+    # With a fixed idf table, vectors never change and every update is exact:
+    # only new x existing similarities are computed. With document IDF every
+    # term's weight moves with the sentence count, so by default each update
+    # re-weights the whole graph and stays exact (only the warm-started
+    # ranking is incremental). rebuild_growth opts into an approximation:
+    # existing pairs keep the IDF they were computed with until the document
+    # has grown by that fraction since the last full rebuild (or refresh()
+    # is called).
+
+    def __init__(
+        self,
+        config: TextRankConfig = TextRankConfig(),
+        extra_stopwords: Optional[List[str]] = None,
+        idf: Optional[Mapping[str, float]] = None,
+        rebuild_growth: Optional[float] = None,
+    ) -> None:
+        if config.top_k_neighbors is not None:
+            raise ValueError("IncrementalTextRank does not support top_k_neighbors")
+        if config.solver not in ("loop", "matrix"):
+            raise ValueError(f"Unknown TextRank solver: {config.solver!r}")
+
+        self.config = config
+        self.stopwords = stopwords_for(extra_stopwords)
+        self.fixed_idf = idf
+        self.rebuild_growth = rebuild_growth
+
+        self.sentences: List[str] = []
+        self._tf: List[Counter] = []
+        self._df: Counter = Counter()
+        self._vectors: List[Dict[str, float]] = []
+        self._norms: List[float] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._adjacency: Adjacency = []
+        self._scores: List[float] = []
+        self._built_size = 0
+
+        self.last_iterations = 0
+        self.last_pairs_compared = 0
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    @property
+    def scores(self) -> List[float]:
+        return list(self._scores)
+
+    def _weight(self, term: str) -> Optional[float]:
+        if self.fixed_idf is not None:
+            return idf_weight(self.fixed_idf, term)
+        return smoothed_idf(len(self.sentences), self._df[term])
+
+    def _vectorize(self, i: int) -> None:
+        vec: Dict[str, float] = {}
+        for term, freq in self._tf[i].items():
+            w = self._weight(term)
+            if w is not None:
+                vec[term] = float(freq) * w
+        self._vectors[i] = vec
+        self._norms[i] = vector_norm(vec)
+
+    def _link(self, i: int) -> None:
+        # compare i only with earlier sentences that share a term with it
+        vec_i = self._vectors[i]
+        norm_i = self._norms[i]
+        if norm_i > 0.0:
+            dots: Dict[int, float] = defaultdict(float)
+            for term, w in vec_i.items():
+                for j in self._postings.get(term, ()):
+                    dots[j] += w * self._vectors[j][term]
+
+            threshold = self.config.edge_threshold
+            for j, dot in dots.items():
+                self.last_pairs_compared += 1
+                norm_j = self._norms[j]
+                if norm_j == 0.0:
+                    continue
+                sim = dot / (norm_i * norm_j)
+                if sim <= 0.0 or (threshold is not None and sim <= threshold):
+                    continue
+                self._adjacency[i][j] = sim
+                self._adjacency[j][i] = sim
+
+        for term in vec_i:
+            self._postings[term].append(i)
+
+    def _rebuild(self) -> None:
+        n = len(self.sentences)
+        self._postings = defaultdict(list)
+        self._adjacency = [{} for _ in range(n)]
+        for i in range(n):
+            self._vectorize(i)
+        for i in range(n):
+            self._link(i)
+        self._built_size = n
+
+    def extend(self, sentences: Iterable[str]) -> "IncrementalTextRank":
+        start = len(self.sentences)
+        for s in sentences:
+            tf = Counter(tokenize_filtered(s, self.stopwords))
+            self.sentences.append(s)
+            self._tf.append(tf)
+            self._df.update(tf.keys())
+            self._vectors.append({})
+            self._norms.append(0.0)
+            self._adjacency.append({})
+        n = len(self.sentences)
+        if n == start:
+            return self
+
+        self.last_pairs_compared = 0
+        if self.fixed_idf is None and (
+            self.rebuild_growth is None
+            or self._built_size == 0
+            or n - self._built_size > self.rebuild_growth * self._built_size
+        ):
+            self._rebuild()
+        else:
+            if self.fixed_idf is None:
+                # refresh norms under the new IDF so new rows are exact
+                for i in range(start):
+                    self._vectorize(i)
+            for i in range(start, n):
+                self._vectorize(i)
+            for i in range(start, n):
+                self._link(i)
+
+        self._rank(start)
+        return self
+
+    def append(self, sentence: str) -> "IncrementalTextRank":
+        return self.extend([sentence])
+
+    def refresh(self) -> "IncrementalTextRank":
+        if self.sentences:
+            self._rebuild()
+            self._rank(len(self.sentences))
+        return self
+
+    def _rank(self, previous_n: int) -> None:
+        n = len(self.sentences)
+        # warm start: previous scores rescaled to the new size, uniform for new nodes
+        scale = previous_n / n
+        initial = [s * scale for s in self._scores[:previous_n]] + [1.0 / n] * (n - previous_n)
+
+        iterate = iterate_graph_matrix if self.config.solver == "matrix" else iterate_graph
+        self._scores, self.last_iterations = iterate(
+            self._adjacency,
+            damping=self.config.damping,
+            max_iter=self.config.max_iter,
+            eps=self.config.eps,
+            initial=initial,
+        )
+
+    def summary(self, k: int) -> Tuple[List[str], List[float]]:
+
+        n = len(self.sentences)
+        if k <= 0 or n == 0:
+            return [], []
+        if k >= n:
+            return self.sentences[:], [1.0 / n for _ in range(n)]
+        selected = _select_top_k(self.sentences, self._scores, k)
+        return [self.sentences[i] for i in selected], list(self._scores)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from src.extractive.batch import BATCH_CONFIG, summarize_batch
+from src.extractive.textrank import TextRankConfig
+from src.utils.preprocessing import stopwords_for
+
+
+# Per-process state installed once by the pool initializer, so tasks only
+# carry their chunk of texts.
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(
+    k: int,
+    config: TextRankConfig,
+    extra_stopwords: Optional[List[str]],
+    idf: Optional[Mapping[str, float]],
+) -> None:
+    _WORKER["k"] = k
+    _WORKER["config"] = config
+    _WORKER["stopwords"] = stopwords_for(extra_stopwords)
+    _WORKER["idf"] = idf
+
+
+def _summarize_chunk(texts: List[str]) -> List[Tuple[List[str], List[float]]]:
+    return summarize_batch(
+        texts,
+        k=_WORKER["k"],
+        config=_WORKER["config"],
+        idf=_WORKER["idf"],
+        stopwords=_WORKER["stopwords"],
+    )
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def chunked(items: Sequence, chunk_size: int) -> List[Sequence]:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def summarize_parallel(
+    texts: Sequence[str],
+    k: int,
+    workers: Optional[int] = None,
+    chunk_size: int = 32,
+    config: TextRankConfig = BATCH_CONFIG,
+    extra_stopwords: Optional[List[str]] = None,
+    idf: Optional[Mapping[str, float]] = None,
+) -> List[Tuple[List[str], List[float]]]:
+
+    texts = list(texts)
+    workers = workers or default_workers()
+    if workers <= 1 or len(texts) <= chunk_size:
+        return summarize_batch(texts, k=k, config=config, extra_stopwords=extra_stopwords, idf=idf)
+
+    out: List[Tuple[List[str], List[float]]] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(k, config, extra_stopwords, idf),
+    ) as pool:
+        # map() yields in submission order, so results line up with texts
+        for chunk_result in pool.map(_summarize_chunk, chunked(texts, chunk_size)):
+            out.extend(chunk_result)
+    return out
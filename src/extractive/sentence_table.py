@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.extractive.similarity_kernel import CondensedSimilarity, idf_weight, smoothed_idf
+from src.extractive.sparse_similarity import TfidfMatrix
+from src.utils.instrumentation import stage
+from src.utils.preprocessing import stopwords_for, tokenize_filtered
+from src.utils.text_splitter import iter_sentence_spans
+
+
+class Vocabulary:
+    __slots__ = ("ids", "terms")
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __getitem__(self, term_id: int) -> str:
+        return self.terms[term_id]
+
+    def get(self, term: str) -> Optional[int]:
+        return self.ids.get(term)
+
+    def intern(self, term: str) -> int:
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.ids[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+
+class TermVector:
+    # Sorted term ids and their TF-IDF weights in parallel buffers. items() and
+    # values() mirror the dict vectors, so graph code accepts either.
+    __slots__ = ("ids", "weights", "norm")
+
+    def __init__(self, ids: array, weights: array, norm: Optional[float] = None) -> None:
+        self.ids = ids
+        self.weights = weights
+        self.norm = math.sqrt(sum(w * w for w in weights)) if norm is None else norm
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def items(self) -> Iterator[Tuple[int, float]]:
+        return zip(self.ids, self.weights)
+
+    def values(self) -> array:
+        return self.weights
+
+    def dot(self, other: "TermVector") -> float:
+        a_ids, a_w, b_ids, b_w = self.ids, self.weights, other.ids, other.weights
+        i = j = 0
+        dot = 0.0
+        while i < len(a_ids) and j < len(b_ids):
+            a, b = a_ids[i], b_ids[j]
+            if a == b:
+                dot += a_w[i] * b_w[j]
+                i += 1
+                j += 1
+            elif a < b:
+                i += 1
+            else:
+                j += 1
+        return dot
+
+    def cosine(self, other: "TermVector") -> float:
+        if self.norm == 0.0 or other.norm == 0.0:
+            return 0.0
+        return self.dot(other) / (self.norm * other.norm)
+
+    def to_dict(self, vocab: Vocabulary) -> Dict[str, float]:
+        return {vocab[t]: w for t, w in zip(self.ids, self.weights)}
+
+
+class SentenceTable:
+    # Column store for a document: sentences are (start, end) offsets into one
+    # source string, TF-IDF rows are CSR slices of flat term-id/weight arrays.
+    __slots__ = ("text", "starts", "ends", "vocab", "indptr", "term_ids", "weights", "norms")
+
+    def __init__(self, text: Optional[str] = None) -> None:
+        self.text = text
+        self.starts = array("q")
+        self.ends = array("q")
+        self.vocab = Vocabulary()
+        self.indptr = array("q", [0])
+        self.term_ids = array("i")
+        self.weights = array("d")
+        self.norms = array("d")
+
+    @classmethod
+    def from_text(
+        cls,
+        text: str,
+        extra_stopwords: Optional[List[str]] = None,
+        idf: Optional[Mapping[str, float]] = None,
+    ) -> "SentenceTable":
+
+        table = cls(text)
+        stopwords = stopwords_for(extra_stopwords)
+        for start, end in iter_sentence_spans(text):
+            table.starts.append(start)
+            table.ends.append(end)
+        docs = (tokenize_filtered(text[s:e], stopwords) for s, e in zip(table.starts, table.ends))
+        table._fill(docs, idf)
+        return table
+
+    @classmethod
+    def from_sentences(
+        cls,
+        sentences: Sequence[str],
+        extra_stopwords: Optional[List[str]] = None,
+        idf: Optional[Mapping[str, float]] = None,
+    ) -> "SentenceTable":
+
+        stopwords = stopwords_for(extra_stopwords)
+        return cls.from_tokens(
+            [tokenize_filtered(s, stopwords) for s in sentences],
+            idf=idf,
+            text="\n".join(sentences),
+            lengths=[len(s) for s in sentences],
+        )
+
+    @classmethod
+    def from_tokens(
+        cls,
+        docs_tokens: Sequence[List[str]],
+        idf: Optional[Mapping[str, float]] = None,
+        text: Optional[str] = None,
+        lengths: Optional[Sequence[int]] = None,
+    ) -> "SentenceTable":
+
+        table = cls(text)
+        if lengths is not None:
+            pos = 0
+            for length in lengths:
+                table.starts.append(pos)
+                table.ends.append(pos + length)
+                pos += length + 1
+        table._fill(docs_tokens, idf)
+        return table
+
+    def _fill(self, docs_tokens: Iterable[List[str]], idf: Optional[Mapping[str, float]]) -> None:
+        vocab = self.vocab
+        tf = array("d")
+        df = array("q")
+        for tokens in docs_tokens:
+            if idf is not None:
+                # terms missing from an external table are dropped, as in the dict path
+                tokens = [t for t in tokens if idf_weight(idf, t) is not None]
+            counts = Counter(vocab.intern(t) for t in tokens)
+            if len(df) < len(vocab):
+                df.extend([0] * (len(vocab) - len(df)))
+            for term_id in sorted(counts):
+                self.term_ids.append(term_id)
+                tf.append(float(counts[term_id]))
+                df[term_id] += 1
+            self.indptr.append(len(self.term_ids))
+
+        n_docs = len(self.indptr) - 1
+        if idf is None:
+            weights = array("d", (smoothed_idf(n_docs, d) for d in df))
+        else:
+            weights = array("d", (idf_weight(idf, t) for t in vocab.terms))
+        self.weights = array("d", (f * weights[t] for f, t in zip(tf, self.term_ids)))
+        self.norms = array("d", (self._norm(i) for i in range(n_docs)))
+
+    def _norm(self, i: int) -> float:
+        return math.sqrt(sum(w * w for w in self.weights[self.indptr[i] : self.indptr[i + 1]]))
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def sentence(self, i: int) -> str:
+        if self.text is None:
+            raise ValueError("SentenceTable was built from tokens and has no source text")
+        return self.text[self.starts[i] : self.ends[i]]
+
+    def length(self, i: int) -> int:
+        return self.ends[i] - self.starts[i] if self.starts else 0
+
+    def sentences(self) -> Iterator[str]:
+        return (self.sentence(i) for i in range(len(self)))
+
+    def vector(self, i: int) -> TermVector:
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return TermVector(self.term_ids[lo:hi], self.weights[lo:hi], self.norms[i])
+
+    def vectors(self) -> List[TermVector]:
+        return [self.vector(i) for i in range(len(self))]
+
+    def similarity(self, i: int, j: int) -> float:
+        if i == j:
+            return 0.0
+        return self.vector(i).cosine(self.vector(j))
+
+    def condensed_similarity(self) -> CondensedSimilarity:
+
+        with stage("similarity"):
+            n = len(self)
+            indptr, term_ids, weights, norms = self.indptr, self.term_ids, self.weights, self.norms
+            data = array("d")
+            for i in range(n):
+                ni = norms[i]
+                if ni == 0.0:
+                    data.frombytes(bytes(8 * (n - i - 1)))
+                    continue
+                # one short-lived lookup table for row i, compared against every later row
+                row = dict(zip(term_ids[indptr[i] : indptr[i + 1]], weights[indptr[i] : indptr[i + 1]]))
+                for j in range(i + 1, n):
+                    nj = norms[j]
+                    if nj == 0.0:
+                        data.append(0.0)
+                        continue
+                    dot = 0.0
+                    for k in range(indptr[j], indptr[j + 1]):
+                        w = row.get(term_ids[k])
+                        if w is not None:
+                            dot += w * weights[k]
+                    data.append(dot / (ni * nj))
+            return CondensedSimilarity(n, data)
+
+    def tfidf_matrix(self) -> TfidfMatrix:
+        return TfidfMatrix(
+            indptr=np.frombuffer(self.indptr, dtype=np.dtype(self.indptr.typecode)).astype(np.int64),
+            indices=np.frombuffer(self.term_ids, dtype=np.dtype(self.term_ids.typecode)).astype(np.int64),
+            data=np.frombuffer(self.weights, dtype=np.float64).copy(),
+            vocab=self.vocab.ids,
+        )
@@ -1,8 +1,13 @@
-import math
 from collections import Counter
-from typing import Dict, List, Set, Tuple
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Tuple
 
-from src.utils.preprocessing import build_stopwords, filter_tokens, tokenize
+import numpy as np
+
+from src.extractive.sentence_table import SentenceTable
+from src.extractive.similarity_kernel import CondensedSimilarity, condensed_cosine, idf_weight, smoothed_idf
+from src.extractive.sparse_similarity import cosine_similarity_sparse, tfidf_matrix_from_tokens
+from src.utils.instrumentation import stage
+from src.utils.preprocessing import stopwords_for, tokenize_filtered
 
 
 def _tf(tokens: List[str]) -> Counter:
@@ -18,63 +23,111 @@ def _idf(docs: List[List[str]]) -> Dict[str, float]:
 
     idf: Dict[str, float] = {}
     for term, dfi in df.items():
-        idf[term] = math.log((1.0 + n_docs) / (1.0 + dfi)) + 1.0
+        idf[term] = smoothed_idf(n_docs, dfi)
     return idf
 
 
-def _tfidf_vector(tokens: List[str], idf: Dict[str, float]) -> Dict[str, float]:
+def _tfidf_vector(tokens: List[str], idf: Mapping[str, float]) -> Dict[str, float]:
     tf = _tf(tokens)
     vec: Dict[str, float] = {}
     for term, freq in tf.items():
-        if term in idf:
-            vec[term] = float(freq) * idf[term]
+        weight = idf_weight(idf, term)
+        if weight is not None:
+            vec[term] = float(freq) * weight
     return vec
 
 
-def _cosine(v1: Dict[str, float], v2: Dict[str, float]) -> float:
-    if not v1 or not v2:
-        return 0.0
+def tokenize_sentences(sentences: Iterable[str], stopwords: AbstractSet[str]) -> List[List[str]]:
+    
+    return [tokenize_filtered(s, stopwords) for s in sentences]
 
-    dot = 0.0
-    if len(v1) > len(v2):
-        v1, v2 = v2, v1
-    for k, a in v1.items():
-        b = v2.get(k)
-        if b is not None:
-            dot += a * b
 
-    norm1 = math.sqrt(sum(a * a for a in v1.values()))
-    norm2 = math.sqrt(sum(b * b for b in v2.values()))
-    if norm1 == 0.0 or norm2 == 0.0:
-        return 0.0
-    return dot / (norm1 * norm2)
+def tfidf_vectors_from_tokens(
+    docs_tokens: List[List[str]],
+    idf: Mapping[str, float] | None = None,
+) -> List[Dict[str, float]]:
+    
+    with stage("tfidf"):
+        if idf is None:
+            idf = _idf(docs_tokens)
+        return [_tfidf_vector(toks, idf) for toks in docs_tokens]
 
 
 def build_tfidf_vectors(
     sentences: List[str],
     extra_stopwords: List[str] | None = None,
-) -> Tuple[List[Dict[str, float]], Set[str]]:
+    idf: Mapping[str, float] | None = None,
+) -> Tuple[List[Dict[str, float]], AbstractSet[str]]:
     
-    stopwords = build_stopwords(extra_stopwords)
-
-    docs_tokens: List[List[str]] = []
-    for s in sentences:
-        tokens = tokenize(s)
-        tokens = filter_tokens(tokens, stopwords=stopwords)
-        docs_tokens.append(tokens)
-
-    idf = _idf(docs_tokens)
-    vectors = [_tfidf_vector(toks, idf) for toks in docs_tokens]
+    # idf may be an IdfModel: terms it never saw get its df=0 smoothed weight
+    stopwords = stopwords_for(extra_stopwords)
+    docs_tokens = tokenize_sentences(sentences, stopwords)
+    vectors = tfidf_vectors_from_tokens(docs_tokens, idf=idf)
     return vectors, stopwords
 
 
 def cosine_similarity_matrix(vectors: List[Dict[str, float]]) -> List[List[float]]:
     
-    n = len(vectors)
-    sim = [[0.0 for _ in range(n)] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                continue
-            sim[i][j] = _cosine(vectors[i], vectors[j])
-    return sim
+    return condensed_cosine(vectors).to_matrix()
+
+
+SIMILARITY_BACKENDS = ("dict", "sparse", "table")
+
+
+def condensed_similarity_from_tokens(
+    docs_tokens: List[List[str]],
+    backend: str = "dict",
+    idf: Mapping[str, float] | None = None,
+) -> CondensedSimilarity:
+    
+    if backend == "dict":
+        return condensed_cosine(tfidf_vectors_from_tokens(docs_tokens, idf=idf))
+    if backend == "table":
+        return SentenceTable.from_tokens(docs_tokens, idf=idf).condensed_similarity()
+    raise ValueError(f"Backend {backend!r} has no condensed form (expected 'dict' or 'table')")
+
+
+def similarity_from_tokens(
+    docs_tokens: List[List[str]],
+    backend: str = "dict",
+    idf: Mapping[str, float] | None = None,
+) -> List[List[float]]:
+    
+    if backend == "sparse":
+        return cosine_similarity_sparse(tfidf_matrix_from_tokens(docs_tokens, idf=idf)).tolist()
+    if backend not in SIMILARITY_BACKENDS:
+        raise ValueError(f"Unknown similarity backend: {backend!r} (expected one of {SIMILARITY_BACKENDS})")
+    return condensed_similarity_from_tokens(docs_tokens, backend=backend, idf=idf).to_matrix()
+
+
+def similarity_array_from_tokens(
+    docs_tokens: List[List[str]],
+    backend: str = "dict",
+    idf: Mapping[str, float] | None = None,
+) -> np.ndarray:
+    
+    if backend == "sparse":
+        return cosine_similarity_sparse(tfidf_matrix_from_tokens(docs_tokens, idf=idf))
+    if backend not in SIMILARITY_BACKENDS:
+        raise ValueError(f"Unknown similarity backend: {backend!r} (expected one of {SIMILARITY_BACKENDS})")
+    return condensed_similarity_from_tokens(docs_tokens, backend=backend, idf=idf).to_array()
+
+
+def similarity_matrix(
+    sentences: List[str],
+    extra_stopwords: List[str] | None = None,
+    backend: str = "dict",
+) -> List[List[float]]:
+    
+    docs_tokens = tokenize_sentences(sentences, stopwords_for(extra_stopwords))
+    return similarity_from_tokens(docs_tokens, backend=backend)
+
+
+def similarity_array(
+    sentences: List[str],
+    extra_stopwords: List[str] | None = None,
+    backend: str = "dict",
+) -> np.ndarray:
+    
+    docs_tokens = tokenize_sentences(sentences, stopwords_for(extra_stopwords))
+    return similarity_array_from_tokens(docs_tokens, backend=backend)
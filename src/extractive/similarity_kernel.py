@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.utils.instrumentation import stage
+
+
+def dot_sparse(v1: Dict[str, float], v2: Dict[str, float]) -> float:
+    if len(v1) > len(v2):
+        v1, v2 = v2, v1
+    dot = 0.0
+    for k, a in v1.items():
+        b = v2.get(k)
+        if b is not None:
+            dot += a * b
+    return dot
+
+
+def vector_norm(v: Dict[str, float]) -> float:
+    return math.sqrt(sum(a * a for a in v.values()))
+
+
+def smoothed_idf(n_docs: int, df: int = 0) -> float:
+    return math.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+
+def idf_weight(idf: Mapping[str, float], term: str) -> Optional[float]:
+
+    # None drops the term: a plain dict only weighs the terms it holds, while
+    # an IdfModel falls back to its df=0 smoothed weight for unseen terms
+    weight = idf.get(term)
+    if weight is None:
+        return getattr(idf, "unseen_weight", None)
+    return weight
+
+
+def vector_norms(vectors: Sequence[Dict[str, float]]) -> array:
+    return array("d", (vector_norm(v) for v in vectors))
+
+
+def cosine_with_norms(v1: Dict[str, float], norm1: float, v2: Dict[str, float], norm2: float) -> float:
+    if norm1 == 0.0 or norm2 == 0.0:
+        return 0.0
+    return dot_sparse(v1, v2) / (norm1 * norm2)
+
+
+def condensed_index(i: int, j: int, n: int) -> int:
+
+    # position of pair (i, j), i < j, in the row-major upper triangle
+    return i * n - i * (i + 1) // 2 + (j - i - 1)
+
+
+class CondensedSimilarity:
+
+    # Symmetric similarity with a zero diagonal, stored as the n(n-1)/2 pairs
+    # i < j in one contiguous array('d') (8 bytes per pair, no boxed floats).
+
+    def __init__(self, n: int, data: Optional[array] = None) -> None:
+        size = n * (n - 1) // 2
+        if data is None:
+            data = array("d", bytes(8 * size))
+        if len(data) != size:
+            raise ValueError(f"Condensed buffer for n={n} needs {size} values, got {len(data)}")
+        self.n = n
+        self.data = data
+
+    def __len__(self) -> int:
+        return self.n
+
+    def get(self, i: int, j: int) -> float:
+        if i == j:
+            return 0.0
+        if i > j:
+            i, j = j, i
+        return self.data[condensed_index(i, j, self.n)]
+
+    def __getitem__(self, key) -> float:
+        i, j = key
+        return self.get(i, j)
+
+    def row(self, i: int) -> List[float]:
+        n = self.n
+        data = self.data
+        # column i above the diagonal: the stride shrinks by one per row
+        out = []
+        pos, step = i - 1, n - 2
+        for _ in range(i):
+            out.append(data[pos])
+            pos += step
+            step -= 1
+        out.append(0.0)
+        start = condensed_index(i, i + 1, n) if i + 1 < n else 0
+        out.extend(data[start : start + n - i - 1])
+        return out
+
+    def row_sums(self) -> List[float]:
+        return [sum(self.row(i)) for i in range(self.n)]
+
+    def mean(self) -> float:
+        return sum(self.data) / len(self.data) if self.data else 0.0
+
+    def to_matrix(self) -> List[List[float]]:
+        return [self.row(i) for i in range(self.n)]
+
+    def to_array(self) -> np.ndarray:
+        n = self.n
+        sim = np.zeros((n, n), dtype=np.float64)
+        upper = np.triu_indices(n, k=1)
+        sim[upper] = np.frombuffer(self.data, dtype=np.float64) if self.data else 0.0
+        sim.T[upper] = sim[upper]
+        return sim
+
+    @classmethod
+    def from_array(cls, sim: np.ndarray) -> "CondensedSimilarity":
+        n = sim.shape[0]
+        values = np.ascontiguousarray(sim[np.triu_indices(n, k=1)], dtype=np.float64)
+        return cls(n, array("d", values.tobytes()))
+
+
+def condensed_cosine(
+    vectors: Sequence[Dict[str, float]],
+    norms: Optional[Sequence[float]] = None,
+) -> CondensedSimilarity:
+
+    with stage("similarity"):
+        n = len(vectors)
+        if norms is None:
+            norms = vector_norms(vectors)
+        data = array("d")
+        for i in range(n):
+            vi, ni = vectors[i], norms[i]
+            if ni == 0.0:
+                data.frombytes(bytes(8 * (n - i - 1)))
+                continue
+            data.extend(cosine_with_norms(vi, ni, vectors[j], norms[j]) for j in range(i + 1, n))
+        return CondensedSimilarity(n, data)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from src.extractive.similarity_kernel import idf_weight
+from src.utils.instrumentation import stage
+from src.utils.preprocessing import stopwords_for, tokenize_filtered
+
+
+@dataclass(frozen=True)
+class TfidfMatrix:
+    # CSR layout: row i owns indices[indptr[i]:indptr[i + 1]]
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    vocab: Dict[str, int]
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+
+def _intern(docs_tokens: List[List[str]]) -> Tuple[Dict[str, int], List[Counter]]:
+    vocab: Dict[str, int] = {}
+    counts: List[Counter] = []
+    for tokens in docs_tokens:
+        c: Counter = Counter()
+        for t in tokens:
+            tid = vocab.get(t)
+            if tid is None:
+                tid = len(vocab)
+                vocab[t] = tid
+            c[tid] += 1
+        counts.append(c)
+    return vocab, counts
+
+
+def tfidf_matrix_from_tokens(
+    docs_tokens: List[List[str]],
+    idf: Mapping[str, float] | None = None,
+) -> TfidfMatrix:
+
+    with stage("tfidf"):
+        if idf is not None:
+            # terms missing from an external table are dropped, as in the dict path
+            docs_tokens = [[t for t in tokens if idf_weight(idf, t) is not None] for tokens in docs_tokens]
+        vocab, counts = _intern(docs_tokens)
+
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        for i, c in enumerate(counts):
+            indptr[i + 1] = indptr[i] + len(c)
+
+        indices = np.fromiter((tid for c in counts for tid in c), dtype=np.int64, count=int(indptr[-1]))
+        tf = np.fromiter((f for c in counts for f in c.values()), dtype=np.float64, count=int(indptr[-1]))
+
+        if idf is None:
+            n_docs = len(counts)
+            df = np.bincount(indices, minlength=len(vocab)).astype(np.float64)
+            idf_arr = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+        else:
+            idf_arr = np.fromiter((idf_weight(idf, t) for t in vocab), dtype=np.float64, count=len(vocab))
+
+        data = tf * idf_arr[indices]
+        return TfidfMatrix(indptr=indptr, indices=indices, data=data, vocab=vocab)
+
+
+def build_tfidf_matrix(
+    sentences: List[str],
+    extra_stopwords: List[str] | None = None,
+) -> Tuple[TfidfMatrix, AbstractSet[str]]:
+
+    stopwords = stopwords_for(extra_stopwords)
+    docs_tokens = [tokenize_filtered(s, stopwords) for s in sentences]
+    return tfidf_matrix_from_tokens(docs_tokens), stopwords
+
+
+def normalize_rows(matrix: TfidfMatrix) -> TfidfMatrix:
+
+    lengths = np.diff(matrix.indptr)
+    rows = np.repeat(np.arange(matrix.n_rows), lengths)
+    sq = np.bincount(rows, weights=matrix.data * matrix.data, minlength=matrix.n_rows)
+    norms = np.sqrt(sq)
+    safe = np.where(norms > 0.0, norms, 1.0)
+    return TfidfMatrix(
+        indptr=matrix.indptr,
+        indices=matrix.indices,
+        data=matrix.data / safe[rows],
+        vocab=matrix.vocab,
+    )
+
+
+# Cells of dense scratch per product step (32 MB of float64)
+_BLOCK_CELLS = 1 << 22
+
+
+def _gram(matrix: TfidfMatrix) -> np.ndarray:
+    # X @ X.T as BLAS products over dense slices of X, never per-term pair lists.
+    n = matrix.n_rows
+    width = int(matrix.indices.max()) + 1 if matrix.indices.size else 0
+    rows = np.repeat(np.arange(n), np.diff(matrix.indptr))
+    if n * width <= max(_BLOCK_CELLS, n * n):
+        # dense X is no larger than the n x n result (or fits the scratch)
+        dense = np.zeros((n, width), dtype=np.float64)
+        dense[rows, matrix.indices] = matrix.data
+        return dense @ dense.T
+
+    # Otherwise one block of rows at a time: only the columns (terms) the
+    # block uses can contribute, so X is made dense over just those.
+    out = np.zeros((n, n), dtype=np.float64)
+    max_block_nnz = max(1, _BLOCK_CELLS // n)
+    lo = 0
+    while lo < n:
+        hi = int(np.searchsorted(matrix.indptr, matrix.indptr[lo] + max_block_nnz, side="right")) - 1
+        hi = min(n, max(hi, lo + 1))
+        cols = np.unique(matrix.indices[matrix.indptr[lo] : matrix.indptr[hi]])
+        position = np.full(width, -1, dtype=np.int64)
+        position[cols] = np.arange(cols.size)
+        at = position[matrix.indices]
+        used = at >= 0
+        dense = np.zeros((n, cols.size), dtype=np.float64)
+        dense[rows[used], at[used]] = matrix.data[used]
+        out[lo:hi] = dense[lo:hi] @ dense.T
+        lo = hi
+    return out
+
+
+def cosine_similarity_sparse(matrix: TfidfMatrix) -> np.ndarray:
+
+    with stage("similarity"):
+        sim = _gram(normalize_rows(matrix))
+        np.fill_diagonal(sim, 0.0)
+        return sim
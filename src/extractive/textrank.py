@@ -1,9 +1,33 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import heapq
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import AbstractSet, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
-from src.extractive.similarity import build_tfidf_vectors, cosine_similarity_matrix
+import numpy as np
+
+from src.extractive.graph import build_sparse_graph, power_iteration_graph, power_iteration_graph_matrix
+from src.extractive.sentence_table import SentenceTable
+from src.extractive.similarity import (
+    _idf,
+    condensed_similarity_from_tokens,
+    similarity_array_from_tokens,
+    tfidf_vectors_from_tokens,
+    smoothed_idf,
+    tokenize_sentences,
+)
+from src.extractive.similarity_kernel import (
+    CondensedSimilarity,
+    condensed_cosine,
+    cosine_with_norms,
+    vector_norm,
+    vector_norms,
+)
+from src.extractive.sparse_similarity import cosine_similarity_sparse
+from src.utils.instrumentation import count, stage
+from src.utils.preprocessing import stopwords_for, tokenize_filtered
 
 
 @dataclass(frozen=True)
@@ -13,32 +37,219 @@ class TextRankConfig:
     max_iter: int = 50
     eps: float = 1e-6
     edge_threshold: Optional[float] = None
+    similarity_backend: str = "dict"
+    solver: str = "loop"
+    graph: str = "dense"
+    top_k_neighbors: Optional[int] = None
+
+
+TEXTRANK_SOLVERS = ("loop", "matrix")
+TEXTRANK_GRAPHS = ("dense", "sparse")
+
+
+def _iterate_columns(
+    column: Callable[[int], List[float]],
+    outgoing_sums: List[float],
+    config: TextRankConfig,
+) -> Tuple[List[float], int]:
+    n = len(outgoing_sums)
+    scores = [1.0 / n for _ in range(n)]
+
+    iterations = 0
+    for _ in range(config.max_iter):
+        iterations += 1
+        new_scores = [(1.0 - config.damping)/n for _ in range(n)]
+        max_change = 0.0
+
+        for i in range(n):
+            acc = 0.0
+            for j, w_ji in enumerate(column(i)):
+                if w_ji <= 0.0:
+                    continue
+
+                denom = outgoing_sums[j]
+                if denom <= 0.0:
+                    continue
+
+                acc += (w_ji / denom) * scores[j]
 
+            new_scores[i] += config.damping * acc
+            diff = abs(new_scores[i] - scores[i])
+            if diff > max_change:
+                max_change = diff
 
-def _row_outgoing_sum(weights: List[List[float]], j: int) -> float:
-    return sum(weights[j])
+        scores = new_scores
+        if max_change < config.eps:
+            break
+    return scores, iterations
 
 
-def _apply_edge_threshold(sim: List[List[float]], threshold: Optional[float]) -> List[List[float]]:
+def _apply_edge_threshold_condensed(sim: CondensedSimilarity, threshold: Optional[float]) -> CondensedSimilarity:
     if threshold is None:
         return sim
-    n = len(sim)
-    out = [[0.0 for _ in range(n)] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                continue
-            w = sim[i][j]
-            if w > threshold:
-                out[i][j] = w
-    return out
+    return CondensedSimilarity(sim.n, array("d", (w if w > threshold else 0.0 for w in sim.data)))
 
 
-def textrank_summarize(
+def _power_iteration_columns(weights: np.ndarray, config: TextRankConfig) -> List[float]:
+    # loop solver on a NumPy matrix: one column becomes a list at a time
+    with stage("iteration"):
+        outgoing_sums = [sum(weights[j].tolist()) for j in range(weights.shape[0])]
+        scores, iterations = _iterate_columns(lambda i: weights[:, i].tolist(), outgoing_sums, config)
+    count("textrank.iterations", iterations)
+    return scores
+
+
+def _power_iteration_condensed(sim: CondensedSimilarity, config: TextRankConfig) -> List[float]:
+    # symmetric weights: column i is row i, rebuilt from the buffer per visit
+    # so only one row of n floats is live at a time, never the n x n matrix
+    sim = _apply_edge_threshold_condensed(sim, config.edge_threshold)
+    with stage("iteration"):
+        scores, iterations = _iterate_columns(sim.row, sim.row_sums(), config)
+    count("textrank.iterations", iterations)
+    return scores
+
+
+def _apply_edge_threshold_array(sim: np.ndarray, threshold: Optional[float]) -> np.ndarray:
+    if threshold is None:
+        return sim
+    return np.where(sim > threshold, sim, 0.0)
+
+
+def _column_stochastic(weights: np.ndarray) -> np.ndarray:
+    # m[i, j] = w_ji / outgoing_sums[j]; dangling rows contribute nothing
+    outgoing_sums = weights.sum(axis=1)
+    safe = np.where(outgoing_sums > 0.0, outgoing_sums, 1.0)
+    return (np.where(weights > 0.0, weights, 0.0) / safe[:, None]).T
+
+
+def _power_iteration_matrix(weights: np.ndarray, config: TextRankConfig) -> List[float]:
+    with stage("iteration"):
+        m = _column_stochastic(weights)
+        scores, iterations = _iterate_matvec(lambda x: m @ x, weights.shape[0], config)
+    count("textrank.iterations", iterations)
+    return scores.tolist()
+
+
+def _iterate_matvec(
+    step: Callable[[np.ndarray], np.ndarray],
+    n: int,
+    config: TextRankConfig,
+) -> Tuple[np.ndarray, int]:
+    base = (1.0 - config.damping) / n
+
+    scores = np.full(n, 1.0 / n)
+    iterations = 0
+    for _ in range(config.max_iter):
+        iterations += 1
+        new_scores = base + config.damping * step(scores)
+        max_change = float(np.max(np.abs(new_scores - scores)))
+        scores = new_scores
+        if max_change < config.eps:
+            break
+    return scores, iterations
+
+
+def _condensed_rows(sim: CondensedSimilarity, threshold: Optional[float]) -> List[np.ndarray]:
+    # row i of the upper triangle (columns i+1..n-1) as a view into one buffer
+    values = np.frombuffer(sim.data, dtype=np.float64) if sim.data else np.zeros(0)
+    if threshold is not None:
+        values = np.where(values > threshold, values, 0.0)
+    rows: List[np.ndarray] = []
+    start = 0
+    for i in range(sim.n - 1):
+        end = start + sim.n - i - 1
+        rows.append(values[start:end])
+        start = end
+    return rows
+
+
+def _symmetric_matvec(rows: List[np.ndarray], x: np.ndarray) -> np.ndarray:
+    y = np.zeros_like(x)
+    for i, row in enumerate(rows):
+        y[i] += row @ x[i + 1 :]
+        y[i + 1 :] += row * x[i]
+    return y
+
+
+def _power_iteration_condensed_matrix(sim: CondensedSimilarity, config: TextRankConfig) -> List[float]:
+    # W @ (scores / outgoing_sums) equals the column-stochastic product for a
+    # symmetric W, so the n x n array is never built
+    with stage("iteration"):
+        rows = _condensed_rows(sim, config.edge_threshold)
+        outgoing_sums = _symmetric_matvec(rows, np.ones(sim.n))
+        safe = np.where(outgoing_sums > 0.0, outgoing_sums, 1.0)
+        scores, iterations = _iterate_matvec(lambda x: _symmetric_matvec(rows, x / safe), sim.n, config)
+    count("textrank.iterations", iterations)
+    return scores.tolist()
+
+
+def _rank_scores(
+    docs_tokens: List[List[str]],
+    config: TextRankConfig,
+    idf: Mapping[str, float] | None = None,
+    vectors: List[Dict[str, float]] | None = None,
+    table: SentenceTable | None = None,
+    condensed: CondensedSimilarity | None = None,
+) -> List[float]:
+    if config.solver not in TEXTRANK_SOLVERS:
+        raise ValueError(f"Unknown TextRank solver: {config.solver!r} (expected one of {TEXTRANK_SOLVERS})")
+
+    if config.graph == "sparse":
+        if vectors is None:
+            vectors = table.vectors() if table is not None else tfidf_vectors_from_tokens(docs_tokens, idf=idf)
+        adjacency = build_sparse_graph(vectors, threshold=config.edge_threshold, top_k=config.top_k_neighbors)
+        iterate = power_iteration_graph_matrix if config.solver == "matrix" else power_iteration_graph
+        return iterate(adjacency, damping=config.damping, max_iter=config.max_iter, eps=config.eps)
+
+    if config.graph != "dense":
+        raise ValueError(f"Unknown TextRank graph mode: {config.graph!r} (expected one of {TEXTRANK_GRAPHS})")
+    if config.top_k_neighbors is not None:
+        raise ValueError("top_k_neighbors requires graph='sparse'")
+
+    if config.similarity_backend == "sparse":
+        if table is not None:
+            sim_arr = cosine_similarity_sparse(table.tfidf_matrix())
+        else:
+            sim_arr = similarity_array_from_tokens(docs_tokens, backend="sparse", idf=idf)
+        # the NumPy matrix is iterated as is, never boxed into n x n lists
+        sim_arr = _apply_edge_threshold_array(sim_arr, config.edge_threshold)
+        if config.solver == "matrix":
+            return _power_iteration_matrix(sim_arr, config)
+        return _power_iteration_columns(sim_arr, config)
+
+    # dict and table backends iterate straight off the condensed upper triangle
+    if condensed is None:
+        if table is not None:
+            condensed = table.condensed_similarity()
+        elif vectors is not None and config.similarity_backend == "dict":
+            condensed = condensed_cosine(vectors)
+        else:
+            condensed = condensed_similarity_from_tokens(docs_tokens, backend=config.similarity_backend, idf=idf)
+    if config.solver == "matrix":
+        return _power_iteration_condensed_matrix(condensed, config)
+    return _power_iteration_condensed(condensed, config)
+
+
+def _select_top_k(sentences: List[str], scores: List[float], k: int) -> List[int]:
+    return _select_top_k_by(scores, k, lambda idx: len(sentences[idx]))
+
+
+def _select_top_k_by(scores: List[float], k: int, length: Callable[[int], int]) -> List[int]:
+    # O(n log k) partial selection; same (score, index, length) order as a full sort
+    selected = heapq.nsmallest(
+        k,
+        range(len(scores)),
+        key=lambda idx: (-scores[idx], idx, length(idx)),
+    )
+    return sorted(selected)
+
+
+def summarize_tokens(
     sentences: List[str],
+    docs_tokens: List[List[str]],
     k: int,
     config: TextRankConfig = TextRankConfig(),
-    extra_stopwords: List[str] | None = None,
+    idf: Mapping[str, float] | None = None,
 ) -> Tuple[List[str], List[float]]:
     
     if k <= 0:
@@ -51,47 +262,175 @@ def textrank_summarize(
     if k >= n:
         return sentences[:], [1.0 / n for _ in range(n)]
 
-    vectors, _ = build_tfidf_vectors(sentences, extra_stopwords=extra_stopwords)
-    sim = cosine_similarity_matrix(vectors)
-    weights = _apply_edge_threshold(sim, config.edge_threshold)
+    count("textrank.sentences", n)
+    count("textrank.terms", sum(len(toks) for toks in docs_tokens))
+    scores = _rank_scores(docs_tokens, config, idf=idf)
+    selected = _select_top_k(sentences, scores, k)
+    return [sentences[i] for i in selected], scores
 
-    scores = [1.0 / n for _ in range(n)]
 
-    outgoing_sums = [_row_outgoing_sum(weights, j) for j in range(n)]
+def textrank_summarize_stream(
+    sentences: Iterable[str],
+    k: int,
+    config: TextRankConfig = TextRankConfig(),
+    extra_stopwords: List[str] | None = None,
+    idf: Mapping[str, float] | None = None,
+) -> Tuple[List[str], List[float]]:
+    
+    # Tokenizes while consuming, e.g. iter_sentences(file), so the raw text
+    # never has to exist as one string.
+    with stage("textrank"):
+        stopwords = stopwords_for(extra_stopwords)
+        kept: List[str] = []
+        docs_tokens: List[List[str]] = []
+        for s in sentences:
+            kept.append(s)
+            docs_tokens.append(tokenize_filtered(s, stopwords))
+        return summarize_tokens(kept, docs_tokens, k, config, idf=idf)
 
-    for _ in range(config.max_iter):
-        new_scores = [(1.0 - config.damping)/n for _ in range(n)]
-        max_change = 0.0
 
-        for i in range(n):
-            acc = 0.0
-            for j in range(n):
-                w_ji = weights[j][i]
-                if w_ji <= 0.0:
-                    continue
+def textrank_summarize(
+    sentences: List[str],
+    k: int,
+    config: TextRankConfig = TextRankConfig(),
+    extra_stopwords: List[str] | None = None,
+) -> Tuple[List[str], List[float]]:
+    
+    with stage("textrank"):
+        docs_tokens: List[List[str]] = []
+        if 0 < k < len(sentences):
+            with stage("tokenize"):
+                docs_tokens = tokenize_sentences(sentences, stopwords_for(extra_stopwords))
+        return summarize_tokens(sentences, docs_tokens, k, config)
 
-                denom = outgoing_sums[j]
-                if denom <= 0.0:
-                    continue
 
-                acc += (w_ji / denom) * scores[j]
+def textrank_scores(
+    sentences: List[str],
+    config: TextRankConfig = TextRankConfig(),
+    extra_stopwords: List[str] | None = None,
+) -> List[float]:
+    
+    # The full ranking does not depend on k, so callers can cache it per text
+    # and cut summaries of any length with select_top_k.
+    n = len(sentences)
+    if n <= 1:
+        return [1.0 / n for _ in range(n)]
+    with stage("textrank"):
+        with stage("tokenize"):
+            docs_tokens = tokenize_sentences(sentences, stopwords_for(extra_stopwords))
+        count("textrank.sentences", n)
+        count("textrank.terms", sum(len(toks) for toks in docs_tokens))
+        return _rank_scores(docs_tokens, config)
 
-            new_scores[i] += config.damping * acc
-            diff = abs(new_scores[i] - scores[i])
-            if diff > max_change:
-                max_change = diff
 
-        scores = new_scores
-        if max_change < config.eps:
-            break
+def select_top_k(sentences: List[str], scores: List[float], k: int) -> List[str]:
+    if k <= 0:
+        return []
+    if k >= len(sentences):
+        return sentences[:]
+    return [sentences[i] for i in _select_top_k(sentences, scores, k)]
 
-    ranked = sorted(
-        range(n),
-        key=lambda idx: (-scores[idx], idx, len(sentences[idx])),
-    )
 
-    selected = ranked[:k]
-    selected_set = set(selected)
+def textrank_summarize_table(
+    table: SentenceTable,
+    k: int,
+    config: TextRankConfig = TextRankConfig(),
+) -> Tuple[List[str], List[float]]:
+    
+    # Only the selected sentences are ever sliced out of the source text.
+    n = len(table)
+    if k <= 0 or n == 0:
+        return [], []
+    if k >= n:
+        return list(table.sentences()), [1.0 / n for _ in range(n)]
+
+    scores = _rank_scores([], config, table=table)
+    selected = _select_top_k_by(scores, k, table.length)
+    return [table.sentence(i) for i in selected], scores
+
 
-    summary = [sentences[i] for i in range(n) if i in selected_set]
-    return summary, scores
+@dataclass
+class ExtractiveArtifact:
+    
+    sentences: List[str]
+    tokens: List[List[str]]
+    vectors: List[Dict[str, float]]
+    norms: List[float]
+    idf: Dict[str, float]
+    stopwords: AbstractSet[str]
+    selected: List[int]
+    pair_sims: Dict[Tuple[int, int], float] = field(default_factory=dict)
+
+    def index_of(self, sentence: str) -> Optional[int]:
+        for i in self.selected:
+            if self.sentences[i].strip() == sentence:
+                return i
+        return None
+
+    def similarity(self, i: int, j: int) -> float:
+        key = (i, j) if i < j else (j, i)
+        sim = self.pair_sims.get(key)
+        if sim is None:
+            sim = cosine_with_norms(self.vectors[i], self.norms[i], self.vectors[j], self.norms[j])
+            self.pair_sims[key] = sim
+        return sim
+
+    def vectorize(self, sentence: str) -> Tuple[Dict[str, float], float]:
+        # terms the document never used get the df=0 smoothed weight
+        n_docs = len(self.sentences)
+        vec: Dict[str, float] = {}
+        for term, freq in Counter(tokenize_filtered(sentence, self.stopwords)).items():
+            vec[term] = float(freq) * self.idf.get(term, smoothed_idf(n_docs))
+        return vec, vector_norm(vec)
+
+
+def textrank_extract(
+    sentences: List[str],
+    k: int,
+    config: TextRankConfig = TextRankConfig(),
+    extra_stopwords: List[str] | None = None,
+) -> Tuple[List[str], List[float], ExtractiveArtifact]:
+    
+    with stage("textrank"):
+        stopwords = stopwords_for(extra_stopwords)
+        with stage("tokenize"):
+            docs_tokens = tokenize_sentences(sentences, stopwords)
+        idf = _idf(docs_tokens)
+        vectors = tfidf_vectors_from_tokens(docs_tokens, idf=idf)
+
+        n = len(sentences)
+        condensed: CondensedSimilarity | None = None
+        if k <= 0 or n == 0:
+            scores: List[float] = []
+            selected: List[int] = []
+        elif k >= n:
+            scores = [1.0 / n for _ in range(n)]
+            selected = list(range(n))
+        else:
+            count("textrank.sentences", n)
+            count("textrank.terms", sum(len(toks) for toks in docs_tokens))
+            if config.graph == "dense" and config.similarity_backend == "dict":
+                condensed = condensed_cosine(vectors)
+            scores = _rank_scores(docs_tokens, config, idf=idf, vectors=vectors, condensed=condensed)
+            selected = _select_top_k(sentences, scores, k)
+
+    # merge only looks up pairs of selected sentences; seed those from the
+    # ranked graph's raw similarities so none is recomputed
+    pair_sims: Dict[Tuple[int, int], float] = {}
+    if condensed is not None:
+        ordered = sorted(selected)
+        for a, i in enumerate(ordered):
+            for j in ordered[a + 1 :]:
+                pair_sims[(i, j)] = condensed.get(i, j)
+
+    artifact = ExtractiveArtifact(
+        sentences=sentences,
+        tokens=docs_tokens,
+        vectors=vectors,
+        norms=list(vector_norms(vectors)),
+        idf=idf,
+        stopwords=stopwords,
+        selected=selected,
+        pair_sims=pair_sims,
+    )
+    return [sentences[i] for i in selected], scores, artifact
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.abstractive.llm_summarizer import MetisLLMSummarizer, shared_summarizer
+from src.extractive.textrank import ExtractiveArtifact, TextRankConfig, textrank_extract, textrank_summarize
+from src.merge.merge_engine import IncrementalMerge, MergeConfig, merge_summaries
+from src.utils.text_splitter import iter_sentences, sentence_prefix, split_sentences
+
+
+_END = object()
+
+
+def _until(cancel: threading.Event, deltas: Iterable[str], seen: List[str]) -> Iterator[str]:
+    for delta in deltas:
+        if cancel.is_set():
+            return
+        seen.append(delta)
+        yield delta
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.perf_counter())
+
+
+@dataclass
+class HybridResult:
+    extractive_summary: List[str]
+    abstractive_text: str
+    final_summary: List[str]
+    timings: Dict[str, float] = field(default_factory=dict)
+    # False when the latency budget ran out before the LLM finished
+    abstractive_complete: bool = True
+
+    @property
+    def extractive_text(self) -> str:
+        return " ".join(self.extractive_summary).strip()
+
+    @property
+    def hybrid_text(self) -> str:
+        return " ".join(self.final_summary).strip()
+
+
+class HybridPipeline:
+
+    def __init__(
+        self,
+        summarizer: Optional[MetisLLMSummarizer] = None,
+        k_extractive: int = 3,
+        k_final: int = 4,
+        llm_target_sentences: int = 3,
+        textrank_config: TextRankConfig = TextRankConfig(),
+        merge_config: MergeConfig = MergeConfig(),
+        extra_stopwords: Optional[List[str]] = None,
+        max_workers: int = 4,
+        reuse_extractive_vectors: bool = False,
+        stream_llm: bool = False,
+        latency_budget: Optional[float] = None,
+    ) -> None:
+        if latency_budget is not None and latency_budget <= 0:
+            raise ValueError("latency_budget must be positive (seconds) or None")
+        self._summarizer = summarizer
+        self.k_extractive = k_extractive
+        self.k_final = k_final
+        self.llm_target_sentences = llm_target_sentences
+        self.textrank_config = textrank_config
+        self.merge_config = merge_config
+        self.extra_stopwords = extra_stopwords
+        self.reuse_extractive_vectors = reuse_extractive_vectors
+        self.stream_llm = stream_llm
+        self.latency_budget = latency_budget
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hybrid-llm")
+
+    @property
+    def summarizer(self) -> MetisLLMSummarizer:
+        if self._summarizer is None:
+            self._summarizer = shared_summarizer()
+        return self._summarizer
+
+    def _timed_llm(self, summarizer: MetisLLMSummarizer, text: str) -> Tuple[str, float]:
+        t0 = time.perf_counter()
+        if self.latency_budget is None:
+            out = summarizer.summarize(text, target_sentences=self.llm_target_sentences)
+        else:
+            # the answer is dropped after the budget anyway, so the request ends
+            # there too instead of holding a pool worker until the SDK timeout
+            out = summarizer.summarize(
+                text, target_sentences=self.llm_target_sentences, timeout=self.latency_budget
+            )
+        return out, time.perf_counter() - t0
+
+    def _stream_llm(
+        self,
+        summarizer: MetisLLMSummarizer,
+        text: str,
+        out: "queue.Queue[object]",
+        cancel: threading.Event,
+        raw: List[str],
+    ) -> float:
+        t0 = time.perf_counter()
+        if self.latency_budget is None:
+            deltas = summarizer.stream(text, target_sentences=self.llm_target_sentences)
+        else:
+            # _until only sees the cancel flag when a delta arrives, so a
+            # stalled stream has to end on its own read timeout
+            deltas = summarizer.stream(
+                text, target_sentences=self.llm_target_sentences, timeout=self.latency_budget
+            )
+        try:
+            for sentence in iter_sentences(_until(cancel, deltas, raw)):
+                if cancel.is_set():
+                    break
+                out.put(sentence)
+        except Exception as exc:
+            out.put(exc)
+        finally:
+            # closing the generator closes the HTTP stream, also when cancelled
+            deltas.close()
+            out.put(_END)
+        return time.perf_counter() - t0
+
+    def _merge_stream(
+        self,
+        extractive_summary: List[str],
+        artifact: Optional[ExtractiveArtifact],
+        sentences: "queue.Queue[object]",
+        cancel: threading.Event,
+        deadline: Optional[float],
+    ) -> Tuple[IncrementalMerge, List[str], bool]:
+
+        # Sentences are merged as they arrive. When the budget runs out, what
+        # is already queued is still taken and the stream is abandoned.
+        merger = IncrementalMerge(
+            extractive_summary,
+            k=self.k_final,
+            config=self.merge_config,
+            extra_stopwords=self.extra_stopwords,
+            artifact=artifact,
+        )
+        received: List[str] = []
+        complete = False
+        while True:
+            try:
+                item = sentences.get(timeout=_remaining(deadline))
+            except queue.Empty:
+                break
+            if item is _END:
+                complete = True
+                break
+            if isinstance(item, Exception):
+                raise item
+            received.append(item)
+            merger.add(item)
+        cancel.set()
+        return merger, received, complete
+
+    def run(self, text: str) -> HybridResult:
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        # The budget bounds the wait for the LLM; the final merge runs after it.
+        deadline = None if self.latency_budget is None else start + self.latency_budget
+
+        # The abstractive request goes out first; ranking runs while it is in flight.
+        # copy_context() carries an active instrumentation collector into the worker thread.
+        if self.stream_llm:
+            llm_sentences: "queue.Queue[object]" = queue.Queue()
+            cancel = threading.Event()
+            raw_deltas: List[str] = []
+            llm_future = self._executor.submit(
+                contextvars.copy_context().run,
+                self._stream_llm,
+                self.summarizer,
+                text,
+                llm_sentences,
+                cancel,
+                raw_deltas,
+            )
+        else:
+            llm_future = self._executor.submit(contextvars.copy_context().run, self._timed_llm, self.summarizer, text)
+
+        t0 = time.perf_counter()
+        sentences = split_sentences(text)
+        t1 = time.perf_counter()
+        # the artifact (dict vectors, IDF) is only built when merge will reuse it
+        artifact: Optional[ExtractiveArtifact] = None
+        if self.reuse_extractive_vectors:
+            extractive_summary, _, artifact = textrank_extract(
+                sentences,
+                k=self.k_extractive,
+                config=self.textrank_config,
+                extra_stopwords=self.extra_stopwords,
+            )
+        else:
+            extractive_summary, _ = textrank_summarize(
+                sentences,
+                k=self.k_extractive,
+                config=self.textrank_config,
+                extra_stopwords=self.extra_stopwords,
+            )
+        t2 = time.perf_counter()
+        timings["split"] = t1 - t0
+        timings["textrank"] = t2 - t1
+
+        complete = True
+        if self.stream_llm:
+            merger, received, complete = self._merge_stream(
+                extractive_summary, artifact, llm_sentences, cancel, deadline
+            )
+            t3 = time.perf_counter()
+            timings["llm"] = llm_future.result() if complete else t3 - start
+            timings["llm_wait"] = t3 - t2
+            # the received sentences as the model wrote them, terminators included
+            abstractive_text = sentence_prefix("".join(raw_deltas), len(received))
+            final_summary = merger.result()
+            timings["merge"] = time.perf_counter() - t3
+        else:
+            try:
+                abstractive_text, timings["llm"] = llm_future.result(timeout=_remaining(deadline))
+            except FutureTimeoutError:
+                # over budget: the extractive anchors alone make the summary
+                abstractive_text, timings["llm"], complete = "", time.perf_counter() - start, False
+            t3 = time.perf_counter()
+            timings["llm_wait"] = t3 - t2
+
+            final_summary = merge_summaries(
+                extractive_summary=extractive_summary,
+                abstractive_text=abstractive_text,
+                k=self.k_final,
+                config=self.merge_config,
+                extra_stopwords=self.extra_stopwords,
+                artifact=artifact,
+            )
+            timings["merge"] = time.perf_counter() - t3
+        timings["total"] = time.perf_counter() - start
+
+        return HybridResult(
+            extractive_summary=extractive_summary,
+            abstractive_text=abstractive_text.strip(),
+            final_summary=final_summary,
+            timings=timings,
+            abstractive_complete=complete,
+        )
+
+    def close(self) -> None:
+        # With a budget, a call abandoned past it may still be finishing; close()
+        # does not wait for it (its request timeout is the budget).
+        self._executor.shutdown(wait=self.latency_budget is None, cancel_futures=True)
+
+    def __enter__(self) -> "HybridPipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
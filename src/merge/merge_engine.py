@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import heapq
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Callable, Iterator, List, Optional, Set, Tuple
 
-from src.extractive.similarity import build_tfidf_vectors
+import numpy as np
+
+from src.extractive.sentence_table import SentenceTable
+from src.extractive.similarity import build_tfidf_vectors, similarity_array
+from src.extractive.similarity_kernel import CondensedSimilarity, condensed_cosine, cosine_with_norms
+from src.extractive.textrank import ExtractiveArtifact
+from src.utils.instrumentation import count, stage
 from src.utils.text_splitter import split_sentences
 
 
@@ -13,28 +21,12 @@ class MergeConfig:
     redundancy_threshold: float = 0.75
     prefer_extractive: bool = True
     max_abstractive_sentences: int = 60
+    similarity_backend: str = "dict"
+    strategy: str = "threshold"
+    mmr_lambda: float = 1.0
 
 
-def _cosine_sparse(v1: dict[str, float], v2: dict[str, float]) -> float:
-    
-    if not v1 or not v2:
-        return 0.0
-
-    dot = 0.0
-    if len(v1) > len(v2):
-        v1, v2 = v2, v1
-    for term, w1 in v1.items():
-        w2 = v2.get(term)
-        if w2 is not None:
-            dot += w1 * w2
-
-    # Norms
-    norm1 = sum(w * w for w in v1.values()) ** 0.5
-    norm2 = sum(w * w for w in v2.values()) ** 0.5
-    if norm1 == 0.0 or norm2 == 0.0:
-        return 0.0
-
-    return dot / (norm1 * norm2)
+MERGE_STRATEGIES = ("threshold", "mmr")
 
 
 def _dedupe_keep_order(sentences: List[str]) -> List[str]:
@@ -86,49 +78,160 @@ def _build_candidate_pool(
     return candidates, is_extractive
 
 
-def _centrality_scores(vectors: List[dict[str, float]]) -> List[float]:
+def _artifact_similarity(candidates: List[str], artifact: ExtractiveArtifact) -> CondensedSimilarity:
     
-    n = len(vectors)
-    scores = [0.0] * n
-    for i in range(n):
-        total = 0.0
-        for j in range(n):
-            if i == j:
-                continue
-            total += _cosine_sparse(vectors[i], vectors[j])
-        scores[i] = total
-    return scores
+    # Extractive anchors keep TextRank's vectors; only new sentences are vectorized.
+    doc_index = [artifact.index_of(s) for s in candidates]
+    vectors: List[Tuple[dict[str, float], float]] = []
+    for c, idx in enumerate(doc_index):
+        if idx is None:
+            vectors.append(artifact.vectorize(candidates[c]))
+        else:
+            vectors.append((artifact.vectors[idx], artifact.norms[idx]))
+
+    n = len(candidates)
+    data = array("d")
+    for a in range(n):
+        va, na = vectors[a]
+        for b in range(a + 1, n):
+            ia, ib = doc_index[a], doc_index[b]
+            if ia is not None and ib is not None:
+                data.append(artifact.similarity(ia, ib))
+            else:
+                vb, nb = vectors[b]
+                data.append(cosine_with_norms(va, na, vb, nb))
+    return CondensedSimilarity(n, data)
+
+
+def _candidate_similarity(
+    candidates: List[str],
+    config: MergeConfig,
+    extra_stopwords: Optional[List[str]],
+    artifact: Optional[ExtractiveArtifact],
+) -> CondensedSimilarity:
+    
+    if artifact is not None:
+        return _artifact_similarity(candidates, artifact)
+    if config.similarity_backend == "dict":
+        vectors, _ = build_tfidf_vectors(candidates, extra_stopwords=extra_stopwords)
+        return condensed_cosine(vectors)
+    if config.similarity_backend == "table":
+        return SentenceTable.from_sentences(candidates, extra_stopwords=extra_stopwords).condensed_similarity()
+    sim = similarity_array(candidates, extra_stopwords=extra_stopwords, backend=config.similarity_backend)
+    return CondensedSimilarity.from_array(sim)
+
+
+class _RankedCandidates:
+    
+    # Pops candidates in (-centrality, index) order from a heap only as far as
+    # the selection loops actually read; later passes replay what was popped.
 
+    def __init__(self, centrality: List[float]) -> None:
+        self._heap = [(-c, i) for i, c in enumerate(centrality)]
+        heapq.heapify(self._heap)
+        self._popped: List[int] = []
 
-def merge_summaries(
-    extractive_summary: List[str],
-    abstractive_text: Optional[str],
+    def __iter__(self) -> Iterator[int]:
+        yield from list(self._popped)
+        while self._heap:
+            i = heapq.heappop(self._heap)[1]
+            self._popped.append(i)
+            yield i
+
+
+def _select_mmr(
+    sim: np.ndarray,
+    is_extractive: List[bool],
     k: int,
-    config: MergeConfig = MergeConfig(),
-    extra_stopwords: Optional[List[str]] = None,
-) -> List[str]:
+    config: MergeConfig,
+) -> List[int]:
     
-    if k <= 0:
-        return []
+    n = sim.shape[0]
+    # row sums in index order, exactly as _centrality_scores adds them up
+    centrality = np.array([sum(row) for row in sim.tolist()], dtype=np.float64)
+    lam = config.mmr_lambda
+    if lam >= 1.0:
+        relevance = centrality
+    else:
+        top = centrality.max()
+        relevance = lam * (centrality / top if top > 0.0 else centrality)
+
+    selected: List[int] = []
+    is_selected = np.zeros(n, dtype=bool)
+    max_sim = np.full(n, -np.inf)
+
+    def take(i: int) -> None:
+        nonlocal max_sim
+        selected.append(i)
+        is_selected[i] = True
+        max_sim = np.maximum(max_sim, sim[:, i])
+
+    #pick extractive anchors
+    if config.prefer_extractive:
+        for i, flag in enumerate(is_extractive):
+            if not flag:
+                continue
+            if len(selected) >= k:
+                break
+            if max_sim[i] >= config.redundancy_threshold:
+                continue
+            take(i)
 
-    if not abstractive_text or not abstractive_text.strip():
-        return _dedupe_keep_order(extractive_summary)[:k]
+    #greedy MMR fill: relevance minus redundancy against what is already chosen
+    while len(selected) < k:
+        open_mask = ~is_selected & (max_sim < config.redundancy_threshold)
+        if not open_mask.any():
+            break
+        if lam >= 1.0:
+            score = relevance
+        else:
+            score = relevance - (1.0 - lam) * np.where(np.isfinite(max_sim), max_sim, 0.0)
+        score = np.where(open_mask, score, -np.inf)
+        take(int(np.argmax(score)))
+
+    #fallback
+    if len(selected) < k:
+        for i in sorted(range(n), key=lambda i: (-centrality[i], i)):
+            if len(selected) >= k:
+                break
+            if not is_selected[i]:
+                take(i)
 
-    candidates, is_extractive = _build_candidate_pool(extractive_summary, abstractive_text, config)
-    if not candidates:
-        return []
+    return selected[:k]
 
+
+def _select_candidates(
+    candidates: List[str],
+    is_extractive: List[bool],
+    k: int,
+    config: MergeConfig,
+    similarity: Callable[[], CondensedSimilarity],
+) -> List[str]:
+    
+    count("merge.candidates", len(candidates))
     if len(candidates) <= k:
         return candidates
 
-    vectors, _ = build_tfidf_vectors(candidates, extra_stopwords=extra_stopwords)
-    centrality = _centrality_scores(vectors)
+    if config.strategy == "mmr":
+        sim_arr = similarity().to_array()
+        return [candidates[i] for i in _select_mmr(sim_arr, is_extractive, k, config)]
+    if config.strategy != "threshold":
+        raise ValueError(f"Unknown merge strategy: {config.strategy!r} (expected one of {MERGE_STRATEGIES})")
+
+    sim = similarity()
+    centrality = sim.row_sums()
+    pair_sim = sim.get
 
     selected: List[int] = []
+    selected_set: Set[int] = set()
+
+    def take(i: int) -> None:
+        selected.append(i)
+        selected_set.add(i)
 
     def is_redundant(i: int) -> bool:
         for j in selected:
-            if _cosine_sparse(vectors[i], vectors[j]) >= config.redundancy_threshold:
+            if pair_sim(i, j) >= config.redundancy_threshold:
                 return True
         return False
 
@@ -141,26 +244,141 @@ def merge_summaries(
                 break
             if is_redundant(i):
                 continue
-            selected.append(i)
+            take(i)
 
     #fill remaining slots by centrality rank
-    ranked = sorted(range(len(candidates)), key=lambda i: (-centrality[i], i))
+    ranked = _RankedCandidates(centrality)
     for i in ranked:
         if len(selected) >= k:
             break
-        if i in selected:
+        if i in selected_set:
             continue
         if is_redundant(i):
             continue
-        selected.append(i)
+        take(i)
 
     #fallback
     if len(selected) < k:
         for i in ranked:
             if len(selected) >= k:
                 break
-            if i in selected:
+            if i in selected_set:
                 continue
-            selected.append(i)
+            take(i)
+
+    return [candidates[i] for i in selected[:k]]
 
-    return [candidates[i] for i in selected[:k]]
\ No newline at end of file
+
+def merge_summaries(
+    extractive_summary: List[str],
+    abstractive_text: Optional[str],
+    k: int,
+    config: MergeConfig = MergeConfig(),
+    extra_stopwords: Optional[List[str]] = None,
+    artifact: Optional[ExtractiveArtifact] = None,
+) -> List[str]:
+    
+    with stage("merge"):
+        if k <= 0:
+            return []
+
+        if not abstractive_text or not abstractive_text.strip():
+            return _dedupe_keep_order(extractive_summary)[:k]
+
+        candidates, is_extractive = _build_candidate_pool(extractive_summary, abstractive_text, config)
+        if not candidates:
+            return []
+
+        return _select_candidates(
+            candidates,
+            is_extractive,
+            k,
+            config,
+            lambda: _candidate_similarity(candidates, config, extra_stopwords, artifact),
+        )
+
+
+class IncrementalMerge:
+    
+    # Candidate pool for abstractive sentences that arrive one at a time (a
+    # streamed completion). result() can be called at any point and selects
+    # exactly as merge_summaries would over the sentences received so far.
+    # With an artifact, similarities are fixed per pair, so each sentence is
+    # scored against the pool when it arrives and result() only selects.
+
+    def __init__(
+        self,
+        extractive_summary: List[str],
+        k: int,
+        config: MergeConfig = MergeConfig(),
+        extra_stopwords: Optional[List[str]] = None,
+        artifact: Optional[ExtractiveArtifact] = None,
+    ) -> None:
+        self.k = k
+        self.config = config
+        self.extra_stopwords = extra_stopwords
+        self.artifact = artifact
+        self.candidates: List[str] = []
+        self.is_extractive: List[bool] = []
+        self._abstractive_seen: Set[str] = set()
+        self._vectors: List[Tuple[dict[str, float], float, Optional[int]]] = []
+        self._columns: List[array] = []
+        for s in _dedupe_keep_order(extractive_summary):
+            self._append(s, True)
+        self._existing = set(self.candidates)
+
+    def _append(self, sentence: str, extractive: bool) -> None:
+        self.candidates.append(sentence)
+        self.is_extractive.append(extractive)
+        if self.artifact is None:
+            return
+        idx = self.artifact.index_of(sentence)
+        if idx is None:
+            vec, norm = self.artifact.vectorize(sentence)
+        else:
+            vec, norm = self.artifact.vectors[idx], self.artifact.norms[idx]
+        column = array("d")
+        for va, na, ia in self._vectors:
+            if ia is not None and idx is not None:
+                column.append(self.artifact.similarity(ia, idx))
+            else:
+                column.append(cosine_with_norms(va, na, vec, norm))
+        self._columns.append(column)
+        self._vectors.append((vec, norm, idx))
+
+    def add(self, sentence: str) -> bool:
+
+        # same dedupe / cap / anchor rules as _build_candidate_pool
+        sentence = (sentence or "").strip()
+        if not sentence or sentence in self._abstractive_seen:
+            return False
+        self._abstractive_seen.add(sentence)
+        if len(self._abstractive_seen) > self.config.max_abstractive_sentences:
+            return False
+        if sentence in self._existing:
+            return False
+        self._existing.add(sentence)
+        self._append(sentence, False)
+        return True
+
+    def _similarity(self) -> CondensedSimilarity:
+        if self.artifact is None:
+            return _candidate_similarity(self.candidates, self.config, self.extra_stopwords, None)
+        n = len(self.candidates)
+        data = array("d")
+        for a in range(n):
+            for b in range(a + 1, n):
+                data.append(self._columns[b][a])
+        return CondensedSimilarity(n, data)
+
+    def result(self) -> List[str]:
+        with stage("merge"):
+            if self.k <= 0:
+                return []
+            if not self._abstractive_seen:
+                return self.candidates[: self.k]
+            if not self.candidates:
+                return []
+            return _select_candidates(
+                list(self.candidates), self.is_extractive, self.k, self.config, self._similarity
+            )
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    total_sec: float = 0.0
+    max_sec: float = 0.0
+
+
+class Collector:
+    # Per-request sink for stage timings and counters. Instrumented code
+    # finds it through a context variable, so concurrent requests (threads
+    # or asyncio tasks) each see their own collector.
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.calls += 1
+            stats.total_sec += seconds
+            if seconds > stats.max_sec:
+                stats.max_sec = seconds
+
+    def add(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {name: asdict(s) for name, s in sorted(self.stages.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "metis") -> str:
+        data = self.to_dict()
+        lines = []
+        for metric, field, kind, help_text in (
+            ("stage_seconds_total", "total_sec", "counter", "Time spent in each pipeline stage."),
+            ("stage_calls_total", "calls", "counter", "Number of times each pipeline stage ran."),
+            ("stage_max_seconds", "max_sec", "gauge", "Slowest single run of each pipeline stage."),
+        ):
+            name = f"{prefix}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage, stats in data["stages"].items():
+                lines.append(f'{name}{{stage="{stage}"}} {_format(stats[field])}')
+        for counter, value in data["counters"].items():
+            name = f"{prefix}_{_metric_name(counter)}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Union[str, Path], prefix: str = "metis") -> None:
+
+        # atomic replace, so a textfile collector never reads a half-written file
+        path = Path(path)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(tmp, path)
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+_COLLECTOR: ContextVar[Optional[Collector]] = ContextVar("metis_collector", default=None)
+
+
+class _Timer:
+    __slots__ = ("collector", "name", "start")
+
+    def __init__(self, collector: Collector, name: str) -> None:
+        self.collector = collector
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.collector.observe(self.name, time.perf_counter() - self.start)
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NOOP = _NoopTimer()
+
+
+def current_collector() -> Optional[Collector]:
+    return _COLLECTOR.get()
+
+
+def stage(name: str):
+    # with stage("merge"): ...  -- a shared no-op when nothing is collecting
+    collector = _COLLECTOR.get()
+    if collector is None:
+        return _NOOP
+    return _Timer(collector, name)
+
+
+def count(name: str, value: float = 1) -> None:
+    collector = _COLLECTOR.get()
+    if collector is not None:
+        collector.add(name, value)
+
+
+@contextmanager
+def collecting(collector: Optional[Collector] = None) -> Iterator[Collector]:
+    collector = collector if collector is not None else Collector()
+    token = _COLLECTOR.set(collector)
+    try:
+        yield collector
+    finally:
+        _COLLECTOR.reset(token)
@@ -1,5 +1,6 @@
 import re
-from typing import Iterable, List, Set
+from functools import lru_cache
+from typing import AbstractSet, FrozenSet, Iterable, Iterator, List, Set, Tuple
 
 
 _DEFAULT_STOPWORDS_FA: Set[str] = {
@@ -15,22 +16,23 @@ _DEFAULT_STOPWORDS_EN: Set[str] = {
 
 
 _PUNCT_RE = re.compile(r"[^\w\u0600-\u06FF]+", flags=re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+# A token is a maximal run of the characters _PUNCT_RE does not replace, so
+# one findall over the lowered text equals normalize_text(text).split().
+_TOKEN_RE = re.compile(r"[\w\u0600-\u06FF]+", flags=re.UNICODE)
 
 
 def normalize_text(text: str) -> str:
     
     text = text.strip().lower()
     text = _PUNCT_RE.sub(" ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _SPACE_RE.sub(" ", text).strip()
     return text
 
 
 def tokenize(text: str) -> List[str]:
     
-    text = normalize_text(text)
-    if not text:
-        return []
-    return text.split()
+    return _TOKEN_RE.findall(text.lower())
 
 
 def build_stopwords(extra_stopwords: Iterable[str] | None = None) -> Set[str]:
@@ -43,8 +45,35 @@ def build_stopwords(extra_stopwords: Iterable[str] | None = None) -> Set[str]:
     return sw
 
 
-def filter_tokens(tokens: List[str], stopwords: Set[str] | None = None) -> List[str]:
+@lru_cache(maxsize=64)
+def _frozen_stopwords(extra: Tuple[str, ...]) -> FrozenSet[str]:
+    return frozenset(build_stopwords(extra))
+
+
+def stopwords_for(extra_stopwords: Iterable[str] | None = None) -> FrozenSet[str]:
+    
+    return _frozen_stopwords(tuple(extra_stopwords) if extra_stopwords else ())
+
+
+def filter_tokens(tokens: List[str], stopwords: AbstractSet[str] | None = None) -> List[str]:
     
     if stopwords is None:
-        stopwords = build_stopwords()
+        stopwords = stopwords_for()
     return [t for t in tokens if t not in stopwords and len(t) > 1]
+
+
+def iter_tokens(text: str, stopwords: AbstractSet[str] | None = None) -> Iterator[str]:
+    
+    if stopwords is None:
+        stopwords = stopwords_for()
+    for m in _TOKEN_RE.finditer(text.lower()):
+        t = m.group()
+        if len(t) > 1 and t not in stopwords:
+            yield t
+
+
+def tokenize_filtered(text: str, stopwords: AbstractSet[str] | None = None) -> List[str]:
+    
+    if stopwords is None:
+        stopwords = stopwords_for()
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in stopwords]
@@ -1,15 +1,106 @@
+import codecs
 import re
-from typing import List
+from typing import IO, Iterable, Iterator, List, Tuple, Union
+
+from src.utils.instrumentation import stage
 
 
 _SENT_SPLIT_RE = re.compile(r"(?:\r?\n)+|[.!؟?؛;]+")
 
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+TextSource = Union[str, bytes, IO[str], IO[bytes], Iterable[str], Iterable[bytes]]
+
 
 def split_sentences(text: str) -> List[str]:
     
-    if not text or not text.strip():
-        return []
+    with stage("split"):
+        if not text or not text.strip():
+            return []
+
+        parts = _SENT_SPLIT_RE.split(text)
+        sentences = [p.strip() for p in parts if p and p.strip()]
+        return sentences
+
+
+def iter_sentence_spans(text: str) -> Iterator[Tuple[int, int]]:
+    
+    # (start, end) offsets into text of exactly the sentences split_sentences returns
+    start = 0
+    for m in _SENT_SPLIT_RE.finditer(text):
+        yield from _stripped_span(text, start, m.start())
+        start = m.end()
+    yield from _stripped_span(text, start, len(text))
+
+
+def sentence_prefix(text: str, n: int) -> str:
+    
+    # the first n sentences of text as written, each keeping its own terminator
+    if n <= 0:
+        return ""
+    end = 0
+    for i, (_, end) in enumerate(iter_sentence_spans(text), 1):
+        if i == n:
+            break
+    boundary = _SENT_SPLIT_RE.match(text, end)
+    if boundary is not None:
+        end = boundary.end()
+    return text[:end].strip()
+
+
+def _stripped_span(text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    part = text[start:end]
+    stripped = part.strip()
+    if stripped:
+        lead = len(part) - len(part.lstrip())
+        yield start + lead, start + lead + len(stripped)
+
+
+def _iter_chunks(source: TextSource, chunk_size: int) -> Iterator[Union[str, bytes]]:
+    if isinstance(source, (str, bytes)):
+        yield source
+        return
+    read = getattr(source, "read", None)
+    if read is not None:
+        while True:
+            chunk = read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def iter_sentences(
+    source: TextSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[str]:
+    
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    # Text since the last boundary, kept as pieces and joined only once its
+    # sentence ends, so each chunk is scanned once: no rescans, no regrowing.
+    head: List[str] = []
+    for chunk in _iter_chunks(source, chunk_size):
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        if not chunk:
+            continue
+        if head and head[-1].endswith("\r"):
+            # the one boundary prefix that is not a boundary itself: a "\r"
+            # waiting for the "\n" that may start this chunk
+            head[-1] = head[-1][:-1]
+            chunk = "\r" + chunk
+
+        start = 0
+        for m in _SENT_SPLIT_RE.finditer(chunk):
+            head.append(chunk[start:m.start()])
+            part = "".join(head).strip()
+            head = []
+            if part:
+                yield part
+            start = m.end()
+        head.append(chunk[start:])
 
-    parts = _SENT_SPLIT_RE.split(text)
-    sentences = [p.strip() for p in parts if p and p.strip()]
-    return sentences
+    pending = "".join(head) + decoder.decode(b"", final=True)
+    yield from split_sentences(pending)
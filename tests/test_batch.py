@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+import src.extractive.batch as batch_module
+from src.extractive.batch import BATCH_CONFIG, corpus_idf, summarize_batch, tokenize_corpus
+from src.extractive.idf_model import IdfModel
+from src.extractive.textrank import TextRankConfig, summarize_tokens, textrank_summarize
+from src.utils.text_splitter import split_sentences
+
+
+TEXTS = [
+    (
+        "Artificial intelligence is transforming medicine. "
+        "Machine learning models help doctors detect diseases early. "
+        "Early diagnosis improves treatment outcomes. "
+        "Today it is raining and traffic is heavy."
+    ),
+    (
+        "Renewable energy sources like solar and wind reduce carbon emissions. "
+        "Energy storage is important for balancing supply and demand. "
+        "Grid modernization improves reliability. "
+        "Some people also enjoy hiking on weekends."
+    ),
+    "",
+    "Only one sentence here.",
+]
+
+
+def test_summarize_batch_matches_per_document_textrank():
+    results = summarize_batch(TEXTS, k=2)
+    assert len(results) == len(TEXTS)
+    for text, (summary, scores) in zip(TEXTS, results):
+        expected_summary, expected_scores = textrank_summarize(split_sentences(text), k=2)
+        assert summary == expected_summary
+        assert scores == pytest.approx(expected_scores, abs=1e-12)
+
+
+def test_corpus_idf_counts_sentences_across_documents():
+    _, corpus_tokens = tokenize_corpus(TEXTS)
+    idf = corpus_idf(corpus_tokens)
+    # "energy" appears in two sentences, "hiking" in one
+    assert idf["energy"] < idf["hiking"]
+
+    results = summarize_batch(TEXTS, k=2, use_corpus_idf=True)
+    assert [len(summary) for summary, _ in results] == [2, 2, 0, 1]
+
+
+def _corpus(seed):
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(40)] + ["the", "a", "x"]
+    texts = []
+    for _ in range(rng.randint(5, 25)):
+        n = rng.choice([0, 1, 2, 3, 5, 8, 13, 30])
+        texts.append(" ".join(" ".join(rng.choices(vocab, k=rng.randint(1, 10))) + "." for _ in range(n)))
+    return texts
+
+
+def _looped(texts, k, config, idf=None, use_corpus_idf=False):
+    corpus_sentences, corpus_tokens = tokenize_corpus(texts)
+    if idf is None and use_corpus_idf:
+        idf = corpus_idf(corpus_tokens)
+    return [summarize_tokens(s, t, k, config=config, idf=idf) for s, t in zip(corpus_sentences, corpus_tokens)]
+
+
+def _assert_same(results, expected):
+    assert len(results) == len(expected)
+    for (summary, scores), (expected_summary, expected_scores) in zip(results, expected):
+        assert summary == expected_summary
+        assert scores == pytest.approx(expected_scores, abs=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_stacked_batch_matches_per_document_ranking(seed):
+    texts = _corpus(seed)
+    _assert_same(summarize_batch(texts, k=3), _looped(texts, 3, BATCH_CONFIG))
+    _assert_same(
+        summarize_batch(texts, k=2, use_corpus_idf=True),
+        _looped(texts, 2, BATCH_CONFIG, use_corpus_idf=True),
+    )
+
+    # an external table drops the terms it does not hold
+    idf = {f"term{i}": 1.0 + i / 10 for i in range(0, 40, 2)}
+    _assert_same(summarize_batch(texts, k=3, idf=idf), _looped(texts, 3, BATCH_CONFIG, idf=idf))
+    # while an IdfModel weighs unseen terms instead
+    model = IdfModel.fit(tokenize_corpus(texts[:2])[1][0] + [["term1", "term2"]])
+    _assert_same(summarize_batch(texts, k=3, idf=model), _looped(texts, 3, BATCH_CONFIG, idf=model))
+
+    config = TextRankConfig(similarity_backend="sparse", solver="matrix", edge_threshold=0.1, eps=1e-9)
+    _assert_same(summarize_batch(texts, k=4, config=config), _looped(texts, 4, config))
+
+
+def test_stacked_batch_splits_chunks_and_oversized_documents(monkeypatch):
+    # a tiny block budget puts every document in its own chunk and sends the
+    # larger ones through the blocked sparse Gram
+    monkeypatch.setattr(batch_module, "_BLOCK_CELLS", 64)
+    texts = _corpus(3)
+    _assert_same(summarize_batch(texts, k=3), _looped(texts, 3, BATCH_CONFIG))
@@ -0,0 +1,53 @@
+import json
+
+from benchmarks.suite import find_regressions, main, percentile, run_suite, synthetic_document, to_json
+from src.utils.text_splitter import split_sentences
+
+
+def test_synthetic_documents_have_requested_size():
+    for language in ("en", "fa"):
+        text = synthetic_document(25, language)
+        assert len(split_sentences(text)) == 25
+        assert text == synthetic_document(25, language)
+
+
+def test_percentile_nearest_rank():
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(samples, 50) == 3.0
+    assert percentile(samples, 95) == 5.0
+    assert percentile(samples, 0) == 1.0
+
+
+def test_suite_runs_including_llm_stub_and_skips_quadratic_cases():
+    results = run_suite(
+        sizes=[10, 3000],
+        languages=["fa"],
+        cases=["split_sentences", "cosine_similarity_matrix", "llm_stub"],
+        min_repeat=2,
+        max_repeat=2,
+    )
+    keys = [r.key for r in results]
+    assert keys == [
+        "split_sentences/fa/10",
+        "cosine_similarity_matrix/fa/10",
+        "llm_stub/fa/10",
+        "split_sentences/fa/3000",
+    ]
+    assert all(r.samples == 2 and r.p95_ms >= r.p50_ms > 0 for r in results)
+    assert json.loads(json.dumps(to_json(results)))["results"][0]["case"] == "split_sentences"
+
+
+def test_regressions_are_reported_against_baseline(tmp_path):
+    results = run_suite(sizes=[10], languages=["en"], cases=["tokenize"], min_repeat=1, max_repeat=1)
+    baseline = to_json(results)
+    assert find_regressions(results, baseline, max_regression_pct=20) == []
+
+    baseline["results"][0]["p50_ms"] = results[0].p50_ms / 2
+    assert len(find_regressions(results, baseline, max_regression_pct=20)) == 1
+
+    path = tmp_path / "baseline.json"
+    baseline["results"][0]["p50_ms"] = 1e-9
+    path.write_text(json.dumps(baseline), encoding="utf-8")
+    args = ["--sizes", "10", "--languages", "en", "--cases", "tokenize", "--min-repeat", "1", "--max-repeat", "1"]
+    assert main(args + ["--baseline", str(path)]) == 1
+    assert main(args + ["--baseline", str(path), "--max-regression", "1e12"]) == 0
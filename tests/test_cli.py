@@ -0,0 +1,35 @@
+import json
+
+from src.cli import main
+from src.extractive.textrank import textrank_summarize
+from src.utils.text_splitter import split_sentences
+
+
+TEXT = (
+    "Artificial intelligence is transforming medicine. "
+    "Machine learning models help doctors detect diseases early. "
+    "Early diagnosis improves treatment outcomes. "
+    "Today it is raining and traffic is heavy."
+)
+
+
+def test_cli_summarizes_text_and_jsonl_inputs(tmp_path, capsys):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "article.txt").write_text(TEXT, encoding="utf-8")
+    (docs / "empty.txt").write_text("", encoding="utf-8")
+    rows = [{"id": "n1", "text": TEXT}, {"text": "تشخیص بیماری مهم است. درمان زودهنگام بهتر است."}]
+    (docs / "feed.jsonl").write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in rows), encoding="utf-8")
+    out_path = tmp_path / "out.jsonl"
+
+    main([str(docs), "--k", "2", "--chunk-size", "7", "-o", str(out_path)])
+
+    records = [json.loads(line) for line in out_path.read_text(encoding="utf-8").splitlines()]
+    expected = " ".join(textrank_summarize(split_sentences(TEXT), k=2)[0])
+    assert [r["id"] for r in records] == ["article", "empty", "n1", "feed.jsonl:2"]
+    assert records[0]["summary"] == expected
+    assert records[1]["summary"] == ""
+    assert records[2]["summary"] == expected
+    assert all(r["mode"] == "textrank" for r in records)
+
+    assert "4 docs" in capsys.readouterr().err
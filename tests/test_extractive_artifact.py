@@ -0,0 +1,128 @@
+import math
+import random
+from array import array
+from collections import Counter
+
+import pytest
+
+import src.merge.merge_engine as merge_module
+from src.extractive.similarity import _idf, build_tfidf_vectors, cosine_similarity_matrix, tokenize_sentences
+from src.extractive.similarity_kernel import CondensedSimilarity, smoothed_idf
+from src.extractive.textrank import TextRankConfig, textrank_extract, textrank_summarize
+from src.merge.merge_engine import MergeConfig, merge_summaries
+from src.utils.preprocessing import stopwords_for, tokenize_filtered
+
+
+SENTENCES = [
+    "Artificial intelligence is transforming medicine.",
+    "Machine learning models help doctors detect diseases early.",
+    "Early diagnosis improves treatment outcomes.",
+    "Doctors rely on machine learning for diagnosis.",
+    "Today it is raining and traffic is heavy.",
+]
+
+
+@pytest.mark.parametrize(
+    "config",
+    [TextRankConfig(), TextRankConfig(solver="matrix"), TextRankConfig(graph="sparse")],
+)
+def test_extract_matches_textrank_summarize(config):
+    summary, scores, artifact = textrank_extract(SENTENCES, k=2, config=config)
+    expected_summary, expected_scores = textrank_summarize(SENTENCES, k=2, config=config)
+
+    assert summary == expected_summary
+    assert scores == pytest.approx(expected_scores, abs=1e-12)
+    assert [SENTENCES[i] for i in artifact.selected] == summary
+
+
+def test_artifact_similarities_match_document_matrix():
+    _, _, artifact = textrank_extract(SENTENCES, k=2)
+    vectors, _ = build_tfidf_vectors(SENTENCES)
+    sim = cosine_similarity_matrix(vectors)
+
+    for i in range(len(SENTENCES)):
+        for j in range(i + 1, len(SENTENCES)):
+            assert artifact.similarity(i, j) == pytest.approx(sim[i][j], abs=1e-12)
+            assert artifact.similarity(j, i) == artifact.similarity(i, j)
+
+
+def test_merge_with_artifact_only_vectorizes_new_sentences(monkeypatch):
+    summary, _, artifact = textrank_extract(SENTENCES, k=2)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("candidate pool should not be re-vectorized")
+
+    monkeypatch.setattr(merge_module, "build_tfidf_vectors", _fail)
+
+    vectorized = []
+    real_vectorize = artifact.vectorize
+
+    def _tracking_vectorize(sentence):
+        vectorized.append(sentence)
+        return real_vectorize(sentence)
+
+    monkeypatch.setattr(artifact, "vectorize", _tracking_vectorize)
+
+    abstractive = "AI helps physicians spot illness sooner. Quantum telescopes observe galaxies."
+    out = merge_summaries(summary, abstractive, k=3, artifact=artifact)
+
+    assert len(out) == 3
+    assert summary[0] in out
+    assert sorted(vectorized) == sorted(
+        ["AI helps physicians spot illness sooner", "Quantum telescopes observe galaxies"]
+    )
+
+
+def test_artifact_is_seeded_with_selected_pair_similarities():
+    _, _, artifact = textrank_extract(SENTENCES, k=3)
+    selected = sorted(artifact.selected)
+    assert set(artifact.pair_sims) == {
+        (i, j) for a, i in enumerate(selected) for j in selected[a + 1 :]
+    }
+
+    vectors, _ = build_tfidf_vectors(SENTENCES)
+    sim = cosine_similarity_matrix(vectors)
+    for (i, j), value in artifact.pair_sims.items():
+        assert value == pytest.approx(sim[i][j], abs=1e-12)
+
+
+def _document_space_merge(document, summary, abstractive, k):
+    # from-scratch reference: every candidate is weighted by the document's
+    # IDF, terms the document never used at the df=0 smoothed weight
+    stopwords = stopwords_for()
+    idf = _idf(tokenize_sentences(document, stopwords))
+    config = MergeConfig()
+    candidates, is_extractive = merge_module._build_candidate_pool(summary, abstractive, config)
+    vectors = []
+    for c in candidates:
+        tf = Counter(tokenize_filtered(c, stopwords))
+        vectors.append({t: f * idf.get(t, smoothed_idf(len(document))) for t, f in tf.items()})
+
+    data = array("d")
+    for a in range(len(vectors)):
+        for b in range(a + 1, len(vectors)):
+            dot = sum(w * vectors[b].get(t, 0.0) for t, w in vectors[a].items())
+            norm_a = math.sqrt(sum(w * w for w in vectors[a].values()))
+            norm_b = math.sqrt(sum(w * w for w in vectors[b].values()))
+            data.append(dot / (norm_a * norm_b) if norm_a and norm_b else 0.0)
+    sim = CondensedSimilarity(len(vectors), data)
+    return merge_module._select_candidates(candidates, is_extractive, k, config, lambda: sim)
+
+
+def test_merge_with_artifact_scores_the_pool_in_document_space():
+    # With an artifact, candidates are compared under the whole document's
+    # IDF; without one, the IDF is fitted to the candidate pool alone. The two
+    # can pick different sentences, and the artifact result is the one pinned.
+    vocab = [f"topic{i}" for i in range(25)]
+    differs = 0
+    for seed in range(100):
+        rng = random.Random(seed)
+        document = [" ".join(rng.choices(vocab, k=rng.randint(3, 8))) + "." for _ in range(rng.randint(6, 14))]
+        abstractive = " ".join(" ".join(rng.choices(vocab, k=rng.randint(3, 8))) + "." for _ in range(3))
+        summary, _, artifact = textrank_extract(document, k=3)
+
+        with_artifact = merge_summaries(summary, abstractive, k=4, artifact=artifact)
+        assert with_artifact == _document_space_merge(document, summary, abstractive, k=4)
+        differs += with_artifact != merge_summaries(summary, abstractive, k=4)
+
+    assert differs > 0
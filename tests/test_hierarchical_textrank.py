@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from benchmarks.suite import synthetic_document
+from src.cli import main
+from src.eval.runner import compare_hierarchical
+from src.extractive.hierarchical import (
+    HierarchicalConfig,
+    hierarchical_summarize,
+    hierarchical_textrank,
+    paragraph_sections,
+    window_sections,
+)
+from src.extractive.textrank import textrank_summarize
+from src.utils.text_splitter import split_sentences
+
+
+def test_window_sections():
+    sections = list(window_sections(iter(str(i) for i in range(7)), 3))
+    assert sections == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+
+
+def test_paragraph_sections_keep_paragraphs_together():
+    text = "A one. A two.\n\nB one. B two. B three.\n  \nC one.\n\nD1. D2. D3. D4. D5."
+    sections = list(paragraph_sections(text, 4))
+    assert sections == [
+        ["A one", "A two"],
+        ["B one", "B two", "B three", "C one"],
+        ["D1", "D2", "D3", "D4"],
+        ["D5"],
+    ]
+
+
+def test_single_section_matches_flat_textrank():
+    text = synthetic_document(60, "en", seed=3)
+    sentences = split_sentences(text)
+    config = HierarchicalConfig(section_size=100, section_k=60)
+    result = hierarchical_textrank(text, k=5, config=config)
+    assert result.sections == 1
+    assert result.summary == textrank_summarize(sentences, k=5)[0]
+
+
+def test_sections_feed_a_final_pass_in_document_order():
+    text = synthetic_document(230, "fa", seed=1)
+    sentences = split_sentences(text)
+    result = hierarchical_textrank(text, k=6, config=HierarchicalConfig(section_size=50, section_k=2))
+    assert result.sections == 5
+    assert len(result.winners) == 10
+    assert len(result.summary) == 6
+    positions = [sentences.index(s) for s in result.summary]
+    assert positions == sorted(positions)
+    assert set(result.summary) <= set(result.winners)
+
+
+def test_parallel_sections_match_sequential():
+    sections = list(window_sections(split_sentences(synthetic_document(120, "en", seed=2)), 40))
+    sequential = hierarchical_summarize(sections, k=4, config=HierarchicalConfig(section_k=2))
+    parallel = hierarchical_summarize(sections, k=4, config=HierarchicalConfig(section_k=2, workers=2))
+    assert parallel == sequential
+
+
+@pytest.mark.parametrize(
+    "config",
+    [HierarchicalConfig(section_size=0), HierarchicalConfig(section_k=0), HierarchicalConfig(sectioning="chapter")],
+)
+def test_invalid_config_raises(config):
+    with pytest.raises(ValueError):
+        hierarchical_textrank("A. B. C.", k=1, config=config)
+
+
+def test_compare_hierarchical_reports_quality_for_both_modes():
+    results = compare_hierarchical(synthetic_document(150, "en"), k=5, config=HierarchicalConfig(section_size=50))
+    assert set(results) == {"flat", "hierarchical"}
+    for r in results.values():
+        assert r.words > 0 and r.runtime_sec >= 0
+        assert 0.0 <= r.coverage <= 1.0 and 0.0 <= r.redundancy <= 1.0
+
+
+def test_cli_hierarchical_mode(tmp_path, capsys):
+    doc = tmp_path / "book.txt"
+    doc.write_text(synthetic_document(90, "en"), encoding="utf-8")
+    main([str(doc), "--k", "3", "--section-size", "30", "--chunk-size", "64"])
+    main([str(doc), "--k", "3", "--section-size", "30", "--sectioning", "paragraph"])
+
+    streamed, whole = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    config = HierarchicalConfig(section_size=30)
+    expected = " ".join(hierarchical_textrank(doc.read_text(encoding="utf-8"), k=3, config=config).summary)
+    assert streamed["summary"] == expected
+    assert whole["summary"] == expected
@@ -0,0 +1,71 @@
+import time
+
+import src.merge.hybrid_pipeline as hybrid_module
+from src.merge.hybrid_pipeline import HybridPipeline
+from src.merge.merge_engine import merge_summaries
+
+
+TEXT = (
+    "Artificial intelligence is transforming medicine. "
+    "Machine learning models help doctors detect diseases early. "
+    "Early diagnosis improves treatment outcomes. "
+    "Today it is raining and traffic is heavy."
+)
+
+
+class _SlowSummarizer:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def summarize(self, text: str, target_sentences: int = 5) -> str:
+        time.sleep(self.delay)
+        return "AI helps doctors find diseases early. Early treatment works better."
+
+
+def test_pipeline_matches_sequential_hybrid():
+    with HybridPipeline(summarizer=_SlowSummarizer(0.0), k_extractive=2, k_final=3) as pipeline:
+        result = pipeline.run(TEXT)
+
+    expected = merge_summaries(result.extractive_summary, result.abstractive_text, k=3)
+    assert result.final_summary == expected
+    assert set(result.timings) == {"split", "textrank", "llm", "llm_wait", "merge", "total"}
+
+
+def test_pipeline_overlaps_llm_and_textrank(monkeypatch):
+    real_textrank = hybrid_module.textrank_summarize
+
+    def _slow_textrank(*args, **kwargs):
+        time.sleep(0.2)
+        return real_textrank(*args, **kwargs)
+
+    monkeypatch.setattr(hybrid_module, "textrank_summarize", _slow_textrank)
+
+    with HybridPipeline(summarizer=_SlowSummarizer(0.2), k_extractive=2, k_final=3) as pipeline:
+        result = pipeline.run(TEXT)
+
+    # max(0.2, 0.2) + merge rather than 0.2 + 0.2 + merge
+    assert result.timings["total"] < 0.35
+    assert result.timings["llm"] >= 0.2
+    assert result.timings["textrank"] >= 0.2
+
+
+def test_artifact_is_only_built_when_reused(monkeypatch):
+    built = []
+    real_extract = hybrid_module.textrank_extract
+
+    def _tracking_extract(*args, **kwargs):
+        built.append(1)
+        return real_extract(*args, **kwargs)
+
+    monkeypatch.setattr(hybrid_module, "textrank_extract", _tracking_extract)
+
+    with HybridPipeline(summarizer=_SlowSummarizer(0.0), k_extractive=2, k_final=3) as pipeline:
+        plain = pipeline.run(TEXT)
+    assert built == []
+
+    with HybridPipeline(
+        summarizer=_SlowSummarizer(0.0), k_extractive=2, k_final=3, reuse_extractive_vectors=True
+    ) as pipeline:
+        reused = pipeline.run(TEXT)
+    assert built == [1]
+    assert reused.extractive_summary == plain.extractive_summary
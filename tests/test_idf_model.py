@@ -0,0 +1,87 @@
+import json
+import pickle
+
+import pytest
+
+from src.cli import main
+from src.extractive.batch import corpus_idf, tokenize_corpus
+from src.extractive.idf_model import IdfModel
+from src.extractive.sentence_table import SentenceTable
+from src.extractive.similarity import build_tfidf_vectors, smoothed_idf
+from src.extractive.sparse_similarity import tfidf_matrix_from_tokens
+from src.extractive.textrank import textrank_summarize_stream
+from src.utils.text_splitter import split_sentences
+
+
+CORPUS = [
+    "The central bank raised interest rates. Markets fell after the announcement.",
+    "Heavy rain flooded the river valley. Farmers counted the damage.",
+    "بانک مرکزی نرخ بهره را افزایش داد. بازارها سقوط کردند.",
+]
+
+
+def test_fit_matches_corpus_idf_in_float32():
+    model = IdfModel.fit_texts(CORPUS)
+    expected = corpus_idf(tokenize_corpus(CORPUS)[1])
+    assert sorted(model) == sorted(expected)
+    assert model.n_docs == 6
+    for term, weight in expected.items():
+        assert model[term] == pytest.approx(weight, rel=1e-6)
+
+
+def test_saved_model_is_memory_mapped_and_round_trips(tmp_path):
+    path = tmp_path / "corpus.idf"
+    fitted = IdfModel.fit_texts(CORPUS)
+    fitted.save(path)
+
+    model = IdfModel.load(path)
+    assert dict(model) == dict(fitted)
+    assert model.path == path
+
+    clone = pickle.loads(pickle.dumps(model))
+    assert clone.path == path and dict(clone) == dict(model)
+    clone.close()
+    model.close()
+
+
+def test_unseen_terms_get_smoothed_weight():
+    model = IdfModel.fit([["bank", "rates"], ["rain"], ["bank"]])
+    assert "never-seen" not in model and not model.known("never-seen")
+    assert model.get("never-seen") is None and model.get("never-seen", 0.5) == 0.5
+    assert model.get("bank", 0.5) == model["bank"]
+    with pytest.raises(KeyError):
+        model["never-seen"]
+    assert model.unseen_weight == smoothed_idf(3, 0)
+    vectors, _ = build_tfidf_vectors(["bank bank unknownterm"], idf=model)
+    assert vectors[0] == {"bank": pytest.approx(2 * smoothed_idf(3, 2), rel=1e-6), "unknownterm": smoothed_idf(3, 0)}
+
+    tokens = [["bank", "bank", "unknownterm"]]
+    expected = sorted([vectors[0]["bank"], vectors[0]["unknownterm"]])
+    assert sorted(tfidf_matrix_from_tokens(tokens, idf=model).data) == pytest.approx(expected)
+    assert sorted(SentenceTable.from_tokens(tokens, idf=model).weights) == pytest.approx(expected)
+
+
+def test_min_df_prunes_rare_terms():
+    model = IdfModel.fit([["a", "b"], ["a"], ["c"]], min_df=2)
+    assert list(model) == ["a"]
+
+
+def test_bad_file_is_rejected(tmp_path):
+    path = tmp_path / "bogus.idf"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        IdfModel.load(path)
+
+
+def test_cli_uses_idf_model(tmp_path, capsys):
+    model_path = tmp_path / "corpus.idf"
+    model = IdfModel.fit_texts(CORPUS)
+    model.save(model_path)
+    doc = tmp_path / "doc.txt"
+    doc.write_text(CORPUS[0] + " " + CORPUS[1], encoding="utf-8")
+
+    main([str(doc), "--k", "2", "--idf", str(model_path)])
+
+    record = json.loads(capsys.readouterr().out)
+    sentences = split_sentences(doc.read_text(encoding="utf-8"))
+    assert record["summary"] == " ".join(textrank_summarize_stream(sentences, k=2, idf=model)[0])
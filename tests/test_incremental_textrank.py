@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from src.extractive.incremental import IncrementalTextRank
+from src.extractive.similarity import _idf, tokenize_sentences
+from src.extractive.textrank import TextRankConfig, summarize_tokens, textrank_summarize
+from src.utils.preprocessing import stopwords_for
+
+
+CONFIG = TextRankConfig(max_iter=500, eps=1e-12)
+
+
+def _transcript(n: int, seed: int = 3):
+    rng = random.Random(seed)
+    vocab = [f"topic{i}" for i in range(60)]
+    return [" ".join(rng.choices(vocab, k=rng.randint(3, 9))) for _ in range(n)]
+
+
+def test_fixed_idf_updates_match_from_scratch():
+    sentences = _transcript(60)
+    tokens = tokenize_sentences(sentences, stopwords_for())
+    idf = _idf(tokens)
+
+    inc = IncrementalTextRank(config=CONFIG, idf=idf)
+    for start in range(0, 60, 15):
+        batch = sentences[start : start + 15]
+        existing = len(inc)
+        inc.extend(batch)
+        assert inc.last_pairs_compared <= len(batch) * (existing + len(batch))
+
+        seen = sentences[: start + 15]
+        expected = summarize_tokens(seen, tokens[: start + 15], k=5, config=CONFIG, idf=idf)
+        summary, scores = inc.summary(5)
+        assert summary == expected[0]
+        assert scores == pytest.approx(expected[1], abs=1e-9)
+
+
+@pytest.mark.parametrize("solver", ["loop", "matrix"])
+def test_document_idf_matches_after_rebuild(solver):
+    config = TextRankConfig(max_iter=500, eps=1e-12, solver=solver)
+    sentences = _transcript(40)
+
+    # rebuild_growth=0 rebuilds on every update, so each update is exact
+    inc = IncrementalTextRank(config=config, rebuild_growth=0.0)
+    for s in sentences[:20]:
+        inc.append(s)
+    expected = textrank_summarize(sentences[:20], k=4, config=config)
+    assert inc.summary(4)[0] == expected[0]
+    assert inc.summary(4)[1] == pytest.approx(expected[1], abs=1e-9)
+
+    lazy = IncrementalTextRank(config=config, rebuild_growth=10.0)
+    lazy.extend(sentences[:20])
+    lazy.extend(sentences[20:])
+    lazy.refresh()
+    expected = textrank_summarize(sentences, k=4, config=config)
+    assert lazy.summary(4)[0] == expected[0]
+    assert lazy.summary(4)[1] == pytest.approx(expected[1], abs=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_document_idf_default_is_exact(seed):
+    rng = random.Random(seed)
+    sentences = _transcript(rng.randint(20, 60), seed=seed)
+
+    inc = IncrementalTextRank(config=CONFIG)
+    start = 0
+    while start < len(sentences):
+        stop = start + rng.randint(1, 8)
+        inc.extend(sentences[start:stop])
+        start = stop
+        expected = textrank_summarize(sentences[:start], k=5, config=CONFIG)
+        summary, scores = inc.summary(5)
+        assert summary == expected[0]
+        assert scores == pytest.approx(expected[1], abs=1e-9)
+
+
+def test_warm_start_needs_fewer_iterations():
+    sentences = _transcript(200)
+    idf = _idf(tokenize_sentences(sentences, stopwords_for()))
+    inc = IncrementalTextRank(config=TextRankConfig(max_iter=500, eps=1e-8), idf=idf)
+
+    inc.extend(sentences[:199])
+    cold = inc.last_iterations
+    inc.append(sentences[199])
+    assert inc.last_iterations < cold
+
+
+def test_edge_cases():
+    inc = IncrementalTextRank()
+    assert inc.summary(3) == ([], [])
+    inc.extend([])
+    inc.append("only sentence here")
+    assert inc.summary(3) == (["only sentence here"], [1.0])
+    with pytest.raises(ValueError):
+        IncrementalTextRank(config=TextRankConfig(top_k_neighbors=3))
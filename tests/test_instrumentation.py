@@ -0,0 +1,117 @@
+import json
+import threading
+
+from src.abstractive.llm_summarizer import MetisLLMSummarizer
+from src.cli import main
+from src.eval.metrics import coverage_score, redundancy_score
+from src.extractive.textrank import TextRankConfig, textrank_summarize
+from src.merge.hybrid_pipeline import HybridPipeline
+from src.merge.merge_engine import merge_summaries
+from src.utils.instrumentation import Collector, collecting, count, current_collector, stage
+from src.utils.text_splitter import split_sentences
+
+
+TEXT = (
+    "Artificial intelligence is transforming medicine. "
+    "Machine learning models help doctors detect diseases early. "
+    "Early diagnosis improves treatment outcomes. "
+    "Today it is raining and traffic is heavy."
+)
+
+
+def test_disabled_instrumentation_is_a_no_op():
+    assert current_collector() is None
+    with stage("anything") as timer:
+        count("anything")
+    assert stage("other") is timer
+
+
+def test_textrank_reports_stages_and_counts():
+    for config in (TextRankConfig(), TextRankConfig(solver="matrix"), TextRankConfig(graph="sparse")):
+        with collecting() as collector:
+            textrank_summarize(split_sentences(TEXT), k=2, config=config)
+        data = collector.to_dict()
+        assert {"split", "tokenize", "tfidf", "similarity", "iteration", "textrank"} <= set(data["stages"])
+        assert data["counters"]["textrank.sentences"] == 4
+        assert data["counters"]["textrank.terms"] > 4
+        assert 1 <= data["counters"]["textrank.iterations"] <= config.max_iter
+    assert current_collector() is None
+
+
+def test_merge_and_metrics_report():
+    with collecting() as collector:
+        merge_summaries(["Core fact one", "Core fact two"], "A new sentence. Another one. Core fact one.", k=2)
+        redundancy_score(split_sentences(TEXT))
+        coverage_score(TEXT, "medicine")
+    stages = collector.to_dict()["stages"]
+    assert {"merge", "metrics.redundancy", "metrics.coverage"} <= set(stages)
+    assert collector.counters["merge.candidates"] == 4
+
+
+class _Usage:
+    prompt_tokens = 120
+    completion_tokens = 30
+
+
+class _Resp:
+    usage = _Usage()
+
+    def __init__(self, content):
+        self.choices = [type("choice", (), {"message": type("msg", (), {"content": content})})]
+
+
+def test_llm_reports_latency_and_token_usage(monkeypatch):
+    monkeypatch.setenv("METISAI_API_KEY", "dummy")
+    summarizer = MetisLLMSummarizer(cache=None)
+    monkeypatch.setattr(summarizer.client.chat.completions, "create", lambda *a, **kw: _Resp("Summary."))
+
+    with collecting() as collector:
+        summarizer.summarize("Some text.", target_sentences=1)
+        summarizer.summarize("More text.", target_sentences=1)
+    assert collector.stages["llm"].calls == 2
+    assert collector.counters == {"llm.requests": 2, "llm.prompt_tokens": 240, "llm.completion_tokens": 60}
+
+
+class _CountingSummarizer:
+    def summarize(self, text, target_sentences=5):
+        count("fake.llm_thread", 1 if threading.current_thread().name.startswith("hybrid-llm") else 0)
+        return "AI helps doctors find diseases early."
+
+
+def test_hybrid_pipeline_carries_collector_into_llm_thread():
+    with collecting() as collector, HybridPipeline(summarizer=_CountingSummarizer(), k_extractive=2) as pipeline:
+        pipeline.run(TEXT)
+    assert collector.counters["fake.llm_thread"] == 1
+    assert {"textrank", "merge"} <= set(collector.stages)
+
+
+def test_exporters(tmp_path):
+    collector = Collector()
+    collector.observe("textrank", 0.5)
+    collector.observe("textrank", 0.25)
+    collector.add("textrank.iterations", 12)
+
+    data = json.loads(collector.to_json())
+    assert data["stages"]["textrank"] == {"calls": 2, "total_sec": 0.75, "max_sec": 0.5}
+
+    text = collector.to_prometheus()
+    assert "# TYPE metis_stage_seconds_total counter" in text
+    assert 'metis_stage_seconds_total{stage="textrank"} 0.75' in text
+    assert 'metis_stage_calls_total{stage="textrank"} 2' in text
+    assert "metis_textrank_iterations_total 12" in text
+
+    path = tmp_path / "metis.prom"
+    collector.write_prometheus(path)
+    assert path.read_text(encoding="utf-8") == text
+    assert [p.name for p in tmp_path.iterdir()] == ["metis.prom"]
+
+
+def test_cli_writes_metrics(tmp_path, capsys):
+    doc = tmp_path / "doc.txt"
+    doc.write_text(TEXT, encoding="utf-8")
+    main([str(doc), "--k", "2", "--metrics", str(tmp_path / "m.json")])
+    main([str(doc), "--k", "2", "--metrics", str(tmp_path / "m.prom")])
+
+    data = json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))
+    assert data["counters"]["textrank.sentences"] == 4
+    assert 'metis_stage_calls_total{stage="textrank"} 1' in (tmp_path / "m.prom").read_text(encoding="utf-8")
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from benchmarks.llm_stub import StubLLMServer
+from src.abstractive.llm_summarizer import (
+    LLMConfig,
+    MetisLLMSummarizer,
+    close_shared_clients,
+    shared_client,
+    shared_summarizer,
+)
+from src.merge.hybrid_pipeline import HybridPipeline
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.setenv("METISAI_API_KEY", "dummy")
+    monkeypatch.delenv("METISAI_SUMMARY_CACHE", raising=False)
+    close_shared_clients()
+    yield
+    close_shared_clients()
+
+
+def test_summarizers_share_one_client_per_endpoint_and_key():
+    a = MetisLLMSummarizer()
+    b = MetisLLMSummarizer()
+    assert a.client is b.client
+    assert MetisLLMSummarizer(api_key="other").client is not a.client
+    assert MetisLLMSummarizer(LLMConfig(base_url="http://127.0.0.1:1/v1")).client is not a.client
+    assert shared_client(LLMConfig(), "dummy") is a.client
+
+
+def test_shared_summarizer_is_one_instance_across_threads():
+    seen = []
+    barrier = threading.Barrier(16)
+
+    def _get():
+        barrier.wait()
+        seen.append(shared_summarizer())
+
+    threads = [threading.Thread(target=_get) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(s) for s in seen}) == 1
+    assert shared_summarizer(LLMConfig(temperature=0.0)) is not seen[0]
+
+
+def test_hybrid_pipeline_defaults_to_the_shared_summarizer():
+    with HybridPipeline() as a, HybridPipeline() as b:
+        assert a.summarizer is b.summarizer is shared_summarizer()
+
+
+def test_requests_reuse_pooled_connections():
+    with StubLLMServer(summary_sentences=1) as stub:
+        config = LLMConfig(base_url=stub.base_url)
+        for i in range(5):
+            # a fresh summarizer per text, as the old call sites did
+            out = MetisLLMSummarizer(config, api_key="stub").summarize(f"Text number {i}. More.", target_sentences=1)
+            assert out == f"Text number {i}."
+        assert stub.requests == 5
+        assert stub.connections == 1
+
+
+def test_shared_summarizer_batches_from_several_threads_and_runs():
+    with StubLLMServer(summary_sentences=1) as stub:
+        summarizer = shared_summarizer(LLMConfig(base_url=stub.base_url), api_key="stub")
+        results = {}
+
+        def _batch(name):
+            # each call runs its own event loop on the shared instance
+            results[name] = [summarizer.summarize_many([f"{name} {i}. Tail."], target_sentences=1) for i in range(3)]
+
+        threads = [threading.Thread(target=_batch, args=(name,)) for name in ("a", "b", "c")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    for name in ("a", "b", "c"):
+        assert results[name] == [[f"{name} {i}."] for i in range(3)]
@@ -0,0 +1,73 @@
+import pytest
+
+from benchmarks.llm_stub import StubLLMServer
+from src.abstractive.cache import SummaryCache
+from src.abstractive.llm_summarizer import LLMConfig, MetisLLMSummarizer
+from src.extractive.textrank import select_top_k, textrank_scores, textrank_summarize
+from src.utils.instrumentation import collecting
+from src.utils.text_splitter import split_sentences
+
+
+TEXT = (
+    "Artificial intelligence is transforming medicine. "
+    "Machine learning models help doctors detect diseases early. "
+    "Early diagnosis improves treatment outcomes. "
+    "Today it is raining and traffic is heavy."
+)
+
+
+@pytest.fixture()
+def stub():
+    with StubLLMServer(summary_sentences=2) as server:
+        yield server
+
+
+def _summarizer(stub, cache=None):
+    return MetisLLMSummarizer(LLMConfig(base_url=stub.base_url), api_key="stub", cache=cache)
+
+
+def test_stream_yields_deltas_that_join_to_the_summary(stub):
+    s = _summarizer(stub)
+    deltas = list(s.stream(TEXT, target_sentences=2))
+    assert len(deltas) > 2
+    assert "".join(deltas) == s.summarize(TEXT, target_sentences=2)
+
+
+def test_stream_uses_and_fills_the_cache(stub):
+    s = _summarizer(stub, cache=SummaryCache())
+    streamed = "".join(s.stream(TEXT, target_sentences=2))
+    assert stub.requests == 1
+
+    assert list(s.stream(TEXT, target_sentences=2)) == [streamed]
+    assert s.summarize(TEXT, target_sentences=2) == streamed
+    assert stub.requests == 1
+
+
+def test_abandoned_stream_is_not_cached(stub):
+    s = _summarizer(stub, cache=SummaryCache())
+    gen = s.stream(TEXT, target_sentences=2)
+    next(gen)
+    gen.close()
+    assert s.cache.get(s._cache_key(TEXT, 2)) is None
+
+
+def test_stream_of_empty_text_yields_nothing(stub):
+    assert list(_summarizer(stub).stream("   ")) == []
+    assert stub.requests == 0
+
+
+def test_cached_scores_cut_the_same_summary_for_any_k():
+    sentences = split_sentences(TEXT)
+    scores = textrank_scores(sentences)
+    for k in range(len(sentences) + 2):
+        assert select_top_k(sentences, scores, k) == textrank_summarize(sentences, k)[0]
+    assert textrank_scores([]) == []
+
+
+def test_stream_records_token_usage(stub):
+    s = _summarizer(stub)
+    with collecting() as collector:
+        streamed = "".join(s.stream(TEXT, target_sentences=2))
+    assert collector.counters["llm.requests"] == 1
+    assert collector.counters["llm.completion_tokens"] == len(streamed.split())
+    assert collector.counters["llm.prompt_tokens"] > 0
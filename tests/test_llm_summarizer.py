@@ -1,8 +1,17 @@
+import asyncio
 import os
+import time
 
 import pytest
 
-from src.abstractive.llm_summarizer import MetisLLMSummarizer
+from benchmarks.llm_stub import StubLLMServer
+from src.abstractive.llm_summarizer import (
+    BatchSummaryError,
+    LLMConfig,
+    MetisLLMSummarizer,
+    close_shared_clients,
+    shared_summarizer,
+)
 
 
 class _FakeChoice:
@@ -34,3 +43,82 @@ def test_llm_summarizer_parses_response_content(monkeypatch):
 
     out = s.summarize("Some long text here", target_sentences=3)
     assert out == "This is a summary."
+
+
+def _patch_async_create(monkeypatch, summarizer, delay: float, calls: list):
+    async def _fake_acreate(*args, **kwargs):
+        calls.append(kwargs["messages"][1]["content"])
+        await asyncio.sleep(delay)
+        text = kwargs["messages"][1]["content"].rsplit("TEXT:\n", 1)[1]
+        return _FakeResp(f"summary of {text}")
+
+    monkeypatch.setattr(summarizer.async_client.chat.completions, "create", _fake_acreate)
+
+
+def test_summarize_many_runs_requests_concurrently_and_keeps_order(monkeypatch):
+    monkeypatch.setenv("METISAI_API_KEY", "dummy")
+    s = MetisLLMSummarizer()
+    calls = []
+    _patch_async_create(monkeypatch, s, delay=0.2, calls=calls)
+
+    texts = [f"doc {i}" for i in range(10)]
+    t0 = time.perf_counter()
+    out = s.summarize_many(texts, target_sentences=2, max_concurrency=10)
+    elapsed = time.perf_counter() - t0
+
+    assert out == [f"summary of doc {i}" for i in range(10)]
+    assert len(calls) == 10
+    # ten 0.2s round trips finish in about one round trip, not two seconds
+    assert elapsed < 0.6
+
+
+def test_summarize_many_respects_concurrency_limit(monkeypatch):
+    monkeypatch.setenv("METISAI_API_KEY", "dummy")
+    s = MetisLLMSummarizer()
+    _patch_async_create(monkeypatch, s, delay=0.1, calls=[])
+
+    t0 = time.perf_counter()
+    out = s.summarize_many(["a", "b", "c", "d"], max_concurrency=2)
+    elapsed = time.perf_counter() - t0
+
+    assert out == ["summary of a", "summary of b", "summary of c", "summary of d"]
+    assert elapsed >= 0.2
+
+
+def test_asummarize_times_out(monkeypatch):
+    monkeypatch.setenv("METISAI_API_KEY", "dummy")
+    s = MetisLLMSummarizer()
+    _patch_async_create(monkeypatch, s, delay=1.0, calls=[])
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(s.asummarize("slow text", timeout=0.05))
+
+
+def test_summarize_many_twice_on_one_instance():
+    with StubLLMServer(summary_sentences=1) as stub:
+        s = shared_summarizer(LLMConfig(base_url=stub.base_url), api_key="x")
+        first = s.summarize_many(["One here. Two.", "Three here. Four."], target_sentences=1)
+        second = s.summarize_many(["Five here. Six."], target_sentences=1)
+    close_shared_clients()
+
+    assert first == ["One here.", "Three here."]
+    assert second == ["Five here."]
+
+
+def test_summarize_many_keeps_finished_summaries_when_one_fails(monkeypatch):
+    monkeypatch.setenv("METISAI_API_KEY", "dummy")
+    s = MetisLLMSummarizer()
+
+    async def _fake_acreate(*args, **kwargs):
+        text = kwargs["messages"][1]["content"].rsplit("TEXT:\n", 1)[1]
+        if text == "bad":
+            raise RuntimeError("upstream error")
+        return _FakeResp(f"summary of {text}")
+
+    monkeypatch.setattr(s.async_client.chat.completions, "create", _fake_acreate)
+
+    with pytest.raises(BatchSummaryError) as info:
+        s.summarize_many(["a", "bad", "c"])
+    assert info.value.results == ["summary of a", None, "summary of c"]
+    assert list(info.value.errors) == [1]
+    assert isinstance(info.value.errors[1], RuntimeError)
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from src.extractive.textrank import textrank_extract
+from src.merge.merge_engine import MergeConfig, merge_summaries
+from src.utils.text_splitter import split_sentences
+
+
+WORDS = "market city rain river energy solar policy school health budget train vote".split()
+
+
+def _random_case(seed):
+    rng = random.Random(seed)
+    sentences = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))).capitalize() + "." for _ in range(14)]
+    extractive = rng.sample(sentences, 3)
+    abstractive = " ".join(rng.sample(sentences, 5) + [sentences[0].upper()])
+    return sentences, extractive, abstractive
+
+
+@pytest.mark.parametrize("backend", ["dict", "sparse"])
+@pytest.mark.parametrize("threshold", [0.3, 0.75, 1.1])
+def test_mmr_at_lambda_one_matches_threshold_strategy(backend, threshold):
+    for seed in range(20):
+        _, extractive, abstractive = _random_case(seed)
+        for k in (2, 4, 6):
+            base = MergeConfig(redundancy_threshold=threshold, similarity_backend=backend)
+            mmr = MergeConfig(redundancy_threshold=threshold, similarity_backend=backend, strategy="mmr")
+            assert merge_summaries(extractive, abstractive, k, mmr) == merge_summaries(extractive, abstractive, k, base)
+
+
+def test_mmr_at_lambda_one_matches_threshold_strategy_with_artifact():
+    for seed in range(10):
+        sentences, _, abstractive = _random_case(seed)
+        extractive, _, artifact = textrank_extract(sentences, k=3)
+        base = MergeConfig(redundancy_threshold=0.5)
+        mmr = MergeConfig(redundancy_threshold=0.5, strategy="mmr")
+        assert merge_summaries(extractive, abstractive, 4, mmr, artifact=artifact) == merge_summaries(
+            extractive, abstractive, 4, base, artifact=artifact
+        )
+
+
+def test_mmr_lower_lambda_prefers_novel_sentences():
+    extractive = ["Solar energy prices fell sharply this year."]
+    abstractive = (
+        "Solar energy prices fell sharply this year overall. "
+        "Solar energy prices fell this year. "
+        "Rain flooded the river near the city school."
+    )
+    config = MergeConfig(redundancy_threshold=1.1, strategy="mmr", mmr_lambda=0.2)
+    out = merge_summaries(extractive, abstractive, 2, config)
+    assert out[0] == extractive[0]
+    assert out[1] == split_sentences(abstractive)[2]
+
+
+def test_unknown_merge_strategy_raises():
+    with pytest.raises(ValueError):
+        merge_summaries(["A b c.", "D e f."], "G h i. J k l.", 2, MergeConfig(strategy="bogus"))
@@ -0,0 +1,25 @@
+import pytest
+
+from src.extractive.batch import summarize_batch
+from src.extractive.parallel import chunked, summarize_parallel
+
+
+TEXTS = [
+    f"Topic {i} covers solar energy storage. Solar panels store energy in batteries. "
+    f"Topic {i} also mentions the weather. Batteries make solar energy reliable."
+    for i in range(10)
+]
+
+
+def test_parallel_results_keep_input_order():
+    expected = summarize_batch(TEXTS, k=2)
+    got = summarize_parallel(TEXTS, k=2, workers=2, chunk_size=3)
+    assert [s for s, _ in got] == [s for s, _ in expected]
+    for (_, got_scores), (_, exp_scores) in zip(got, expected):
+        assert got_scores == pytest.approx(exp_scores)
+
+
+def test_chunked_rejects_non_positive_size():
+    assert chunked([1, 2, 3], 2) == [[1, 2], [3]]
+    with pytest.raises(ValueError):
+        chunked([1, 2, 3], 0)
@@ -0,0 +1,54 @@
+import pytest
+
+from src.utils.preprocessing import (
+    build_stopwords,
+    filter_tokens,
+    iter_tokens,
+    normalize_text,
+    stopwords_for,
+    tokenize,
+    tokenize_filtered,
+)
+
+
+SAMPLES = [
+    "Artificial intelligence is transforming medicine.",
+    "AI is a specific branch of computer science focused on learning.",
+    "SpaceX successfully launched a satellite to the Moon's orbit today.",
+    "  Mixed   whitespace,\ttabs\nand -- punctuation!!  ",
+    "هوش مصنوعی در پزشکی برای تشخیص بیماری استفاده می‌شود",
+    "کتاب‌خانه‌های عمومی در حال توسعه‌ی زیرساخت‌های دیجیتال هستند.",
+    "دانشگاه‌ها برای ثبت‌نام، مدارک هویتی و ریزنمرات را بررسی می‌کنند؟",
+    "",
+    "   ",
+]
+
+
+def _legacy_tokens(text, stopwords):
+    normalized = normalize_text(text)
+    tokens = normalized.split() if normalized else []
+    return [t for t in tokens if t not in stopwords and len(t) > 1]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_fused_tokenizer_matches_two_pass_pipeline(text):
+    stopwords = build_stopwords()
+    expected = _legacy_tokens(text, stopwords)
+
+    assert tokenize(text) == (normalize_text(text).split() if normalize_text(text) else [])
+    assert filter_tokens(tokenize(text)) == expected
+    assert tokenize_filtered(text) == expected
+    assert list(iter_tokens(text)) == expected
+
+
+def test_stopwords_are_cached_per_configuration():
+    assert stopwords_for() is stopwords_for(None)
+    assert stopwords_for(["Custom"]) is stopwords_for(["Custom"])
+    assert "custom" in stopwords_for(["Custom"])
+    assert stopwords_for(["Custom"]) == frozenset(build_stopwords(["Custom"]))
+
+
+def test_iter_tokens_is_lazy():
+    stream = iter_tokens("alpha beta gamma")
+    assert next(stream) == "alpha"
+    assert list(stream) == ["beta", "gamma"]
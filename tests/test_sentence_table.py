@@ -0,0 +1,101 @@
+from array import array
+
+import numpy as np
+import pytest
+
+from src.eval.metrics import redundancy_score
+from src.extractive.sentence_table import SentenceTable, TermVector
+from src.extractive.similarity_kernel import CondensedSimilarity
+from src.extractive.similarity import build_tfidf_vectors, cosine_similarity_matrix
+from src.extractive.textrank import TextRankConfig, textrank_summarize, textrank_summarize_table
+from src.merge.merge_engine import MergeConfig, merge_summaries
+from src.utils.text_splitter import iter_sentence_spans, split_sentences
+
+
+TEXT = (
+    "The central bank raised interest rates again.  Interest rates were raised by the central bank!\n"
+    "Heavy rain flooded the river valley؛ Markets fell after the bank announcement. "
+    "Farmers near the river counted the damage from the rain. . The bank said rates may rise again"
+)
+
+
+def test_spans_match_split_sentences():
+    for text in [TEXT, "", "  ", "one", "a.\r\n\r\nb?!c"]:
+        assert [text[s:e] for s, e in iter_sentence_spans(text)] == split_sentences(text)
+
+
+def test_table_stores_offsets_not_copies():
+    table = SentenceTable.from_text(TEXT)
+    assert list(table.sentences()) == split_sentences(TEXT)
+    assert table.text is TEXT
+    assert table.starts.typecode == "q" and table.term_ids.typecode == "i"
+    assert table.length(0) == len(split_sentences(TEXT)[0])
+
+
+def test_vectors_match_dict_tfidf():
+    sentences = split_sentences(TEXT)
+    table = SentenceTable.from_text(TEXT)
+    vectors, _ = build_tfidf_vectors(sentences)
+    for i, vec in enumerate(vectors):
+        assert table.vector(i).to_dict(table.vocab) == pytest.approx(vec)
+    expected = np.asarray(cosine_similarity_matrix(vectors))
+    assert np.allclose(table.condensed_similarity().to_array(), expected)
+    assert table.similarity(0, 1) == pytest.approx(expected[0, 1])
+
+
+def test_term_vector_dot_merges_sorted_ids():
+    a = TermVector(array("i", [1, 3, 7]), array("d", [1.0, 2.0, 3.0]))
+    b = TermVector(array("i", [0, 3, 7, 9]), array("d", [5.0, 1.0, 1.0, 5.0]))
+    assert a.dot(b) == 5.0
+    assert dict(a.items()) == {1: 1.0, 3: 2.0, 7: 3.0}
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        TextRankConfig(),
+        TextRankConfig(solver="matrix"),
+        TextRankConfig(similarity_backend="sparse"),
+        TextRankConfig(graph="sparse", top_k_neighbors=2),
+    ],
+)
+def test_textrank_on_table_matches_list_path(config):
+    sentences = split_sentences(TEXT)
+    summary, scores = textrank_summarize_table(SentenceTable.from_text(TEXT), k=2, config=config)
+    expected_summary, expected_scores = textrank_summarize(sentences, k=2, config=config)
+    assert summary == expected_summary
+    assert scores == pytest.approx(expected_scores)
+
+
+@pytest.mark.parametrize("solver", ["loop", "matrix"])
+def test_textrank_on_table_never_expands_the_condensed_similarity(monkeypatch, solver):
+    config = TextRankConfig(solver=solver, edge_threshold=0.05)
+    _, expected = textrank_summarize(split_sentences(TEXT), k=2, config=config)
+
+    def _dense(self):
+        raise AssertionError("TextRank expanded the condensed similarity")
+
+    monkeypatch.setattr(CondensedSimilarity, "to_matrix", _dense)
+    monkeypatch.setattr(CondensedSimilarity, "to_array", _dense)
+    _, scores = textrank_summarize_table(SentenceTable.from_text(TEXT), k=2, config=config)
+    assert scores == pytest.approx(expected, abs=1e-12)
+
+
+def test_table_backend_in_merge_and_metrics():
+    sentences = split_sentences(TEXT)
+    assert redundancy_score(sentences, backend="table") == pytest.approx(redundancy_score(sentences))
+    extractive = sentences[:2]
+    abstractive = " ".join(s + "." for s in sentences[2:])
+    assert merge_summaries(extractive, abstractive, 3, MergeConfig(similarity_backend="table")) == merge_summaries(
+        extractive, abstractive, 3
+    )
+    assert textrank_summarize(sentences, 2, TextRankConfig(similarity_backend="table"))[0] == textrank_summarize(
+        sentences, 2
+    )[0]
+
+
+def test_external_idf_drops_unknown_terms():
+    table = SentenceTable.from_sentences(["bank rates", "river rain"], idf={"bank": 2.0, "rain": 1.5})
+    assert table.vector(0).to_dict(table.vocab) == {"bank": 2.0}
+    assert table.vector(1).to_dict(table.vocab) == {"rain": 1.5}
+    assert table.sentence(1) == "river rain"
@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.eval.metrics import redundancy_score
+from src.extractive.similarity import build_tfidf_vectors, cosine_similarity_matrix
+from src.extractive.similarity_kernel import CondensedSimilarity, condensed_cosine, condensed_index
+from src.extractive.textrank import TextRankConfig, textrank_summarize
+
+
+SENTENCES = [
+    "The central bank raised interest rates again.",
+    "Interest rates were raised by the central bank.",
+    "Heavy rain flooded the river valley.",
+    "",
+    "Markets fell after the bank announcement.",
+]
+
+
+def _naive_cosine(v1, v2):
+    dot = sum(w * v2.get(t, 0.0) for t, w in v1.items())
+    n1 = math.sqrt(sum(w * w for w in v1.values()))
+    n2 = math.sqrt(sum(w * w for w in v2.values()))
+    return dot / (n1 * n2) if n1 and n2 else 0.0
+
+
+def test_condensed_index_is_row_major_upper_triangle():
+    n = 5
+    positions = [condensed_index(i, j, n) for i in range(n) for j in range(i + 1, n)]
+    assert positions == list(range(n * (n - 1) // 2))
+
+
+def test_condensed_cosine_matches_pairwise_cosine():
+    vectors, _ = build_tfidf_vectors(SENTENCES)
+    sim = condensed_cosine(vectors)
+    assert len(sim.data) == len(SENTENCES) * (len(SENTENCES) - 1) // 2
+    for i in range(len(vectors)):
+        assert sim.get(i, i) == 0.0
+        for j in range(len(vectors)):
+            if i != j:
+                assert sim[i, j] == sim[j, i]
+                assert sim[i, j] == pytest.approx(_naive_cosine(vectors[i], vectors[j]))
+
+
+def test_matrix_views_agree():
+    vectors, _ = build_tfidf_vectors(SENTENCES)
+    sim = condensed_cosine(vectors)
+    full = cosine_similarity_matrix(vectors)
+    assert full == sim.to_matrix()
+    assert np.array_equal(sim.to_array(), np.asarray(full))
+    assert CondensedSimilarity.from_array(sim.to_array()).data == sim.data
+    assert sim.row_sums() == [sum(row) for row in full]
+
+
+def test_condensed_buffer_size_is_checked():
+    with pytest.raises(ValueError):
+        CondensedSimilarity(4, condensed_cosine([{"a": 1.0}] * 3).data)
+
+
+def test_redundancy_score_backends_agree():
+    assert redundancy_score(SENTENCES, backend="sparse") == pytest.approx(redundancy_score(SENTENCES))
+    assert redundancy_score(["only one"]) == 0.0
+
+
+def _reference_scores(sim, config):
+    # textbook PageRank over the dense thresholded matrix
+    n = len(sim)
+    threshold = 0.0 if config.edge_threshold is None else config.edge_threshold
+    w = [[x if i != j and x > threshold else 0.0 for j, x in enumerate(row)] for i, row in enumerate(sim)]
+    out = [sum(row) for row in w]
+    scores = [1.0 / n] * n
+    for _ in range(config.max_iter):
+        new = [
+            (1.0 - config.damping) / n
+            + config.damping * sum(w[j][i] / out[j] * scores[j] for j in range(n) if out[j] > 0.0)
+            for i in range(n)
+        ]
+        done = max(abs(a - b) for a, b in zip(new, scores)) < config.eps
+        scores = new
+        if done:
+            break
+    return scores
+
+
+@pytest.mark.parametrize("edge_threshold", [None, 0.1])
+@pytest.mark.parametrize("backend", ["dict", "table"])
+@pytest.mark.parametrize("solver", ["loop", "matrix"])
+def test_textrank_iterates_on_condensed_buffer(monkeypatch, solver, backend, edge_threshold):
+    sentences = [s for s in SENTENCES if s] * 3
+    vectors, _ = build_tfidf_vectors(sentences)
+    config = TextRankConfig(edge_threshold=edge_threshold, similarity_backend=backend, solver=solver)
+    expected = _reference_scores(cosine_similarity_matrix(vectors), config)
+
+    def _dense(self):
+        raise AssertionError("TextRank expanded the condensed similarity")
+
+    monkeypatch.setattr(CondensedSimilarity, "to_matrix", _dense)
+    monkeypatch.setattr(CondensedSimilarity, "to_array", _dense)
+    _, scores = textrank_summarize(sentences, k=2, config=config)
+    assert scores == pytest.approx(expected, abs=1e-12)
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from src.extractive.graph import build_sparse_graph, edge_count
+from src.extractive.similarity import build_tfidf_vectors, cosine_similarity_matrix
+from src.extractive.textrank import TextRankConfig, textrank_summarize
+
+
+def _synthetic_sentences(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(200)]
+    return [" ".join(rng.choices(vocab, k=rng.randint(3, 10))) for _ in range(n)]
+
+
+def test_sparse_graph_only_links_sentences_sharing_terms():
+    sentences = ["apple banana", "banana cherry", "dog elephant"]
+    vectors, _ = build_tfidf_vectors(sentences)
+    adjacency = build_sparse_graph(vectors)
+
+    assert set(adjacency[0]) == {1}
+    assert set(adjacency[1]) == {0}
+    assert adjacency[2] == {}
+
+
+def test_sparse_graph_edges_match_dense_similarities():
+    sentences = _synthetic_sentences(60)
+    vectors, _ = build_tfidf_vectors(sentences)
+    sim = cosine_similarity_matrix(vectors)
+    adjacency = build_sparse_graph(vectors, threshold=0.05)
+
+    for i, row in enumerate(adjacency):
+        expected = {j for j, w in enumerate(sim[i]) if w > 0.05}
+        assert set(row) == expected
+        for j, w in row.items():
+            assert w == pytest.approx(sim[i][j], abs=1e-12)
+
+
+def test_top_k_bounds_edges_per_sentence():
+    sentences = _synthetic_sentences(100)
+    vectors, _ = build_tfidf_vectors(sentences)
+    adjacency = build_sparse_graph(vectors, top_k=3)
+
+    assert all(len(row) <= 3 for row in adjacency)
+    assert edge_count(adjacency) <= 3 * len(sentences)
+
+
+@pytest.mark.parametrize("solver", ["loop", "matrix"])
+@pytest.mark.parametrize("edge_threshold", [None, 0.1])
+def test_sparse_graph_textrank_matches_dense(solver, edge_threshold):
+    sentences = _synthetic_sentences(80)
+    dense_summary, dense_scores = textrank_summarize(
+        sentences, k=6, config=TextRankConfig(edge_threshold=edge_threshold)
+    )
+    sparse_summary, sparse_scores = textrank_summarize(
+        sentences, k=6, config=TextRankConfig(edge_threshold=edge_threshold, graph="sparse", solver=solver)
+    )
+    assert sparse_summary == dense_summary
+    assert sparse_scores == pytest.approx(dense_scores, abs=1e-12)
+
+
+def test_top_k_requires_sparse_graph():
+    with pytest.raises(ValueError):
+        textrank_summarize(_synthetic_sentences(5), k=2, config=TextRankConfig(top_k_neighbors=2))
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.eval.metrics import redundancy_score
+from src.extractive.similarity import build_tfidf_vectors, cosine_similarity_matrix, similarity_matrix
+from src.extractive import sparse_similarity
+from src.extractive.sparse_similarity import build_tfidf_matrix, cosine_similarity_sparse
+from src.extractive.textrank import TextRankConfig, textrank_summarize
+from src.merge.merge_engine import MergeConfig, merge_summaries
+
+
+SENTENCES = [
+    "Artificial intelligence is transforming medicine.",
+    "Machine learning models help doctors detect diseases early.",
+    "Early diagnosis improves treatment outcomes for patients.",
+    "Today it is raining and traffic is heavy.",
+    "Doctors use machine learning to improve diagnosis.",
+    "",
+    "هوش مصنوعی در پزشکی برای تشخیص بیماری استفاده می‌شود",
+    "تشخیص زودهنگام بیماری باعث افزایش شانس درمان می‌شود",
+]
+
+
+def test_sparse_matrix_matches_dict_similarity():
+    vectors, _ = build_tfidf_vectors(SENTENCES)
+    expected = cosine_similarity_matrix(vectors)
+
+    matrix, _ = build_tfidf_matrix(SENTENCES)
+    got = cosine_similarity_sparse(matrix)
+
+    n = len(SENTENCES)
+    assert got.shape == (n, n)
+    for i in range(n):
+        for j in range(n):
+            assert got[i, j] == pytest.approx(expected[i][j], abs=1e-12)
+
+
+@pytest.mark.parametrize("block_cells", [1, 7, 40])
+def test_blocked_product_matches_dense_product(monkeypatch, block_cells):
+    # empty rows first and last exercise the row-segment sums
+    matrix, _ = build_tfidf_matrix([""] + SENTENCES + [""])
+    expected = cosine_similarity_sparse(matrix)
+    monkeypatch.setattr(sparse_similarity, "_BLOCK_CELLS", block_cells)
+    assert np.allclose(cosine_similarity_sparse(matrix), expected, atol=1e-12)
+
+
+def test_sparse_matrix_handles_empty_input():
+    matrix, _ = build_tfidf_matrix([])
+    assert cosine_similarity_sparse(matrix).shape == (0, 0)
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        similarity_matrix(SENTENCES, backend="nope")
+
+
+def test_backends_agree_in_textrank_merge_and_metrics():
+    dict_summary, dict_scores = textrank_summarize(SENTENCES, k=3)
+    sparse_summary, sparse_scores = textrank_summarize(
+        SENTENCES, k=3, config=TextRankConfig(similarity_backend="sparse")
+    )
+    assert sparse_summary == dict_summary
+    assert sparse_scores == pytest.approx(dict_scores, abs=1e-12)
+
+    abstractive = "AI helps doctors. Diagnosis happens earlier. Traffic is heavy today."
+    assert merge_summaries(dict_summary, abstractive, k=4) == merge_summaries(
+        dict_summary, abstractive, k=4, config=MergeConfig(similarity_backend="sparse")
+    )
+
+    assert redundancy_score(SENTENCES, backend="sparse") == pytest.approx(redundancy_score(SENTENCES), abs=1e-12)
@@ -0,0 +1,132 @@
+import json
+import time
+
+import pytest
+
+from src.eval.runner import EVAL_METHODS, ResultLog, evaluate_stream, iter_eval_records, iter_eval_texts
+
+
+TEXTS = [
+    (
+        "a",
+        "Artificial intelligence is transforming medicine. "
+        "Machine learning models help doctors detect diseases early. "
+        "Early diagnosis improves treatment outcomes. "
+        "Today it is raining and traffic is heavy.",
+    ),
+    (
+        "b",
+        "Renewable energy sources like solar and wind reduce carbon emissions. "
+        "Energy storage is important for balancing supply and demand. "
+        "Grid modernization improves reliability. "
+        "Some people also enjoy hiking on weekends.",
+    ),
+]
+
+
+class _Summarizer:
+    def __init__(self, delay: float = 0.0, fail_on: str = "") -> None:
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def summarize(self, text: str, target_sentences: int = 5) -> str:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("LLM unavailable")
+        return text.split(". ")[0] + "."
+
+
+def test_stream_writes_one_record_per_text_and_method(tmp_path):
+    out = tmp_path / "results.jsonl"
+    stats = evaluate_stream(iter(TEXTS), out, k_extractive=2, summarizer=_Summarizer())
+
+    assert stats == {"evaluated": 6, "skipped": 0, "failed": 0}
+    records = list(iter_eval_records(out))
+    assert sorted((r["text_id"], r["method"]) for r in records) == sorted(
+        (t, m) for t, _ in TEXTS for m in EVAL_METHODS
+    )
+    assert set(records[0]) == {
+        "text_id", "method", "runtime_sec", "words", "redundancy", "coverage", "summary", "text_hash",
+        "concurrent_with",
+    }
+    by_method = {r["method"]: r for r in records if r["text_id"] == TEXTS[0][0]}
+    assert by_method["textrank"]["concurrent_with"] == ["llm", "hybrid"]
+    assert by_method["hybrid"]["concurrent_with"] == ["textrank", "llm"]
+
+
+def test_restart_skips_completed_and_retries_failed(tmp_path):
+    out = tmp_path / "results.jsonl"
+    first = evaluate_stream(TEXTS, out, summarizer=_Summarizer(fail_on="Renewable"))
+    # llm and hybrid both call the LLM for text "b"
+    assert first == {"evaluated": 4, "skipped": 0, "failed": 2}
+
+    summarizer = _Summarizer()
+    second = evaluate_stream(TEXTS, out, summarizer=summarizer)
+    assert second == {"evaluated": 2, "skipped": 4, "failed": 0}
+    assert summarizer.calls == 2
+    assert len(list(iter_eval_records(out))) == 6
+
+
+def test_torn_last_line_is_dropped_on_resume(tmp_path):
+    out = tmp_path / "results.jsonl"
+    evaluate_stream(TEXTS[:1], out, methods=["textrank"])
+    with out.open("a", encoding="utf-8") as f:
+        f.write('{"text_id": "b", "method": "textr')
+
+    assert [r["text_id"] for r in iter_eval_records(out)] == ["a"]
+    with ResultLog(out) as log:
+        assert set(log.done) == {("a", "textrank")}
+    evaluate_stream(TEXTS, out, methods=["textrank"])
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["text_id"] for line in lines] == ["a", "b"]
+
+
+def test_methods_run_concurrently(tmp_path):
+    start = time.perf_counter()
+    evaluate_stream(TEXTS[:1], tmp_path / "r.jsonl", summarizer=_Summarizer(delay=0.2))
+    # llm and hybrid each wait 0.2s on the LLM, side by side
+    assert time.perf_counter() - start < 0.35
+
+
+def test_unknown_method_raises(tmp_path):
+    with pytest.raises(ValueError):
+        evaluate_stream(TEXTS, tmp_path / "r.jsonl", methods=["rouge"])
+
+
+def test_iter_eval_texts_reads_directories_and_jsonl(tmp_path):
+    (tmp_path / "one.txt").write_text("First doc. It is short.", encoding="utf-8")
+    rows = [{"id": "x", "text": "Row x."}, {"id": "y", "text": "Row y."}]
+    (tmp_path / "rows.jsonl").write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+
+    texts = iter_eval_texts([str(tmp_path)])
+    assert next(texts) == ((tmp_path / "one.txt").as_posix(), "First doc. It is short.")
+    assert list(texts) == [("x", "Row x."), ("y", "Row y.")]
+
+
+def test_same_stem_in_different_places_gets_distinct_ids(tmp_path):
+    docs = tmp_path / "docs"
+    for name in ("a/x.txt", "b/x.txt", "a/x.md"):
+        (docs / name).parent.mkdir(parents=True, exist_ok=True)
+        (docs / name).write_text(f"Document {name}. It has text.", encoding="utf-8")
+
+    out = tmp_path / "r.jsonl"
+    stats = evaluate_stream(iter_eval_texts([str(docs)]), out, methods=["textrank"])
+    assert stats == {"evaluated": 3, "skipped": 0, "failed": 0}
+    assert len({r["text_id"] for r in iter_eval_records(out)}) == 3
+
+
+def test_duplicate_ids_in_one_run_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Duplicate text id"):
+        evaluate_stream([TEXTS[0], TEXTS[0]], tmp_path / "r.jsonl", methods=["textrank"])
+
+
+def test_changed_text_is_evaluated_again_and_fresh_starts_over(tmp_path):
+    out = tmp_path / "r.jsonl"
+    evaluate_stream(TEXTS, out, methods=["textrank"])
+    edited = [(TEXTS[0][0], TEXTS[0][1] + " A new closing sentence."), TEXTS[1]]
+    assert evaluate_stream(edited, out, methods=["textrank"]) == {"evaluated": 1, "skipped": 1, "failed": 0}
+
+    assert evaluate_stream(TEXTS, out, methods=["textrank"], fresh=True)["evaluated"] == 2
+    assert len(list(iter_eval_records(out))) == 2
@@ -0,0 +1,154 @@
+import time
+
+import pytest
+from openai import APITimeoutError
+
+from benchmarks.llm_stub import StubLLMServer
+from src.abstractive.llm_summarizer import LLMConfig, MetisLLMSummarizer
+from src.extractive.textrank import textrank_extract
+from src.merge.hybrid_pipeline import HybridPipeline
+from src.merge.merge_engine import IncrementalMerge, MergeConfig, merge_summaries
+from src.utils.text_splitter import split_sentences
+
+
+TEXT = (
+    "Artificial intelligence is transforming medicine. "
+    "Machine learning models help doctors detect diseases early. "
+    "Early diagnosis improves treatment outcomes. "
+    "Doctors use machine learning to read medical images. "
+    "Hospitals adopt artificial intelligence tools for diagnosis. "
+    "Today it is raining and traffic is heavy."
+)
+
+ABSTRACTIVE = (
+    "AI is changing medicine. Machine learning helps doctors detect diseases early. "
+    "Early diagnosis improves treatment outcomes. Hospitals use AI for diagnosis."
+)
+
+
+@pytest.mark.parametrize("strategy", ["threshold", "mmr"])
+@pytest.mark.parametrize("use_artifact", [False, True])
+def test_incremental_merge_matches_merge_summaries_at_every_step(strategy, use_artifact):
+    sentences = split_sentences(TEXT)
+    extractive, _, artifact = textrank_extract(sentences, k=3)
+    artifact = artifact if use_artifact else None
+    config = MergeConfig(strategy=strategy, mmr_lambda=0.7 if strategy == "mmr" else 1.0)
+
+    merger = IncrementalMerge(extractive, k=4, config=config, artifact=artifact)
+    assert merger.result() == merge_summaries(extractive, "", k=4, config=config)
+    arrived = split_sentences(ABSTRACTIVE)
+    for i, sentence in enumerate(arrived, 1):
+        merger.add(sentence)
+        so_far = ". ".join(arrived[:i]) + "."
+        assert merger.result() == merge_summaries(extractive, so_far, k=4, config=config, artifact=artifact)
+
+
+def test_incremental_merge_skips_duplicates_and_anchors():
+    merger = IncrementalMerge(["A first", "B second"], k=3)
+    assert merger.add("A first") is False
+    assert merger.add("C third") is True
+    assert merger.add("C third") is False
+    assert merger.add("   ") is False
+    assert merger.candidates == ["A first", "B second", "C third"]
+
+
+def test_stream_sentences_emit_each_sentence_of_the_completion():
+    with StubLLMServer(summary_sentences=3) as stub:
+        s = MetisLLMSummarizer(LLMConfig(base_url=stub.base_url), api_key="stub", cache=None)
+        streamed = list(s.stream_sentences(TEXT, target_sentences=3))
+        assert streamed == split_sentences(s.summarize(TEXT, target_sentences=3))
+
+
+def test_streaming_pipeline_matches_blocking_pipeline():
+    with StubLLMServer(summary_sentences=4) as stub:
+        summarizer = MetisLLMSummarizer(LLMConfig(base_url=stub.base_url), api_key="stub", cache=None)
+        with HybridPipeline(summarizer=summarizer, k_extractive=2, k_final=4) as blocking:
+            expected = blocking.run(TEXT)
+        with HybridPipeline(summarizer=summarizer, k_extractive=2, k_final=4, stream_llm=True) as streaming:
+            result = streaming.run(TEXT)
+
+    assert result.abstractive_complete
+    assert result.final_summary == expected.final_summary
+    assert result.abstractive_text == expected.abstractive_text
+    assert set(result.timings) == {"split", "textrank", "llm", "llm_wait", "merge", "total"}
+
+
+def test_budget_finalizes_with_the_sentences_that_arrived():
+    with StubLLMServer(summary_sentences=6, token_delay=0.03) as stub:
+        summarizer = MetisLLMSummarizer(LLMConfig(base_url=stub.base_url), api_key="stub", cache=None)
+        with HybridPipeline(
+            summarizer=summarizer, k_extractive=2, k_final=6, stream_llm=True, latency_budget=0.35
+        ) as pipeline:
+            t0 = time.perf_counter()
+            result = pipeline.run(TEXT)
+            elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.5
+    assert not result.abstractive_complete
+    # roughly one sentence per 7 words at 30 ms per word
+    arrived = split_sentences(result.abstractive_text)
+    assert 0 < len(arrived) < 6
+    assert arrived == split_sentences(TEXT)[: len(arrived)]
+    assert result.final_summary[:2] == result.extractive_summary
+
+
+class _SlowSummarizer:
+    def __init__(self) -> None:
+        self.timeouts = []
+
+    def summarize(self, text: str, target_sentences: int = 5, timeout=None) -> str:
+        self.timeouts.append(timeout)
+        time.sleep(0.4)
+        return "Too late to matter."
+
+
+def test_budget_without_streaming_falls_back_to_extractive():
+    summarizer = _SlowSummarizer()
+    t0 = time.perf_counter()
+    with HybridPipeline(summarizer=summarizer, k_extractive=2, k_final=3, latency_budget=0.1) as pipeline:
+        result = pipeline.run(TEXT)
+    # close() does not wait for the abandoned call
+    assert time.perf_counter() - t0 < 0.3
+    assert summarizer.timeouts == [0.1]
+    assert result.timings["total"] < 0.3
+    assert not result.abstractive_complete
+    assert result.abstractive_text == ""
+    assert result.final_summary == result.extractive_summary
+
+
+def test_stalled_stream_does_not_hold_a_worker_past_the_budget():
+    with StubLLMServer(latency=3.0) as stub:
+        summarizer = MetisLLMSummarizer(LLMConfig(base_url=stub.base_url), api_key="stub", cache=None)
+        with HybridPipeline(summarizer=summarizer, stream_llm=True, latency_budget=0.3) as pipeline:
+            result = pipeline.run(TEXT)
+            workers = list(pipeline._executor._threads)
+        assert not result.abstractive_complete
+        t0 = time.perf_counter()
+        for worker in workers:
+            worker.join(timeout=3.0)
+        assert time.perf_counter() - t0 < 1.0
+
+
+def test_summarize_timeout_ends_the_request():
+    with StubLLMServer(latency=1.0) as stub:
+        summarizer = MetisLLMSummarizer(LLMConfig(base_url=stub.base_url), api_key="stub", cache=None)
+        t0 = time.perf_counter()
+        with pytest.raises(APITimeoutError):
+            summarizer.summarize(TEXT, timeout=0.2)
+    assert time.perf_counter() - t0 < 0.8
+
+
+class _QuestionSummarizer:
+    def stream(self, text: str, target_sentences: int = 5, timeout=None):
+        yield from ["Is AI changing medicine? ", "It is! ", "آیا پزشکی تغییر می‌کند؟ ", "Yes"]
+
+
+def test_streamed_abstractive_text_keeps_its_terminators():
+    with HybridPipeline(summarizer=_QuestionSummarizer(), k_extractive=2, k_final=4, stream_llm=True) as pipeline:
+        result = pipeline.run(TEXT)
+    assert result.abstractive_text == "Is AI changing medicine? It is! آیا پزشکی تغییر می‌کند؟ Yes"
+
+
+def test_non_positive_budget_is_rejected():
+    with pytest.raises(ValueError):
+        HybridPipeline(latency_budget=0)
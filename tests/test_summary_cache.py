@@ -0,0 +1,102 @@
+import time
+
+from src.abstractive.cache import SummaryCache
+from src.abstractive.llm_summarizer import LLMConfig, MetisLLMSummarizer
+
+
+class _FakeChoice:
+    def __init__(self, content: str) -> None:
+        self.message = type("msg", (), {"content": content})
+
+
+class _FakeResp:
+    def __init__(self, content: str) -> None:
+        self.choices = [_FakeChoice(content)]
+
+
+def _counting_summarizer(monkeypatch, cache, config=LLMConfig()):
+    monkeypatch.setenv("METISAI_API_KEY", "dummy")
+    s = MetisLLMSummarizer(config=config, cache=cache)
+    calls = []
+
+    def _fake_create(*args, **kwargs):
+        calls.append(kwargs)
+        return _FakeResp(f"summary #{len(calls)}")
+
+    monkeypatch.setattr(s.client.chat.completions, "create", _fake_create)
+    return s, calls
+
+
+def test_cache_hit_skips_network(monkeypatch):
+    cache = SummaryCache()
+    s, calls = _counting_summarizer(monkeypatch, cache)
+
+    first = s.summarize("Some long text here.", target_sentences=3)
+    # whitespace-only differences hit the same entry
+    second = s.summarize("  Some   long text\nhere.  ", target_sentences=3)
+
+    assert first == second == "summary #1"
+    assert len(calls) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_cache_key_includes_request_parameters(monkeypatch):
+    cache = SummaryCache()
+    s, calls = _counting_summarizer(monkeypatch, cache)
+    s.summarize("Some text.", target_sentences=3)
+    s.summarize("Some text.", target_sentences=4)
+
+    other, other_calls = _counting_summarizer(monkeypatch, cache, LLMConfig(temperature=0.9))
+    other.summarize("Some text.", target_sentences=3)
+
+    assert len(calls) == 2
+    assert len(other_calls) == 1
+
+
+def test_disk_tier_survives_new_cache_instance(monkeypatch, tmp_path):
+    path = tmp_path / "summaries.sqlite"
+    s, calls = _counting_summarizer(monkeypatch, SummaryCache(path=path))
+    s.summarize("Persisted text.", target_sentences=2)
+
+    fresh = SummaryCache(path=path)
+    s2, calls2 = _counting_summarizer(monkeypatch, fresh)
+    assert s2.summarize("Persisted text.", target_sentences=2) == "summary #1"
+    assert calls2 == []
+    assert fresh.stats.disk_hits == 1
+
+
+def test_memory_lru_and_disk_size_eviction(tmp_path):
+    cache = SummaryCache(max_memory_entries=2, path=tmp_path / "c.sqlite", max_disk_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.put("c", "3")
+
+    assert cache.stats.evictions == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == "3"
+
+
+def test_disk_size_is_tracked_without_a_count_per_insert(tmp_path):
+    path = tmp_path / "c.sqlite"
+    SummaryCache(path=path).put("old", "0")
+    cache = SummaryCache(path=path, max_disk_entries=3)
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+    cache.put("a", "1")
+    cache.put("a", "1 again")
+    cache.put("b", "2")
+    assert not any("COUNT" in s for s in statements)
+    assert cache.stats.evictions == 0
+
+    cache.put("c", "3")
+    assert cache.stats.evictions == 1
+    assert cache.get("old") is None
+    assert cache.get("a") == "1 again"
+
+
+def test_ttl_expires_entries():
+    cache = SummaryCache(ttl_seconds=0.05)
+    cache.put("k", "v")
+    assert cache.get("k") == "v"
+    time.sleep(0.1)
+    assert cache.get("k") is None
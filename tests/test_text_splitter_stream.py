@@ -0,0 +1,77 @@
+import io
+import random
+import time
+
+import pytest
+
+from src.extractive.textrank import textrank_summarize, textrank_summarize_stream
+from src.utils.text_splitter import iter_sentences, sentence_prefix, split_sentences
+
+
+TEXT = (
+    "Artificial intelligence is transforming medicine. Machine learning helps!\r\n"
+    "Is early diagnosis better? Yes...; definitely\n\n"
+    "هوش مصنوعی در پزشکی استفاده می‌شود؟ تشخیص زودهنگام مهم است؛ درمان بهتر می‌شود.\n"
+    "Trailing sentence without a terminator"
+)
+
+
+def _random_chunks(text, seed):
+    rng = random.Random(seed)
+    i = 0
+    while i < len(text):
+        step = rng.randint(1, 7)
+        yield text[i : i + step]
+        i += step
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chunked_stream_matches_split_sentences(seed):
+    assert list(iter_sentences(_random_chunks(TEXT, seed))) == split_sentences(TEXT)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64])
+def test_file_like_sources(chunk_size):
+    expected = split_sentences(TEXT)
+    assert list(iter_sentences(io.StringIO(TEXT), chunk_size=chunk_size)) == expected
+    # byte chunks may cut multi-byte Persian characters in half
+    assert list(iter_sentences(io.BytesIO(TEXT.encode("utf-8")), chunk_size=chunk_size)) == expected
+
+
+def test_boundary_split_across_chunks():
+    chunks = ["first part", " continues\r", "\nsecond؟", "؟ third؛", " fourth"]
+    assert list(iter_sentences(chunks)) == ["first part continues", "second", "third", "fourth"]
+
+
+def test_long_sentence_is_scanned_once():
+    # one sentence over 5000 chunks: rescanning the growing tail would take minutes
+    chunks = ["word " * 40] * 5000 + ["end. after\r", "\r", "\n"]
+    t0 = time.perf_counter()
+    sentences = list(iter_sentences(chunks))
+    assert time.perf_counter() - t0 < 5.0
+    assert sentences == split_sentences("".join(chunks))
+
+
+def test_stream_is_incremental():
+    def _chunks():
+        yield "One. Two"
+        raise RuntimeError("should not be read yet")
+
+    stream = iter_sentences(_chunks())
+    assert next(stream) == "One"
+
+
+def test_textrank_consumes_sentence_stream():
+    expected = textrank_summarize(split_sentences(TEXT), k=2)
+    assert textrank_summarize_stream(iter_sentences(io.StringIO(TEXT), chunk_size=4), k=2) == expected
+
+
+def test_sentence_prefix_keeps_original_terminators():
+    assert sentence_prefix(TEXT, 0) == ""
+    assert sentence_prefix(TEXT, 3) == (
+        "Artificial intelligence is transforming medicine. Machine learning helps!\r\n"
+        "Is early diagnosis better?"
+    )
+    assert sentence_prefix(TEXT, 4) == sentence_prefix(TEXT, 3) + " Yes...;"
+    assert sentence_prefix(TEXT, 100) == TEXT
+    assert split_sentences(sentence_prefix(TEXT, 6)) == split_sentences(TEXT)[:6]
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from src.extractive.textrank import TextRankConfig, textrank_summarize
+
+
+def _synthetic_sentences(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(120)]
+    return [" ".join(rng.choices(vocab, k=rng.randint(3, 12))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("edge_threshold", [None, 0.1])
+@pytest.mark.parametrize("backend", ["dict", "sparse"])
+def test_matrix_solver_matches_loop_solver(edge_threshold, backend):
+    sentences = _synthetic_sentences(80)
+    loop_cfg = TextRankConfig(edge_threshold=edge_threshold)
+    matrix_cfg = TextRankConfig(edge_threshold=edge_threshold, similarity_backend=backend, solver="matrix")
+
+    loop_summary, loop_scores = textrank_summarize(sentences, k=8, config=loop_cfg)
+    matrix_summary, matrix_scores = textrank_summarize(sentences, k=8, config=matrix_cfg)
+
+    assert matrix_summary == loop_summary
+    assert matrix_scores == pytest.approx(loop_scores, abs=1e-12)
+
+
+def test_matrix_solver_keeps_tie_break_and_convergence_rules():
+    sentences = [
+        "Identical score text A.",
+        "Identical score text B.",
+        "This is a longer sentence but with identical score.",
+    ]
+    summary, _ = textrank_summarize(sentences, k=1, config=TextRankConfig(solver="matrix"))
+    assert summary[0] == sentences[0]
+
+    sentences = ["Sentence number " + str(i) for i in range(20)]
+    config = TextRankConfig(max_iter=5, eps=1e-1, solver="matrix")
+    summary, scores = textrank_summarize(sentences, k=5, config=config)
+    assert len(summary) == 5
+    assert abs(sum(scores) - 1.0) < 1e-5
+
+
+def test_unknown_solver_raises():
+    with pytest.raises(ValueError):
+        textrank_summarize(_synthetic_sentences(5), k=2, config=TextRankConfig(solver="nope"))
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from src.extractive.textrank import _select_top_k
+from src.merge.merge_engine import _RankedCandidates, merge_summaries
+
+
+def _full_sort_top_k(sentences, scores, k):
+    ranked = sorted(range(len(sentences)), key=lambda idx: (-scores[idx], idx, len(sentences[idx])))
+    chosen = set(ranked[:k])
+    return [i for i in range(len(sentences)) if i in chosen]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_heap_selection_matches_full_sort_with_ties(seed, k):
+    rng = random.Random(seed)
+    n = 500
+    # few distinct values force many ties on score
+    scores = [rng.choice([0.1, 0.2, 0.3]) for _ in range(n)]
+    sentences = ["x" * rng.randint(1, 30) for _ in range(n)]
+    assert _select_top_k(sentences, scores, k) == _full_sort_top_k(sentences, scores, k)
+
+
+def test_ranked_candidates_replay_then_continue():
+    ranked = _RankedCandidates([0.5, 0.9, 0.5, 0.1])
+    first = []
+    for i in ranked:
+        first.append(i)
+        if len(first) == 2:
+            break
+    assert first == [1, 0]
+    assert list(ranked) == [1, 0, 2, 3]
+
+
+def test_merge_tie_break_prefers_lower_index():
+    extractive = ["alpha beta"]
+    abstractive = "gamma delta. epsilon zeta. eta theta."
+    # no shared terms: every centrality is 0, so rank order is pool order
+    out = merge_summaries(extractive, abstractive, k=3)
+    assert out == ["alpha beta", "gamma delta", "epsilon zeta"]